@@ -0,0 +1,83 @@
+"""
+Microbenchmark of building and serializing the create payload of a test case.
+
+- `before`: the previous path: a fresh attributes dict, `deepcopy` in
+  `build_test_case_base`, another `deepcopy` in `_prepare_create_payload`,
+  then `httpx`'s `json=` encoding;
+- `after`: `payloads.test_case_payload(...)` and `to_json_bytes()` over the
+  shared `(space, suit)` template.
+
+Reports time per case and the peak memory allocated while building one case
+(`tracemalloc`), after checking both paths produce the same request body.
+Run from the repository root:
+
+    python -m benchmarks.bench_create_payload [--cases 20000]
+"""
+from __future__ import annotations
+
+import argparse
+import time
+import tracemalloc
+from copy import deepcopy
+from typing import Any, Callable, Dict
+
+from httpx._content import encode_json
+
+from src.tasktracker.payloads import _source_fields, test_case_payload
+
+
+def _before(summary: str, folder_code: str) -> bytes:
+    base = deepcopy(_source_fields("PVM", "test_case", summary, folder_code))
+    del base["attributes"]["test_step"]  # the old base had no test_step key
+    payload = deepcopy(base)
+    payload["attributes"]["test_step"] = []
+    _, stream = encode_json(payload)
+    return b"".join(stream)
+
+
+def _after(summary: str, folder_code: str) -> bytes:
+    return test_case_payload(summary=summary, suit="test_case", space="PVM", folder_code=folder_code).to_json_bytes()
+
+
+def _time_per_case(build: Callable[[str, str], bytes], cases: int) -> float:
+    started = time.perf_counter()
+    for i in range(cases):
+        build(f"Проверка сценария {i}", f"folder-{i % 50}")
+    return (time.perf_counter() - started) / cases
+
+
+def _peak_per_case(build: Callable[[str, str], bytes], cases: int) -> float:
+    peaks = 0
+    tracemalloc.start()
+    try:
+        for i in range(cases):
+            current, _ = tracemalloc.get_traced_memory()
+            tracemalloc.reset_peak()
+            build(f"Проверка сценария {i}", f"folder-{i % 50}")
+            peaks += tracemalloc.get_traced_memory()[1] - current
+    finally:
+        tracemalloc.stop()
+    return peaks / cases
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--cases", type=int, default=20000)
+    args = parser.parse_args()
+
+    assert _before("Тест \"1\"", "f") == _after("Тест \"1\"", "f"), "request bodies differ"
+    _after("warm-up", "f")
+
+    rows: Dict[str, Any] = {}
+    for name, build in (("before", _before), ("after", _after)):
+        rows[name] = (
+            _time_per_case(build, args.cases) * 1e6,
+            _peak_per_case(build, min(args.cases, 2000)) / 1024,
+        )
+    print(f"{'':>7} {'us/case':>9} {'peak KiB/case':>14}")
+    for name, (micros, kib) in rows.items():
+        print(f"{name:>7} {micros:>9.1f} {kib:>14.2f}")
+
+
+if __name__ == "__main__":
+    main()
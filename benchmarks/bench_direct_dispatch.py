@@ -0,0 +1,133 @@
+"""
+Equivalence check and benchmark of in-process MCP dispatch.
+
+Runs the same tool calls through `_call_mcp_sync` with `MCP_DIRECT_DISPATCH`
+off (`mcp.call_tool` + MCP content round-trip) and on (`DirectDispatcher`)
+and asserts that both paths return equal results and raise the same errors:
+
+- reads in every view, on folders and on a test case with steps;
+- creates, updates and the batch tool (results compared without the new codes);
+- invalid arguments (same pydantic errors) and failing calls (same ToolError).
+
+Then it times a large folder listing through both paths. Needs a TaskTracker;
+the stub is enough:
+
+    python -m src.tasktracker.stub &
+    TASKTRACKER_USE_STUB=true python -m benchmarks.bench_direct_dispatch [--cases 300] [--repeat 5]
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import time
+from typing import Any, Callable, Dict, List, Tuple
+
+from pydantic import ValidationError
+
+from src.mcp.tasktracker_client_tools import _call_mcp_sync
+
+_STEPS = [
+    {"step_description": "Открыть раздел \"Источники данных\"", "step_data": "", "step_result": "Раздел открыт"},
+    {"step_description": "Нажать «Добавить»", "step_data": "type=postgres", "step_result": "Открыта форма"},
+]
+
+
+def _call(direct: bool, name: str, arguments: Dict[str, Any]) -> Tuple[str, Any]:
+    """('ok', result) or ('error', comparable description of the exception)."""
+    os.environ["MCP_DIRECT_DISPATCH"] = "true" if direct else "false"
+    try:
+        return "ok", _call_mcp_sync(name, arguments)
+    except ValidationError as exc:
+        return "error", (type(exc).__name__, exc.title, exc.errors(include_url=False))
+    except Exception as exc:
+        return "error", (type(exc).__name__, str(exc))
+
+
+def _without_codes(value: Any) -> Any:
+    """Drop server-generated identifiers so results of two creates can be compared."""
+    if isinstance(value, dict):
+        return {k: _without_codes(v) for k, v in value.items() if k not in ("id", "code", "key")}
+    if isinstance(value, list):
+        return [_without_codes(v) for v in value]
+    return value
+
+
+def _check(label: str, name: str, arguments: Dict[str, Any], normalize: Callable[[Any], Any] = lambda v: v) -> Any:
+    via_mcp = _call(False, name, arguments)
+    direct = _call(True, name, arguments)
+    assert (via_mcp[0], normalize(via_mcp[1])) == (direct[0], normalize(direct[1])), (
+        f"{label}: paths differ\n  mcp:    {via_mcp!r}\n  direct: {direct!r}"
+    )
+    print(f"  ok  {label}")
+    return direct[1]
+
+
+def check_equivalence(space: str) -> str:
+    print("equivalence:")
+    _, root = _call(True, "get_root_folder_units", {"space_id_code": space, "size": 1, "view": "full"})
+    folder_args = {"name": "bench", "parent_id_code": root["folderHierarchy"]["id"]["code"], "space_id_code": space}
+    folder = _check("create_folder", "create_folder", folder_args, _without_codes)
+    folder_code = folder["id"]["code"]
+
+    created: List[str] = []
+    for direct in (False, True):
+        _, result = _call(direct, "create_test_case", {"summary": "Проверка", "suit": "test_case", "space": space, "folder_code": folder_code})
+        created.append(result["id"])
+    for direct, code in zip((False, True), created):
+        _, result = _call(direct, "update_test_case_from_steps", {"code": code, "steps": _STEPS})
+        assert result["status"] == "updated", result
+
+    code = created[0]
+    for view in ("summary", "steps", "full"):
+        _check(f"get_test_case view={view}", "get_test_case", {"code": code, "view": view})
+        _check(f"get_test_cases view={view}", "get_test_cases", {"folder_code": folder_code, "view": view})
+        _check(f"get_root_folder_units view={view}", "get_root_folder_units", {"space_id_code": space, "view": view})
+    _check("resolve_folder", "resolve_folder", {"path_or_name": "bench", "space_id_code": space})
+    _check("update_test_case_from_steps (unchanged)", "update_test_case_from_steps", {"code": code, "steps": _STEPS})
+    _check(
+        "create_test_cases_with_steps",
+        "create_test_cases_with_steps",
+        {"test_cases": [{"summary": "B", "folder_code": folder_code, "space": space, "steps": _STEPS}, {"summary": "bad"}]},
+        _without_codes,
+    )
+
+    _check("invalid: wrong type", "get_test_case", {"code": 5})
+    _check("invalid: missing argument", "get_test_case", {})
+    _check("invalid: bad view", "get_test_cases", {"folder_code": folder_code, "view": "everything"})
+    _check("failing call", "get_test_case", {"code": "NOPE-404"})
+    return folder_code
+
+
+def _best_of(repeat: int, fn: Callable[[], Any]) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def benchmark(space: str, folder_code: str, cases: int, repeat: int) -> None:
+    for i in range(cases):
+        _, result = _call(True, "create_test_case", {"summary": f"Кейс {i}", "suit": "test_case", "space": space, "folder_code": folder_code})
+        _call(True, "update_test_case_from_steps", {"code": result["id"], "steps": _STEPS * 5})
+    arguments = {"folder_code": folder_code, "size": 500, "view": "full"}
+    print(f"\nget_test_cases view=full, {cases} cases:")
+    for label, direct in (("mcp.call_tool", False), ("direct", True)):
+        seconds = _best_of(repeat, lambda: _call(direct, "get_test_cases", arguments))
+        print(f"  {label:>14} {seconds * 1000:8.1f} ms")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--space", default="PVM")
+    parser.add_argument("--cases", type=int, default=300)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    folder_code = check_equivalence(args.space)
+    benchmark(args.space, folder_code, args.cases, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,149 @@
+"""
+Benchmark of the ProseMirror step decoder on large test cases.
+
+Builds a unit in the `get_test_case` shape whose steps repeat the rich-text
+steps of `src/tasktracker/*_example.json` (bullet lists, hard breaks, marks),
+each tagged with its index so non-empty documents are all distinct, and
+measures per step count, with a cold decoder cache:
+
+- `baseline`: the previous decoder in `steps.py` (`json.loads` + stack walk);
+- `plain` / `markdown`: `prosemirror.to_plain_text` / `to_markdown`;
+- `view=steps`: the full `get_test_case` projection, and its size vs. the raw unit.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_prosemirror [--steps 100 1000 5000] [--repeat 5]
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+from src.mcp.projection import project_unit
+from src.tasktracker.prosemirror import _render_json, to_markdown, to_plain_text
+
+_EXAMPLES = Path(__file__).resolve().parent.parent / "src" / "tasktracker"
+_FIELDS = ("stepDescription", "stepData", "stepResult")
+
+
+def _baseline_plain_text(doc_json: str) -> str:
+    """The decoder `steps.py` used before `prosemirror.py` (kept here for comparison)."""
+    try:
+        node = json.loads(doc_json)
+    except (TypeError, ValueError):
+        return doc_json
+    blocks: List[str] = []
+    stack = [node]
+    current: List[str] = []
+    while stack:
+        item = stack.pop()
+        if item is None:
+            blocks.append("".join(current))
+            current = []
+            continue
+        if not isinstance(item, dict):
+            continue
+        if item.get("type") == "text":
+            current.append(str(item.get("text") or ""))
+            continue
+        children = item.get("content") or []
+        if item.get("type") in ("paragraph", "heading", "codeBlock"):
+            stack.append(None)
+        stack.extend(reversed(children))
+    return "\n".join(block for block in blocks if block) or "".join(current)
+
+
+def _example_steps() -> List[Dict[str, Any]]:
+    steps: List[Dict[str, Any]] = []
+    get_unit = json.loads((_EXAMPLES / "get_test_case_json_example.json").read_text(encoding="utf-8"))
+    for attr in get_unit["attributes"]:
+        if attr.get("code") == "test_step":
+            steps.extend(attr["value"])
+    payload = json.loads((_EXAMPLES / "test_case_json_example.json").read_text(encoding="utf-8"))
+    steps.extend(payload["attributes"].get("test_step") or [])
+    return [step for step in steps if isinstance(step, dict)]
+
+
+def _tagged(doc_json: str, tag: str) -> str:
+    """`doc_json` with `tag` appended to its first text node, so every step decodes on its own."""
+    doc = json.loads(doc_json)
+    stack = [doc]
+    while stack:
+        node = stack.pop()
+        if node.get("type") == "text":
+            node["text"] = f"{node.get('text') or ''} {tag}"
+            return json.dumps(doc, ensure_ascii=False)
+        stack.extend(reversed(node.get("content") or []))
+    return doc_json
+
+
+def _unique_step(example: Dict[str, Any], index: int) -> Dict[str, Any]:
+    step = dict(example, code=f"step-{index}")
+    for name in _FIELDS:
+        field = step.get(name)
+        if isinstance(field, dict) and field.get("text"):
+            step[name] = dict(field, text=_tagged(field["text"], f"#{index}"))
+    return step
+
+
+def _large_unit(step_count: int) -> Dict[str, Any]:
+    unit = json.loads((_EXAMPLES / "get_test_case_json_example.json").read_text(encoding="utf-8"))
+    examples = _example_steps()
+    steps = [_unique_step(examples[i % len(examples)], i) for i in range(step_count)]
+    for attr in unit["attributes"]:
+        if attr.get("code") == "test_step":
+            attr["value"] = steps
+    return unit
+
+
+def _docs(unit: Dict[str, Any]) -> List[str]:
+    docs: List[str] = []
+    for attr in unit["attributes"]:
+        if attr.get("code") != "test_step":
+            continue
+        for step in attr["value"]:
+            for name in _FIELDS:
+                field = step.get(name) or {}
+                text = field.get("text") or field.get("formattedText")
+                if text:
+                    docs.append(text)
+    return docs
+
+
+def _best_of(repeat: int, fn: Callable[[], Any]) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        _render_json.cache_clear()
+        started = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--steps", type=int, nargs="+", default=[100, 1000, 5000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'steps':>6} {'docs':>6} {'baseline ms':>12} {'plain ms':>9} {'markdown ms':>12} {'view ms':>8} {'raw kB':>8} {'view kB':>8}")
+    for step_count in args.steps:
+        unit = _large_unit(step_count)
+        docs = _docs(unit)
+        baseline = _best_of(args.repeat, lambda: [_baseline_plain_text(doc) for doc in docs])
+        plain = _best_of(args.repeat, lambda: [to_plain_text(doc) for doc in docs])
+        markdown = _best_of(args.repeat, lambda: [to_markdown(doc) for doc in docs])
+        view_time = _best_of(args.repeat, lambda: project_unit(unit, "steps"))
+        raw_size = len(json.dumps(unit, ensure_ascii=False).encode("utf-8"))
+        view_size = len(json.dumps(project_unit(unit, "steps"), ensure_ascii=False).encode("utf-8"))
+        print(
+            f"{step_count:>6} {len(docs):>6} {baseline * 1000:>12.1f} {plain * 1000:>9.1f} "
+            f"{markdown * 1000:>12.1f} {view_time * 1000:>8.1f} {raw_size / 1024:>8.1f} {view_size / 1024:>8.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
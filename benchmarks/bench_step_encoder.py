@@ -0,0 +1,98 @@
+"""
+Benchmark of the step encoder used by `build_patch_steps`.
+
+Encodes N steps (a third of them with empty `step_data`, as in real test
+cases) and compares:
+
+- `baseline`: the previous per-field encoder (nested dict + `json.dumps`)
+  with `TestStepSpec` validation of every step dict;
+- `text_docs`: the template encoder from `prosemirror.py` (cold cache);
+- `patch(dicts)` / `patch(tuples)`: the whole `build_patch_steps` for
+  untrusted dicts (validated) and trusted `StepTuple`s.
+
+Before timing, the encoder output is checked to be byte-identical to the
+baseline. Run from the repository root:
+
+    python -m benchmarks.bench_step_encoder [--steps 1000 10000 50000] [--repeat 5]
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import time
+from typing import Any, Callable, Dict, List
+
+from src.tasktracker.prosemirror import text_doc, text_docs
+from src.tasktracker.steps import StepTuple, TestStepSpec, build_patch_steps
+
+
+def _baseline_formatted_text(text: str) -> str:
+    """`build_formatted_text` before the template encoder (kept here for comparison)."""
+    doc = {
+        "type": "doc",
+        "content": [
+            {
+                "type": "paragraph",
+                "content": [{"type": "text", "text": text}],
+            }
+        ],
+    }
+    return json.dumps(doc, ensure_ascii=False)
+
+
+def _baseline_encode(step_dicts: List[Dict[str, Any]]) -> List[str]:
+    formatted: List[str] = []
+    for step in step_dicts:
+        spec = TestStepSpec(**step)
+        formatted.append(_baseline_formatted_text(spec.step_description))
+        formatted.append(_baseline_formatted_text(spec.step_data or ""))
+        formatted.append(_baseline_formatted_text(spec.step_result))
+    return formatted
+
+
+def _step_dicts(count: int) -> List[Dict[str, Any]]:
+    return [
+        {
+            "step_description": f"Открыть страницу \"Настройки\" №{i} и нажать <Сохранить>",
+            "step_data": "" if i % 3 else f"login=user{i}\tpassword=\\secret\\",
+            "step_result": f"Открыта форма {i}; сообщение об успехе",
+        }
+        for i in range(count)
+    ]
+
+
+def _best_of(repeat: int, fn: Callable[[], Any]) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        text_doc.cache_clear()
+        started = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--steps", type=int, nargs="+", default=[1000, 10000, 50000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'steps':>6} {'baseline ms':>12} {'text_docs ms':>13} {'patch(dicts) ms':>16} {'patch(tuples) ms':>17}")
+    for count in args.steps:
+        dicts = _step_dicts(count)
+        tuples = [StepTuple(**step) for step in dicts]
+        texts = [text for step in tuples for text in step]
+        assert text_docs(texts) == _baseline_encode(dicts), "encoder output differs from json.dumps"
+
+        baseline = _best_of(args.repeat, lambda: _baseline_encode(dicts))
+        encoder = _best_of(args.repeat, lambda: text_docs(texts))
+        patch_dicts = _best_of(args.repeat, lambda: build_patch_steps([], dicts))
+        patch_tuples = _best_of(args.repeat, lambda: build_patch_steps([], tuples))
+        print(
+            f"{count:>6} {baseline * 1000:>12.1f} {encoder * 1000:>13.1f} "
+            f"{patch_dicts * 1000:>16.1f} {patch_tuples * 1000:>17.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
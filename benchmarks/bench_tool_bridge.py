@@ -0,0 +1,104 @@
+"""
+Microbenchmark of the sync -> async bridge used by the in-process MCP tools.
+
+Calls a trivial FastMCP tool through:
+
+- `asyncio.run`: the previous `_call_mcp_sync` (new event loop per call, plus
+  a new thread pool when the caller already runs a loop);
+- `BackgroundLoop`: the shared loop thread now used by `_call_mcp_sync`.
+
+Both are measured from a plain thread and from inside a running event loop
+(as when a sync tool is invoked by async agent code), in calls per second.
+Run from the repository root:
+
+    python -m benchmarks.bench_tool_bridge [--calls 2000]
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import concurrent.futures
+import time
+from typing import Any, Callable, Dict
+
+from fastmcp import FastMCP
+
+from src.mcp.background_loop import BackgroundLoop
+from src.mcp.tasktracker_client_tools import _tool_result_to_python
+
+bench_mcp = FastMCP("bridge-benchmark")
+
+
+@bench_mcp.tool()
+async def echo(value: int) -> Dict[str, int]:
+    return {"value": value}
+
+
+def _call_with_asyncio_run(name: str, arguments: Dict[str, Any]) -> Any:
+    """The previous `_call_mcp_sync` (kept here for comparison)."""
+
+    async def _run() -> Any:
+        return _tool_result_to_python(await bench_mcp.call_tool(name, arguments))
+
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        loop = None
+    if loop is not None:
+        with concurrent.futures.ThreadPoolExecutor() as pool:
+            return pool.submit(asyncio.run, _run()).result()
+    return asyncio.run(_run())
+
+
+def _bridge_caller(bridge: BackgroundLoop) -> Callable[[str, Dict[str, Any]], Any]:
+    def call(name: str, arguments: Dict[str, Any]) -> Any:
+        async def _run() -> Any:
+            return _tool_result_to_python(await bench_mcp.call_tool(name, arguments))
+
+        return bridge.run(_run())
+
+    return call
+
+
+def _calls_per_second(call: Callable[[str, Dict[str, Any]], Any], calls: int) -> float:
+    started = time.perf_counter()
+    for i in range(calls):
+        assert call("echo", {"value": i}) == {"value": i}
+    return calls / (time.perf_counter() - started)
+
+
+def _inside_loop(call: Callable[[str, Dict[str, Any]], Any], calls: int) -> float:
+    async def main() -> float:
+        return _calls_per_second(call, calls)
+
+    return asyncio.run(main())
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--calls", type=int, default=2000)
+    args = parser.parse_args()
+
+    bridge = BackgroundLoop("bench-loop")
+    bridged = _bridge_caller(bridge)
+    bridged("echo", {"value": 0})  # start the loop outside the measurement
+    try:
+        rows = {
+            "asyncio.run": (
+                _calls_per_second(_call_with_asyncio_run, args.calls),
+                _inside_loop(_call_with_asyncio_run, args.calls),
+            ),
+            "BackgroundLoop": (
+                _calls_per_second(bridged, args.calls),
+                _inside_loop(bridged, args.calls),
+            ),
+        }
+    finally:
+        bridge.stop()
+    print(f"{'':>15} {'calls/s (thread)':>17} {'calls/s (in loop)':>18}")
+    for name, (plain, in_loop) in rows.items():
+        print(f"{name:>15} {plain:>17.0f} {in_loop:>18.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -13,14 +13,20 @@ from langgraph.store.memory import InMemoryStore
 
 from src.agent.prompts import SYSTEM_PROMPT
 from src.mcp.tasktracker_client_tools import (
+    clone_folder_test_cases_tool,
     create_folder_tool,
     create_test_case_tool,
+    create_test_cases_with_steps_tool,
+    crawl_folder_subtree_tool,
     get_root_folder_units_tool,
     get_single_test_case_tool,
+    get_test_cases_by_codes_tool,
     get_test_cases_tool,
+    resolve_folder_tool,
     update_test_case_tool,
 )
 from src.config import (
+    get_agent_max_tool_concurrency,
     get_gigachat_credentials,
     get_gigachat_verify_ssl,
     get_hub_api_key,
@@ -174,16 +180,25 @@ def build_agent() -> Any:
     """
     Create the deep agent graph wired with TaskTracker tools and GigaChat.
 
-    Returns a LangGraph runnable that you can `.invoke` or `.stream`.
+    Returns the compiled LangGraph graph (the `ui-test-agent` factory in
+    langgraph.json) that you can `.invoke` or `.stream`; pass
+    `agent_config(thread_id)` as the config.
     """
     tools = [
         get_root_folder_units_tool(),
+        resolve_folder_tool(),
         create_folder_tool(),
         get_test_cases_tool(),
+        crawl_folder_subtree_tool(),
         get_single_test_case_tool(),
+        get_test_cases_by_codes_tool(),
         # Create empty test case (no steps); then use update_test_case_from_steps to add steps
         create_test_case_tool(),
         update_test_case_tool(),
+        # Batch create + steps for several new test cases in one call
+        create_test_cases_with_steps_tool(),
+        # Whole-folder copy with text substitutions, done in code
+        clone_folder_test_cases_tool(),
     ]
 
     model = build_model()
@@ -207,11 +222,29 @@ def build_agent() -> Any:
             "create_test_case": True,
             "update_test_case": True,
             "update_test_case_from_steps": True,
+            "create_test_cases_with_steps": True,
+            "clone_folder_test_cases": True,
         },
     )
     return agent
 
 
+def agent_config(thread_id: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Invoke config for the agent: the thread id (when given) and the bound on
+    parallel tool calls.
+
+    Tool calls of one model turn run as parallel tasks of the same step;
+    `max_concurrency` bounds them (ToolMessages keep the order of the calls).
+    Mutating calls on the same test case are serialized by the TaskTracker
+    tool wrappers.
+    """
+    config: Dict[str, Any] = {"max_concurrency": get_agent_max_tool_concurrency()}
+    if thread_id:
+        config["configurable"] = {"thread_id": thread_id}
+    return config
+
+
 def run_once(agent: Any, user_message: str, thread_id: Optional[str] = None) -> Dict[str, Any]:
     """
     Convenience helper to run the agent once on a single user instruction.
@@ -227,10 +260,7 @@ def run_once(agent: Any, user_message: str, thread_id: Optional[str] = None) ->
             }
         ]
     }
-    if thread_id:
-        config = {"configurable": {"thread_id": thread_id}}
-        return agent.invoke(payload, config)
-    return agent.invoke(payload)
+    return agent.invoke(payload, agent_config(thread_id))
 
 
 def run_until_done(
@@ -245,8 +275,10 @@ def run_until_done(
 
     If `auto_approve` is True, any human-in-the-loop interrupt is resolved
     by approving all pending tool calls. Otherwise callers must handle
-    `result["__interrupt__"]` themselves (e.g. interactive REPL).
+    `result["__interrupt__"]` themselves (e.g. interactive REPL). `config`
+    without `max_concurrency` gets the one from `agent_config`.
     """
+    config = {**agent_config(), **config}
     result = agent.invoke(payload, config)
     while result.get("__interrupt__") and auto_approve:
         interrupts = result["__interrupt__"][0].value
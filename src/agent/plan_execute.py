@@ -0,0 +1,211 @@
+"""
+Plan-then-execute mode: one structured LLM call, then a deterministic batch.
+
+With the deep agent every new test case costs at least two tool-calling
+turns (create, then steps) plus their approvals. In this mode the context
+is gathered in code (the target folder and, optionally, the test cases of a
+source folder, read in full and shown in the compact `steps` view), the model is asked once for a
+`TestPlan` via structured output, and `execute_plan` applies the whole plan
+with `create_test_cases_with_steps`. If the model's output does not
+validate, it gets one more call with the validation errors, so a run costs
+one or two LLM calls regardless of how many test cases it creates.
+"""
+from __future__ import annotations
+
+import json
+import logging
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+from pydantic import BaseModel, Field, ValidationError
+
+from src.agent.prompts import PLAN_PROMPT
+from src.mcp.projection import project_unit
+from src.tasktracker.steps import DEFAULT_BATCH_WORKERS, NewTestCaseSpec, TestStepSpec, create_test_cases_with_steps
+from src.tasktracker.tools import fetch_all_test_cases, get_test_cases_by_codes, resolve_folder
+
+log = logging.getLogger(__name__)
+
+# Source test cases shown to the model as examples.
+DEFAULT_MAX_EXAMPLES = 30
+# LLM calls per run: the plan, plus one retry when it does not validate.
+MAX_PLAN_ATTEMPTS = 2
+
+
+class PlannedTestCase(BaseModel):
+    """One test case of the plan."""
+
+    summary: str = Field(..., min_length=1, description="Test case summary / title.")
+    steps: List[TestStepSpec] = Field(..., min_length=1, description="Ordered test steps.")
+
+
+class TestPlan(BaseModel):
+    """Structured plan produced by the model in plan-then-execute mode."""
+
+    overview: str = Field("", description="Short description of what is created and why.")
+    test_cases: List[PlannedTestCase] = Field(..., min_length=1, description="Test cases to create.")
+
+
+@dataclass
+class PlanContext:
+    """What the model gets besides the requirement: where to create and what to imitate."""
+
+    space: str
+    target_folder_code: str
+    target_folder_path: str = ""
+    source_folder_code: Optional[str] = None
+    source_folder_path: str = ""
+    examples: List[Dict[str, Any]] = field(default_factory=list)
+
+    def render(self) -> str:
+        lines = [
+            f"Space: {self.space}",
+            f"Target folder: {self.target_folder_code} ({self.target_folder_path or 'path unknown'})",
+        ]
+        if self.source_folder_code:
+            lines.append(f"Source folder: {self.source_folder_code} ({self.source_folder_path or 'path unknown'})")
+            lines.append(f"Source test cases ({len(self.examples)}), steps as [description, data, result]:")
+            lines.append(json.dumps(self.examples, ensure_ascii=False))
+        return "\n".join(lines)
+
+
+def _resolve_folder(path_or_code: str, space: str) -> Dict[str, Any]:
+    """The single folder matching a code, path or name; ValueError when none or several match."""
+    matches = resolve_folder(path_or_code, space_id_code=space)["matches"]
+    if len(matches) == 1:
+        return matches[0]
+    if not matches:
+        raise ValueError(f"Folder {path_or_code!r} not found in space {space!r}")
+    options = ", ".join(f"{m['code']} ({m['path']})" for m in matches[:10])
+    raise ValueError(f"Folder {path_or_code!r} is ambiguous in space {space!r}: {options}")
+
+
+def _full_units(units: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Listed units replaced by their full `get_test_case` read (listings carry no steps)."""
+    reads = {
+        entry["code"]: entry
+        for entry in get_test_cases_by_codes(str(unit["code"]) for unit in units if unit.get("code"))
+    }
+    full: List[Dict[str, Any]] = []
+    for unit in units:
+        entry = reads.get(str(unit.get("code")))
+        if entry is not None and entry["status"] == "ok":
+            full.append(entry["test_case"])
+        else:
+            if entry is not None:
+                log.warning("plan-execute: example %s not read (%s); using its listing", entry["code"], entry["error"])
+            full.append(unit)
+    return full
+
+
+def build_plan_context(
+    space: str,
+    target_folder: str,
+    source_folder: Optional[str] = None,
+    max_examples: int = DEFAULT_MAX_EXAMPLES,
+) -> PlanContext:
+    """Resolve the folders (code, path or name) and read up to `max_examples` source test cases in full."""
+    target = _resolve_folder(target_folder, space)
+    context = PlanContext(space=space, target_folder_code=target["code"], target_folder_path=target["path"])
+    if source_folder:
+        source = _resolve_folder(source_folder, space)
+        fetched = fetch_all_test_cases(source["code"])
+        context.source_folder_code = source["code"]
+        context.source_folder_path = source["path"]
+        context.examples = [project_unit(unit, "steps") for unit in _full_units(fetched.units[:max_examples])]
+    return context
+
+
+def _plan_messages(requirement: str, context: PlanContext, error: Optional[str]) -> List[Dict[str, str]]:
+    messages = [
+        {"role": "system", "content": PLAN_PROMPT},
+        {"role": "user", "content": f"{context.render()}\n\nRequirement:\n{requirement}"},
+    ]
+    if error:
+        messages.append(
+            {
+                "role": "user",
+                "content": f"Your previous plan was invalid:\n{error}\nReturn the complete corrected plan.",
+            }
+        )
+    return messages
+
+
+def _describe_error(exc: Exception) -> str:
+    if isinstance(exc, ValidationError):
+        return "; ".join(f"{'.'.join(str(p) for p in err['loc'])}: {err['msg']}" for err in exc.errors())
+    return f"{type(exc).__name__}: {exc}"
+
+
+def generate_plan(model: Any, requirement: str, context: PlanContext) -> TestPlan:
+    """
+    Ask `model` (a LangChain chat model with structured output) for a `TestPlan`.
+
+    Output that does not validate is sent back once with the errors; raises
+    ValueError when the second attempt is invalid too.
+    """
+    planner = model.with_structured_output(TestPlan)
+    error: Optional[str] = None
+    for attempt in range(1, MAX_PLAN_ATTEMPTS + 1):
+        try:
+            raw = planner.invoke(_plan_messages(requirement, context, error))
+            plan = raw if isinstance(raw, TestPlan) else TestPlan.model_validate(raw)
+        except (ValidationError, ValueError) as exc:
+            error = _describe_error(exc)
+            log.warning("plan-execute: plan attempt %s invalid: %s", attempt, error)
+            continue
+        log.info("plan-execute: plan with %s test cases (attempt %s)", len(plan.test_cases), attempt)
+        return plan
+    raise ValueError(f"Model did not produce a valid plan after {MAX_PLAN_ATTEMPTS} attempts: {error}")
+
+
+def execute_plan(
+    plan: TestPlan,
+    context: PlanContext,
+    *,
+    max_workers: int = DEFAULT_BATCH_WORKERS,
+) -> Dict[str, Any]:
+    """
+    Create every planned test case with its steps in the target folder, in
+    one batch; returns the per-item report. The folder is never taken from
+    the model, so a plan cannot write outside the target.
+    """
+    batch = [
+        NewTestCaseSpec(
+            summary=item.summary,
+            folder_code=context.target_folder_code,
+            space=context.space,
+            steps=item.steps,
+        )
+        for item in plan.test_cases
+    ]
+    return create_test_cases_with_steps(batch, max_workers=max_workers)
+
+
+def render_plan(plan: TestPlan, context: PlanContext) -> str:
+    """Markdown of the plan for the run artifacts (`plan.md`)."""
+    lines = ["# Plan", ""]
+    if plan.overview:
+        lines += [plan.overview, ""]
+    lines.append(f"Target folder: `{context.target_folder_code}` {context.target_folder_path}".rstrip())
+    if context.source_folder_code:
+        lines.append(f"Source folder: `{context.source_folder_code}` {context.source_folder_path}".rstrip())
+    for index, item in enumerate(plan.test_cases, start=1):
+        lines += ["", f"## {index}. {item.summary}"]
+        for number, step in enumerate(item.steps, start=1):
+            data = f" [{step.step_data}]" if step.step_data else ""
+            lines.append(f"{number}. {step.step_description}{data} → {step.step_result}")
+    return "\n".join(lines) + "\n"
+
+
+def run_plan_execute(
+    model: Any,
+    requirement: str,
+    context: PlanContext,
+    *,
+    max_workers: int = DEFAULT_BATCH_WORKERS,
+) -> Dict[str, Any]:
+    """Plan with one (or two) LLM calls, then execute; returns `plan`, `plan_markdown` and `report`."""
+    plan = generate_plan(model, requirement, context)
+    report = execute_plan(plan, context, max_workers=max_workers)
+    return {"plan": plan, "plan_markdown": render_plan(plan, context), "report": report}
@@ -9,6 +9,20 @@ def _get_bool_env(name: str, default: bool = False) -> bool:
     return value.strip().lower() in {"1", "true", "yes", "y"}
 
 
+def _get_int_env(name: str, default: int) -> int:
+    value = os.getenv(name)
+    if value is None or not value.strip():
+        return default
+    return int(value)
+
+
+def _get_float_env(name: str, default: float) -> float:
+    value = os.getenv(name)
+    if value is None or not value.strip():
+        return default
+    return float(value)
+
+
 def get_gigachat_credentials() -> str:
     """
     Return the credentials/token for GigaChat.
@@ -86,6 +100,228 @@ def get_tasktracker_basic_auth() -> Optional[str]:
     return os.getenv("TASKTRACKER_BASIC_AUTH")
 
 
+def get_tasktracker_max_connections() -> int:
+    """
+    Maximum number of concurrent connections in the shared TaskTracker pool.
+
+    Uses `TASKTRACKER_MAX_CONNECTIONS`. Defaults to 20.
+    """
+    return _get_int_env("TASKTRACKER_MAX_CONNECTIONS", 20)
+
+
+def get_tasktracker_max_keepalive_connections() -> int:
+    """
+    Maximum number of idle keep-alive connections kept in the TaskTracker pool.
+
+    Uses `TASKTRACKER_MAX_KEEPALIVE_CONNECTIONS`. Defaults to 10.
+    """
+    return _get_int_env("TASKTRACKER_MAX_KEEPALIVE_CONNECTIONS", 10)
+
+
+def get_tasktracker_keepalive_expiry() -> float:
+    """
+    Seconds an idle TaskTracker connection is kept open before being closed.
+
+    Uses `TASKTRACKER_KEEPALIVE_EXPIRY`. Defaults to 30 seconds.
+    """
+    return _get_float_env("TASKTRACKER_KEEPALIVE_EXPIRY", 30.0)
+
+
+def get_tasktracker_http2() -> bool:
+    """
+    Whether to negotiate HTTP/2 with TaskTracker.
+
+    Uses `TASKTRACKER_HTTP2` (true/false). Defaults to False. Requires the
+    optional `h2` package (`httpx[http2]`); without it the client falls back
+    to HTTP/1.1.
+    """
+    return _get_bool_env("TASKTRACKER_HTTP2", default=False)
+
+
+def get_tasktracker_unit_cache_size() -> int:
+    """
+    Maximum number of units kept in the shared `get_test_case` cache.
+
+    Uses `TASKTRACKER_UNIT_CACHE_SIZE`. Defaults to 512; set to 0 to disable caching.
+    """
+    return _get_int_env("TASKTRACKER_UNIT_CACHE_SIZE", 512)
+
+
+def get_tasktracker_unit_cache_ttl() -> float:
+    """
+    Seconds a cached unit is served without revalidation.
+
+    Uses `TASKTRACKER_UNIT_CACHE_TTL`. Defaults to 60 seconds.
+    """
+    return _get_float_env("TASKTRACKER_UNIT_CACHE_TTL", 60.0)
+
+
+def get_tasktracker_step_ledger_size() -> int:
+    """
+    Maximum number of test cases whose step codes are remembered after our own writes.
+
+    Uses `TASKTRACKER_STEP_LEDGER_SIZE`. Defaults to 1024; set to 0 to always
+    fetch the test case before updating its steps.
+    """
+    return _get_int_env("TASKTRACKER_STEP_LEDGER_SIZE", 1024)
+
+
+def get_tasktracker_step_ledger_ttl() -> float:
+    """
+    Seconds remembered step codes are trusted before the test case is fetched again.
+
+    Uses `TASKTRACKER_STEP_LEDGER_TTL`. Defaults to 600 seconds.
+    """
+    return _get_float_env("TASKTRACKER_STEP_LEDGER_TTL", 600.0)
+
+
+def get_tasktracker_retry_max_attempts() -> int:
+    """
+    Maximum attempts per TaskTracker request (first try included); 1 disables retries.
+
+    Uses `TASKTRACKER_RETRY_MAX_ATTEMPTS`. Defaults to 4.
+    """
+    return _get_int_env("TASKTRACKER_RETRY_MAX_ATTEMPTS", 4)
+
+
+def get_tasktracker_retry_base_delay() -> float:
+    """
+    Base delay in seconds for exponential backoff between retries.
+
+    Uses `TASKTRACKER_RETRY_BASE_DELAY`. Defaults to 0.5 seconds.
+    """
+    return _get_float_env("TASKTRACKER_RETRY_BASE_DELAY", 0.5)
+
+
+def get_tasktracker_retry_max_delay() -> float:
+    """
+    Upper bound in seconds for a single backoff delay.
+
+    Uses `TASKTRACKER_RETRY_MAX_DELAY`. Defaults to 30 seconds.
+    """
+    return _get_float_env("TASKTRACKER_RETRY_MAX_DELAY", 30.0)
+
+
+def get_tasktracker_breaker_failure_threshold() -> int:
+    """
+    Consecutive failures (transport errors or 5xx) that open an endpoint's circuit.
+
+    Uses `TASKTRACKER_BREAKER_FAILURE_THRESHOLD`. Defaults to 5.
+    """
+    return _get_int_env("TASKTRACKER_BREAKER_FAILURE_THRESHOLD", 5)
+
+
+def get_tasktracker_breaker_reset_timeout() -> float:
+    """
+    Seconds an open circuit fails fast before letting one probe request through.
+
+    Uses `TASKTRACKER_BREAKER_RESET_TIMEOUT`. Defaults to 30 seconds.
+    """
+    return _get_float_env("TASKTRACKER_BREAKER_RESET_TIMEOUT", 30.0)
+
+
+def get_tasktracker_rate_limit() -> float:
+    """
+    Maximum TaskTracker requests per second across the process (token bucket).
+
+    Uses `TASKTRACKER_RATE_LIMIT`. Defaults to 20; set to 0 to disable the rate cap.
+    """
+    return _get_float_env("TASKTRACKER_RATE_LIMIT", 20.0)
+
+
+def get_tasktracker_rate_burst() -> float:
+    """
+    Requests allowed in a burst above the steady rate.
+
+    Uses `TASKTRACKER_RATE_BURST`. Defaults to the rate limit.
+    """
+    return _get_float_env("TASKTRACKER_RATE_BURST", get_tasktracker_rate_limit())
+
+
+def get_tasktracker_min_in_flight() -> int:
+    """
+    Floor of the adaptive in-flight request limit.
+
+    Uses `TASKTRACKER_MIN_IN_FLIGHT`. Defaults to 1.
+    """
+    return _get_int_env("TASKTRACKER_MIN_IN_FLIGHT", 1)
+
+
+def get_tasktracker_max_in_flight() -> int:
+    """
+    Ceiling of the adaptive in-flight request limit; 0 disables the limiter.
+
+    Uses `TASKTRACKER_MAX_IN_FLIGHT`. Defaults to `TASKTRACKER_MAX_CONNECTIONS`.
+    """
+    return _get_int_env("TASKTRACKER_MAX_IN_FLIGHT", get_tasktracker_max_connections())
+
+
+def get_mcp_direct_dispatch() -> bool:
+    """
+    Whether in-process agent tool calls bypass MCP serialization.
+
+    Uses `MCP_DIRECT_DISPATCH` (default true): the LangChain wrappers call the
+    MCP tool functions directly (same validation and results, see
+    `src/mcp/direct_dispatch.py`). Set to false to go through `mcp.call_tool`.
+    """
+    return _get_bool_env("MCP_DIRECT_DISPATCH", default=True)
+
+
+def get_agent_max_tool_concurrency() -> int:
+    """
+    How many tool calls from one model turn the agent runs at once.
+
+    Uses `AGENT_MAX_TOOL_CONCURRENCY` (default 8); results are still returned
+    to the model in the order of the calls. 1 runs them one after another.
+    """
+    return max(1, _get_int_env("AGENT_MAX_TOOL_CONCURRENCY", 8))
+
+
+def get_mcp_transport() -> str:
+    """
+    Transport of the TaskTracker MCP server.
+
+    Uses `MCP_TRANSPORT` (default "stdio", one process per MCP host). Set to
+    "http" (streamable HTTP) or "sse" to serve many clients from one process
+    that shares the TaskTracker connection pool and caches.
+    """
+    return os.getenv("MCP_TRANSPORT", "stdio").strip().lower()
+
+
+def get_mcp_host() -> str:
+    """Interface the HTTP/SSE MCP server binds to (`MCP_HOST`, default 127.0.0.1)."""
+    return os.getenv("MCP_HOST", "127.0.0.1")
+
+
+def get_mcp_port() -> int:
+    """Port of the HTTP/SSE MCP server (`MCP_PORT`, default 8000)."""
+    return _get_int_env("MCP_PORT", 8000)
+
+
+def get_mcp_workers() -> int:
+    """
+    Tool calls the HTTP/SSE MCP server runs at once across all clients.
+
+    Uses `MCP_WORKERS`; defaults to `get_tasktracker_max_in_flight()` so the
+    server does not queue more work than TaskTracker connections allow.
+    """
+    return _get_int_env("MCP_WORKERS", get_tasktracker_max_in_flight())
+
+
+def get_mcp_max_calls_per_client() -> int:
+    """Tool calls one MCP client may run at once (`MCP_MAX_CALLS_PER_CLIENT`, default 4)."""
+    return _get_int_env("MCP_MAX_CALLS_PER_CLIENT", 4)
+
+
+def get_mcp_call_wait_timeout() -> float:
+    """
+    Seconds a tool call waits for a free slot before failing (`MCP_CALL_WAIT_TIMEOUT`).
+
+    Default 60; 0 or less waits without limit.
+    """
+    return _get_float_env("MCP_CALL_WAIT_TIMEOUT", 60.0)
+
+
 def get_postgres_checkpoint_url() -> Optional[str]:
     """
     Optional Postgres connection string for LangGraph checkpointer.
@@ -5,12 +5,13 @@ import json
 import logging
 import sys
 import uuid
-from typing import Any, Dict
+from typing import Any, Dict, Optional
 
 from dotenv import load_dotenv
 from langgraph.types import Command
 
-from src.agent.graph import build_agent, run_once, run_until_done
+from src.agent.graph import agent_config, build_agent, build_model, run_once, run_until_done
+from src.agent.plan_execute import build_plan_context, run_plan_execute
 from src.config import get_runs_dir
 from src.run_artifacts import (
     create_run_dir,
@@ -19,7 +20,9 @@ from src.run_artifacts import (
     write_created_tests,
     write_failure_reason,
     write_plan,
+    write_plan_json,
 )
+from src.tasktracker.steps import DEFAULT_BATCH_WORKERS
 
 logging.basicConfig(level=logging.INFO)
 
@@ -79,6 +82,35 @@ def _build_user_message_from_task_code(task_code: str) -> str:
     return "\n\n".join(p for p in parts if p).strip()
 
 
+def _run_plan_execute(args: argparse.Namespace, user_message: str) -> Dict[str, Any]:
+    """Plan-then-execute: one structured plan from the model, then one batch create."""
+    context = build_plan_context(args.space, args.target_folder, args.source_folder)
+    outcome = run_plan_execute(build_model(), user_message, context, max_workers=args.max_workers)
+    report = outcome["report"]
+    print(
+        f"Plan-execute: {report['succeeded']} of {report['total']} test cases created in {context.target_folder_code}.",
+        file=sys.stderr,
+    )
+    return outcome
+
+
+def _write_plan_execute_artifacts(run_dir: Any, outcome: Dict[str, Any]) -> Optional[str]:
+    """Write plan.md, plan.json and created_tests.json; return a failure reason for failed items, if any."""
+    write_plan(run_dir, outcome["plan_markdown"])
+    write_plan_json(run_dir, outcome["plan"].model_dump())
+    report = outcome["report"]
+    write_created_tests(run_dir, [{"tool": "create_test_cases_with_steps", "args": {}, "result": report}])
+    failed = [item for item in report["results"] if item["status"] != "ok"]
+    if not failed:
+        return None
+    lines = [f"{len(failed)} of {report['total']} planned test cases failed:"]
+    lines += [
+        f"- #{item['index']} {item['summary']!r}: stage={item['stage']} code={item['code']} {item.get('error', '')}"
+        for item in failed
+    ]
+    return "\n".join(lines)
+
+
 def _single_run_main(args: argparse.Namespace) -> int:
     """Run single-run mode: resolve input, run agent with auto-approve, write artifacts."""
     import os
@@ -88,6 +120,9 @@ def _single_run_main(args: argparse.Namespace) -> int:
     if not args.task_code and not args.prompt:
         print("Error: provide --task-code and/or --prompt.", file=sys.stderr)
         return 1
+    if args.plan_execute and not args.target_folder:
+        print("Error: --plan-execute requires --target-folder.", file=sys.stderr)
+        return 1
 
     dry_run = getattr(args, "dry_run", False)
     if dry_run:
@@ -101,6 +136,7 @@ def _single_run_main(args: argparse.Namespace) -> int:
     failed = False
     failure_parts = []
     result = {}
+    plan_outcome: Optional[Dict[str, Any]] = None
 
     try:
         # Resolve user message (--task-code fetches real task from TaskTracker even in dry-run)
@@ -112,20 +148,32 @@ def _single_run_main(args: argparse.Namespace) -> int:
         else:
             user_message = args.prompt
 
-        agent = build_agent()
-        payload = {
-            "messages": [
-                {"role": "user", "content": user_message},
-            ]
-        }
-        config = {"configurable": {"thread_id": run_id}}
-        result = run_until_done(agent, payload, config, auto_approve=True)
+        if args.plan_execute:
+            plan_outcome = _run_plan_execute(args, user_message)
+        else:
+            agent = build_agent()
+            payload = {
+                "messages": [
+                    {"role": "user", "content": user_message},
+                ]
+            }
+            config = agent_config(run_id)
+            result = run_until_done(agent, payload, config, auto_approve=True)
     except Exception as e:
         failed = True
         failure_parts.append(f"Exception: {e}")
         import traceback
         failure_parts.append(traceback.format_exc())
 
+    if plan_outcome is not None:
+        failure = _write_plan_execute_artifacts(run_dir, plan_outcome)
+        if failure:
+            write_failure_reason(run_dir, failure)
+            print(f"Single run finished with failed items. Artifacts in {run_dir}", file=sys.stderr)
+            return 1
+        print(f"{'Dry run' if dry_run else 'Run'} {run_id} finished. Artifacts in {run_dir}")
+        return 0
+
     # Write plan and created_tests in all cases
     plan_content = extract_plan_from_result(result)
     if plan_content:
@@ -216,6 +264,35 @@ def main() -> None:
         action="store_true",
         help="Do not create or update anything in TaskTracker (read-only + fake create/update). --task-code still fetches the real task. Artifacts are written.",
     )
+    single_run_parser.add_argument(
+        "--plan-execute",
+        action="store_true",
+        help=(
+            "Plan-then-execute: the model returns one structured plan of test cases (one or two LLM "
+            "calls) which is then created in one batch, instead of the tool-calling agent."
+        ),
+    )
+    single_run_parser.add_argument(
+        "--target-folder",
+        metavar="FOLDER",
+        help="With --plan-execute: folder code, path or name to create the test cases in.",
+    )
+    single_run_parser.add_argument(
+        "--source-folder",
+        metavar="FOLDER",
+        help="With --plan-execute: folder whose test cases are shown to the model as examples.",
+    )
+    single_run_parser.add_argument(
+        "--space",
+        default="PVM",
+        help="With --plan-execute: TaskTracker space code of the folders (default: PVM).",
+    )
+    single_run_parser.add_argument(
+        "--max-workers",
+        type=int,
+        default=DEFAULT_BATCH_WORKERS,
+        help=f"With --plan-execute: test cases created concurrently (default: {DEFAULT_BATCH_WORKERS}).",
+    )
 
     args = parser.parse_args()
 
@@ -233,7 +310,7 @@ def main() -> None:
         thread_id = args.thread_id or str(uuid.uuid4())
         print(f"Starting interactive UI Test Generator. Thread id: {thread_id}")
         print("Starting interactive UI Test Generator. Type Ctrl+C to exit.")
-        config = {"configurable": {"thread_id": thread_id}}
+        config = agent_config(thread_id)
         try:
             while True:
                 line = input("> ").strip()
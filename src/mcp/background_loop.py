@@ -0,0 +1,111 @@
+"""
+A long-lived event loop in a daemon thread for calling async code from sync code.
+
+The LangChain tool wrappers are synchronous but the MCP tools are coroutines.
+Running each call with `asyncio.run` created and tore down an event loop per
+tool call (plus a thread pool when a loop was already running), and the shared
+async TaskTracker client, which is bound to its loop, was rebuilt every time.
+`BackgroundLoop` starts one loop on first use; `run()` submits a coroutine to
+it from any thread and blocks for the result, so a call costs one queue hop
+and connections stay pooled across calls. `stop()` runs an optional cleanup
+coroutine on the loop, cancels what is left and joins the thread.
+"""
+from __future__ import annotations
+
+import asyncio
+import concurrent.futures
+import logging
+import threading
+from typing import Any, Awaitable, Callable, Coroutine, Optional, TypeVar
+
+log = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class BackgroundLoop:
+    """One event loop running in a daemon thread; coroutines are submitted from any thread."""
+
+    def __init__(self, name: str = "background-loop") -> None:
+        self.name = name
+        self._lock = threading.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def running(self) -> bool:
+        return self._loop is not None
+
+    def in_loop_thread(self) -> bool:
+        return self._thread is not None and self._thread is threading.current_thread()
+
+    def _ensure_started(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            if self._loop is not None:
+                return self._loop
+            loop = asyncio.new_event_loop()
+            ready = threading.Event()
+
+            def serve() -> None:
+                asyncio.set_event_loop(loop)
+                loop.call_soon(ready.set)
+                loop.run_forever()
+
+            thread = threading.Thread(target=serve, name=self.name, daemon=True)
+            thread.start()
+            ready.wait()
+            self._loop, self._thread = loop, thread
+            log.debug("%s: event loop started", self.name)
+            return loop
+
+    def submit(self, coro: Coroutine[Any, Any, T]) -> "concurrent.futures.Future[T]":
+        """Schedule `coro` on the loop (starting it if needed) and return its future."""
+        return asyncio.run_coroutine_threadsafe(coro, self._ensure_started())
+
+    def run(self, coro: Coroutine[Any, Any, T], timeout: Optional[float] = None) -> T:
+        """Run `coro` on the loop and block the calling thread until it finishes."""
+        if self.in_loop_thread():
+            coro.close()
+            raise RuntimeError(f"{self.name}: run() called from the loop thread; await the coroutine instead")
+        future = self.submit(coro)
+        try:
+            return future.result(timeout)
+        except BaseException:
+            # Timeout or interrupt of the waiting thread: do not leave the call running.
+            future.cancel()
+            raise
+
+    def stop(
+        self,
+        cleanup: Optional[Callable[[], Awaitable[Any]]] = None,
+        timeout: float = 5.0,
+    ) -> None:
+        """Run `cleanup()` on the loop, cancel remaining tasks, stop the loop and join its thread."""
+        with self._lock:
+            loop, thread = self._loop, self._thread
+            self._loop = self._thread = None
+        if loop is None or thread is None:
+            return
+
+        async def shutdown() -> None:
+            if cleanup is not None:
+                try:
+                    await cleanup()
+                except Exception:
+                    log.warning("%s: cleanup failed", self.name, exc_info=True)
+            pending = [task for task in asyncio.all_tasks() if task is not asyncio.current_task()]
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+            await loop.shutdown_asyncgens()
+
+        try:
+            asyncio.run_coroutine_threadsafe(shutdown(), loop).result(timeout)
+        except Exception:
+            log.warning("%s: shutdown did not complete cleanly", self.name, exc_info=True)
+        finally:
+            loop.call_soon_threadsafe(loop.stop)
+            thread.join(timeout)
+            if not thread.is_alive():
+                loop.close()
+        log.debug("%s: event loop stopped", self.name)
@@ -0,0 +1,125 @@
+"""
+Concurrency caps for the TaskTracker MCP server when it serves many clients.
+
+Over HTTP/SSE one server process is shared by every connected IDE, so one
+client running a large batch could take all TaskTracker connections.
+`ClientConcurrencyMiddleware` bounds tool calls at two levels:
+
+- per client (MCP `client_id`, else the session id): at most
+  `max_per_client` of its tool calls run at once, the rest wait their turn;
+- per server: at most `max_total` tool calls run at once (the worker slots).
+
+Calls wait for a slot up to `acquire_timeout` seconds and then fail with a
+`ToolError` the client can retry. Semaphores of idle clients are dropped, so
+the table does not grow with the number of sessions ever seen.
+
+`KeyedLock` gives mutual exclusion per key (e.g. mutating tool calls on the
+same test case issued in one model turn) while different keys run in parallel.
+Holders are admitted in the order they reach the lock, which need not be the
+order their callers were started in.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+from contextlib import AsyncExitStack, asynccontextmanager
+from typing import Any, AsyncIterator, Dict, Hashable, Optional, Tuple
+
+from fastmcp.exceptions import ToolError
+from fastmcp.server.middleware import CallNext, Middleware, MiddlewareContext
+
+log = logging.getLogger(__name__)
+
+_ANONYMOUS = "anonymous"
+
+
+def client_key(context: MiddlewareContext) -> str:
+    """Identity a call is accounted to: MCP client id, else session id."""
+    ctx = context.fastmcp_context
+    if ctx is None:
+        return _ANONYMOUS
+    client_id = ctx.client_id
+    if client_id:
+        return f"client:{client_id}"
+    try:
+        return f"session:{ctx.session_id}"
+    except RuntimeError:
+        return _ANONYMOUS
+
+
+class ClientConcurrencyMiddleware(Middleware):
+    """Caps concurrent tool calls per client and for the whole server."""
+
+    def __init__(
+        self,
+        max_per_client: int,
+        max_total: Optional[int] = None,
+        acquire_timeout: Optional[float] = None,
+    ) -> None:
+        if max_per_client < 1:
+            raise ValueError("max_per_client must be at least 1")
+        self.max_per_client = max_per_client
+        self.acquire_timeout = acquire_timeout
+        self._total = asyncio.Semaphore(max_total) if max_total else None
+        # client key -> (semaphore, calls holding or waiting for it)
+        self._clients: Dict[str, Tuple[asyncio.Semaphore, int]] = {}
+
+    def _checkout(self, key: str) -> asyncio.Semaphore:
+        semaphore, users = self._clients.get(key) or (asyncio.Semaphore(self.max_per_client), 0)
+        self._clients[key] = (semaphore, users + 1)
+        return semaphore
+
+    def _release(self, key: str) -> None:
+        semaphore, users = self._clients[key]
+        if users <= 1:
+            del self._clients[key]
+        else:
+            self._clients[key] = (semaphore, users - 1)
+
+    async def _acquire(self, semaphore: asyncio.Semaphore, what: str, stack: AsyncExitStack) -> None:
+        try:
+            await asyncio.wait_for(semaphore.acquire(), self.acquire_timeout)
+        except asyncio.TimeoutError:
+            raise ToolError(f"Too many concurrent tool calls ({what}), please retry later") from None
+        stack.callback(semaphore.release)
+
+    async def on_call_tool(self, context: MiddlewareContext, call_next: CallNext) -> Any:
+        key = client_key(context)
+        semaphore = self._checkout(key)
+        try:
+            async with AsyncExitStack() as stack:
+                # Client slot first: a client over its cap never holds a server slot.
+                await self._acquire(semaphore, "per client", stack)
+                if self._total is not None:
+                    await self._acquire(self._total, "server", stack)
+                return await call_next(context)
+        finally:
+            self._release(key)
+
+    def active_clients(self) -> int:
+        return len(self._clients)
+
+
+class KeyedLock:
+    """One holder at a time per key; locks of released keys are dropped."""
+
+    def __init__(self) -> None:
+        # key -> (lock, holders and waiters)
+        self._locks: Dict[Hashable, Tuple[asyncio.Lock, int]] = {}
+
+    @asynccontextmanager
+    async def hold(self, key: Hashable) -> AsyncIterator[None]:
+        lock, users = self._locks.get(key) or (asyncio.Lock(), 0)
+        self._locks[key] = (lock, users + 1)
+        try:
+            async with lock:
+                yield
+        finally:
+            lock, users = self._locks[key]
+            if users <= 1:
+                del self._locks[key]
+            else:
+                self._locks[key] = (lock, users - 1)
+
+    def __len__(self) -> int:
+        return len(self._locks)
@@ -0,0 +1,113 @@
+"""
+In-process fast path for calling the TaskTracker MCP tools.
+
+`mcp.call_tool` validates the arguments, runs the tool, then serializes the
+result to MCP content (JSON text plus structured content) that the LangChain
+wrappers convert straight back to Python. For large folder listings that
+encode/decode dominates the call. `DirectDispatcher` calls the registered tool
+functions itself and returns their native result, keeping what the MCP path
+guarantees:
+
+- arguments are validated by a pydantic `TypeAdapter` of the tool function,
+  exactly as FastMCP does (same `ValidationError`s);
+- errors raised by a tool are turned into the same `ToolError`s as in
+  `FastMCP.call_tool` (rate limit / timeout messages, masking), chained to
+  the original exception;
+- results of tools whose output schema FastMCP wraps (non-object return
+  types, e.g. lists) come back as `{"result": ...}`, like `structured_content`.
+
+Server middleware does not run on this path. Tools that are not plain
+function tools (or have a timeout) go through `mcp.call_tool` instead.
+"""
+from __future__ import annotations
+
+import inspect
+import logging
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+import httpx
+from fastmcp import FastMCP
+from fastmcp.exceptions import FastMCPError, NotFoundError, ToolError
+from fastmcp.tools.function_tool import FunctionTool
+from pydantic import TypeAdapter, ValidationError
+
+log = logging.getLogger(__name__)
+
+_WRAP_RESULT_KEY = "x-fastmcp-wrap-result"
+
+
+@dataclass(frozen=True)
+class DirectTool:
+    name: str
+    adapter: TypeAdapter
+    wrap_result: bool
+    is_async: bool
+
+
+def _direct_tool(tool: FunctionTool) -> DirectTool:
+    return DirectTool(
+        name=tool.name,
+        adapter=TypeAdapter(tool.fn),
+        wrap_result=bool((tool.output_schema or {}).get(_WRAP_RESULT_KEY)),
+        is_async=inspect.iscoroutinefunction(tool.fn),
+    )
+
+
+def _tool_error(name: str, exc: Exception, mask_details: bool) -> ToolError:
+    """The `ToolError` `FastMCP.call_tool` raises for an exception from tool `name`."""
+    if isinstance(exc, httpx.HTTPStatusError) and exc.response.status_code == 429:
+        return ToolError("Rate limited by upstream API, please retry later")
+    if isinstance(exc, httpx.TimeoutException):
+        return ToolError("Upstream request timed out, please retry")
+    if mask_details:
+        return ToolError(f"Error calling tool {name!r}")
+    return ToolError(f"Error calling tool {name!r}: {exc}")
+
+
+class DirectDispatcher:
+    """Calls the function tools of a FastMCP server directly (same validation and results)."""
+
+    def __init__(self, mcp: FastMCP) -> None:
+        self.mcp = mcp
+        self._tools: Optional[Dict[str, DirectTool]] = None
+
+    async def tools(self) -> Dict[str, DirectTool]:
+        """Registry of tool name -> validated callable, built on first use."""
+        if self._tools is None:
+            registry: Dict[str, DirectTool] = {}
+            for tool in await self.mcp.list_tools():
+                if isinstance(tool, FunctionTool) and tool.timeout is None:
+                    registry[tool.name] = _direct_tool(tool)
+            self._tools = registry
+            log.debug("direct dispatch: %s tools registered", len(registry))
+        return self._tools
+
+    async def call(
+        self,
+        name: str,
+        arguments: Dict[str, Any],
+        fallback: Optional[Callable[[str, Dict[str, Any]], Awaitable[Any]]] = None,
+    ) -> Any:
+        """
+        Run tool `name` with `arguments` and return its result as Python objects.
+
+        `fallback(name, arguments)` handles tools that are not in the direct
+        registry; without one they raise `NotFoundError` like an unknown tool.
+        """
+        tool = (await self.tools()).get(name)
+        if tool is None:
+            if fallback is None:
+                raise NotFoundError(f"Unknown tool: {name!r}")
+            return await fallback(name, arguments)
+        try:
+            result = tool.adapter.validate_python(arguments or {})
+            if tool.is_async:
+                result = await result
+        except (FastMCPError, ValidationError):
+            log.exception("Error calling tool %r", name)
+            raise
+        except Exception as exc:
+            log.exception("Error calling tool %r", name)
+            raise _tool_error(name, exc, getattr(self.mcp, "_mask_error_details", False)) from exc
+        return {"result": result} if tool.wrap_result else result
@@ -0,0 +1,228 @@
+"""
+Compact, LLM-facing views of TaskTracker units returned by the MCP read tools.
+
+Raw units carry every attribute (mostly null), user objects, calculated
+attributes and steps as ProseMirror JSON strings; fed to the LLM as-is they
+dominate token usage. The read tools project each unit to one of:
+
+- `summary`: code, summary, status, folder, update time, step count and the
+  non-empty attributes with taxonomy/user values reduced to their codes and
+  rich-text (`wisiwig`) values decoded to markdown;
+- `steps`: `summary` plus the steps as `[description, data, result]`
+  plain-text triples (see `src/tasktracker/prosemirror.py`);
+- `full`: the unit exactly as TaskTracker returned it.
+
+Empty values (null, "", [], {}) are dropped from the compact views. Every
+projection logs the JSON size before and after.
+"""
+from __future__ import annotations
+
+import json
+import logging
+from typing import Any, Dict, List, Literal, Mapping, Optional
+
+from src.tasktracker.prosemirror import loads_doc, to_markdown
+from src.tasktracker.steps import unit_step_triples
+
+log = logging.getLogger(__name__)
+
+View = Literal["summary", "steps", "full"]
+VIEWS = ("summary", "steps", "full")
+
+# Attributes shown as top-level fields (or steps) rather than in `attributes`.
+_PROMOTED_ATTRIBUTES = {"test_step", "test_case_status", "folder"}
+# Unit keys never shown in compact views (identity is `code`; authorship is noise for the LLM).
+_HIDDEN_KEYS = {"createdBy", "updatedBy", "isFavorite", "calculatedAttributes", "validatorErrorMsgs"}
+
+
+def _is_empty(value: Any) -> bool:
+    return value is None or value == "" or value == [] or value == {}
+
+
+def drop_empty(value: Any) -> Any:
+    """Recursively remove null / empty-string / empty-container values."""
+    if isinstance(value, Mapping):
+        cleaned = {k: drop_empty(v) for k, v in value.items()}
+        return {k: v for k, v in cleaned.items() if not _is_empty(v)}
+    if isinstance(value, list):
+        cleaned_items = [drop_empty(v) for v in value]
+        return [v for v in cleaned_items if not _is_empty(v)]
+    return value
+
+
+def _compact_value(value: Any) -> Any:
+    """Reduce taxonomy `{code, name}` / user objects to a short scalar."""
+    if isinstance(value, list):
+        return [_compact_value(v) for v in value]
+    if isinstance(value, Mapping):
+        if "login" in value:
+            return value["login"]
+        if "code" in value and ("name" in value or "title" in value):
+            return value["code"]
+        return drop_empty(value)
+    return value
+
+
+def _rich_text(value: Any) -> Any:
+    """Markdown of a ProseMirror value (JSON string or `{text|formattedText: ...}`); other values unchanged."""
+    doc = value.get("formattedText") or value.get("text") if isinstance(value, Mapping) else value
+    node = loads_doc(doc)
+    return value if node is None else to_markdown(node)
+
+
+def _attribute_values(unit: Mapping[str, Any]) -> Dict[str, Any]:
+    """Attribute code -> value, for both the list shape (GET unit) and the dict shape."""
+    attrs = unit.get("attributes")
+    if isinstance(attrs, list):
+        return {
+            item["code"]: _rich_text(item.get("value")) if item.get("type") == "wisiwig" else item.get("value")
+            for item in attrs
+            if isinstance(item, Mapping) and item.get("code")
+        }
+    if isinstance(attrs, Mapping):
+        return dict(attrs)
+    return {}
+
+
+def _summary_view(unit: Mapping[str, Any], triples: List[Any]) -> Dict[str, Any]:
+    values = _attribute_values(unit)
+    folder = values.get("folder")
+    status = values.get("test_case_status")
+    view: Dict[str, Any] = {
+        "code": unit.get("code"),
+        "summary": unit.get("summary"),
+        "description": _rich_text(unit.get("description")),
+        "status": _compact_value(status),
+        "folder": drop_empty(dict(folder)) if isinstance(folder, Mapping) else folder,
+        "updatedAt": unit.get("updatedAt"),
+        "step_count": len(triples),
+        "attributes": {
+            code: _compact_value(value)
+            for code, value in values.items()
+            if code not in _PROMOTED_ATTRIBUTES
+        },
+    }
+    for key, value in unit.items():
+        if key not in view and key not in _HIDDEN_KEYS and key != "attributes":
+            view[key] = _compact_value(value)
+    return drop_empty(view)
+
+
+def _steps_view(unit: Mapping[str, Any]) -> Dict[str, Any]:
+    triples = unit_step_triples(dict(unit))
+    view = _summary_view(unit, triples)
+    if triples:
+        view["steps"] = [list(triple) for triple in triples]
+    return view
+
+
+def project_unit(unit: Any, view: View = "summary") -> Any:
+    """Project one unit to `view`; non-dict values and `full` are returned unchanged."""
+    if view == "full" or not isinstance(unit, Mapping):
+        return unit
+    if view == "steps":
+        return _steps_view(unit)
+    if view == "summary":
+        return _summary_view(unit, unit_step_triples(dict(unit)))
+    raise ValueError(f"Unknown view {view!r}; expected one of {', '.join(VIEWS)}")
+
+
+def _json_size(value: Any) -> int:
+    return len(json.dumps(value, ensure_ascii=False, default=str).encode("utf-8"))
+
+
+def _log_sizes(tool: str, view: str, count: int, before: Any, after: Any) -> None:
+    if log.isEnabledFor(logging.INFO):
+        before_size, after_size = _json_size(before), _json_size(after)
+        log.info(
+            "%s: view=%s units=%s size %s -> %s bytes (%.0f%%)",
+            tool,
+            view,
+            count,
+            before_size,
+            after_size,
+            100.0 * after_size / before_size if before_size else 100.0,
+        )
+
+
+def project_units(tool: str, units: List[Any], view: View = "summary") -> List[Any]:
+    """Project a list of units (e.g. `get_test_cases`) and log the size change."""
+    if view == "full":
+        return units
+    projected = [project_unit(unit, view) for unit in units]
+    _log_sizes(tool, view, len(units), units, projected)
+    return projected
+
+
+def project_single_unit(tool: str, unit: Any, view: View = "steps") -> Any:
+    """Project one unit (e.g. `get_test_case`) and log the size change."""
+    if view == "full":
+        return unit
+    projected = project_unit(unit, view)
+    _log_sizes(tool, view, 1, unit, projected)
+    return projected
+
+
+def project_code_results(tool: str, results: List[Dict[str, Any]], view: View = "steps") -> List[Dict[str, Any]]:
+    """Project the `test_case` of each successful per-code entry (e.g. `get_test_cases_by_codes`)."""
+    if view == "full":
+        return results
+    units = [entry["test_case"] for entry in results if "test_case" in entry]
+    projected = [
+        {**entry, "test_case": project_unit(entry["test_case"], view)} if "test_case" in entry else entry
+        for entry in results
+    ]
+    _log_sizes(tool, view, len(units), units, [entry["test_case"] for entry in projected if "test_case" in entry])
+    return projected
+
+
+def project_crawl(
+    tool: str,
+    folders: List[Dict[str, Any]],
+    view: View = "summary",
+    max_bytes: Optional[int] = None,
+) -> Dict[str, Any]:
+    """
+    Project the units of crawled folders (`FolderUnits.to_dict()`, breadth-first)
+    and keep the units within a JSON size budget of `max_bytes`.
+
+    Folders are filled in order until the budget is spent; after that each
+    folder keeps its path and `unit_count` but its units are replaced by
+    `units_omitted`, so the caller can read those folders separately.
+    """
+    before = [unit for folder in folders for unit in folder.get("units") or []]
+    spent = 0
+    truncated = False
+    projected_folders: List[Dict[str, Any]] = []
+    for folder in folders:
+        kept: List[Any] = []
+        units = folder.get("units") or []
+        for unit in units if not truncated else ():
+            projected = project_unit(unit, view)
+            size = _json_size(projected) if max_bytes is not None else 0
+            if max_bytes is not None and spent + size > max_bytes:
+                truncated = True
+                break
+            spent += size
+            kept.append(projected)
+        entry = {**folder, "units": kept}
+        if len(kept) < len(units):
+            entry["units_omitted"] = len(units) - len(kept)
+        projected_folders.append(entry)
+    _log_sizes(tool, view, len(before), before, [u for folder in projected_folders for u in folder["units"]])
+    return {"truncated": truncated, "folders": projected_folders}
+
+
+def project_folder_units(tool: str, result: Any, view: View = "summary") -> Any:
+    """Project `units.content` of a `FolderUnitsDto` response, keeping paging metadata."""
+    if view == "full" or not isinstance(result, Mapping):
+        return result
+    units_page: Optional[Mapping[str, Any]] = result.get("units")
+    content = (units_page or {}).get("content") or []
+    projected_content = [
+        project_unit(item.get("unit", item) if isinstance(item, Mapping) else item, view)
+        for item in content
+    ]
+    projected = drop_empty({**result, "units": {**(units_page or {}), "content": projected_content}})
+    _log_sizes(tool, view, len(content), result, projected)
+    return projected
@@ -9,18 +9,27 @@ the agent expects.
 from __future__ import annotations
 
 import ast
-import asyncio
+import atexit
 import json
 import logging
-from typing import Any, Dict, List, Union
+from typing import Any, Dict, List, Literal, Optional, Union
 
 log = logging.getLogger(__name__)
 
 from langchain_core.tools import StructuredTool
 from pydantic import BaseModel, Field
 
+from src.config import get_mcp_direct_dispatch
+from src.mcp.background_loop import BackgroundLoop
+from src.mcp.concurrency import KeyedLock
+from src.mcp.direct_dispatch import DirectDispatcher
+from src.tasktracker.pool import aclose_shared_async_client
 from src.tasktracker.steps import TestStepSpec
 
+# All in-process MCP tool calls run on this loop, so the shared async
+# TaskTracker client (and its connections) survives between calls.
+_TOOL_LOOP = BackgroundLoop("mcp-tool-loop")
+
 
 def _one_step_to_dict(item: Any) -> Dict[str, Any] | None:
     """Coerce a single step to a dict with step_description, step_data, step_result."""
@@ -83,6 +92,16 @@ def _get_mcp():
     return mcp
 
 
+_DIRECT: DirectDispatcher | None = None
+
+
+def _get_direct() -> DirectDispatcher:
+    global _DIRECT
+    if _DIRECT is None:
+        _DIRECT = DirectDispatcher(_get_mcp())
+    return _DIRECT
+
+
 def _tool_result_to_python(result: Any) -> Any:
     """Extract Python value from FastMCP ToolResult (content or structured_content)."""
     if result is None:
@@ -99,24 +118,63 @@ def _tool_result_to_python(result: Any) -> Any:
     return result
 
 
+# Mutating tools and the argument naming what they modify. The agent runs the
+# tool calls of one model turn concurrently; calls on the same target never
+# overlap (e.g. two step updates of one test case). Their order is not
+# guaranteed: each call takes the lock from its own executor thread, so the
+# one the model issued last may apply first.
+_SERIALIZED_BY = {
+    "update_test_case_from_steps": "code",
+    "create_folder": "parent_id_code",
+}
+# Only used on `_TOOL_LOOP`.
+_MUTATION_LOCKS = KeyedLock()
+
+
+def _mutation_key(name: str, arguments: Dict[str, Any]) -> Any:
+    arg = _SERIALIZED_BY.get(name)
+    value = (arguments or {}).get(arg) if arg else None
+    return (name, str(value)) if value else None
+
+
 def _call_mcp_sync(name: str, arguments: Dict[str, Any]) -> Any:
-    """Call MCP tool by name with given arguments; run async call_tool from sync context."""
+    """
+    Call MCP tool by name with given arguments; run async call_tool from sync context.
+
+    The call is submitted to the shared background loop (`_TOOL_LOOP`) and the
+    calling thread waits for it, whether or not it runs an event loop itself.
+    With `MCP_DIRECT_DISPATCH` (default) the tool function is called directly
+    and its native result returned (see `src/mcp/direct_dispatch.py`).
+    Mutating calls on the same target never run at the same time
+    (`_SERIALIZED_BY`); their relative order is not guaranteed.
+    """
     mcp = _get_mcp()
 
-    async def _run() -> Any:
-        tr = await mcp.call_tool(name, arguments)
+    async def _via_mcp(tool_name: str, tool_arguments: Dict[str, Any]) -> Any:
+        tr = await mcp.call_tool(tool_name, tool_arguments)
         return _tool_result_to_python(tr)
 
-    try:
-        loop = asyncio.get_running_loop()
-    except RuntimeError:
-        loop = None
-    if loop is not None:
-        import concurrent.futures
-        with concurrent.futures.ThreadPoolExecutor() as pool:
-            future = pool.submit(asyncio.run, _run())
-            return future.result()
-    return asyncio.run(_run())
+    async def _dispatch() -> Any:
+        if get_mcp_direct_dispatch():
+            return await _get_direct().call(name, arguments, fallback=_via_mcp)
+        return await _via_mcp(name, arguments)
+
+    async def _run() -> Any:
+        key = _mutation_key(name, arguments)
+        if key is None:
+            return await _dispatch()
+        async with _MUTATION_LOCKS.hold(key):
+            return await _dispatch()
+
+    return _TOOL_LOOP.run(_run())
+
+
+def shutdown_tool_loop() -> None:
+    """Close the async TaskTracker client on the tool loop and stop it. Registered with atexit."""
+    _TOOL_LOOP.stop(cleanup=aclose_shared_async_client)
+
+
+atexit.register(shutdown_tool_loop)
 
 
 # --- Input schemas (same as agent/tools.py for compatibility) ---
@@ -129,6 +187,10 @@ class GetRootFolderUnitsInput(BaseModel):
     )
     page: int = Field(0, description="Page number (0-based).", ge=0)
     size: int = Field(50, description="Page size.", ge=1, le=500)
+    view: Literal["summary", "steps", "full"] = Field(
+        "summary",
+        description="How units are returned: summary (compact), steps (plus plain-text steps) or full (raw).",
+    )
 
 
 class CreateFolderInput(BaseModel):
@@ -145,6 +207,20 @@ class CreateFolderInput(BaseModel):
     )
 
 
+class ResolveFolderInput(BaseModel):
+    path_or_name: str = Field(
+        ...,
+        description=(
+            "Folder title (e.g. `postgres datasource`), slash-separated path of titles "
+            "(e.g. `Datasources/postgres datasource`) or folder code."
+        ),
+    )
+    space_id_code: str = Field(
+        "PVM",
+        description="Space ID code (e.g. VIEW, PVM).",
+    )
+
+
 class GetTestCasesInput(BaseModel):
     folder_code: str = Field(
         ...,
@@ -155,6 +231,13 @@ class GetTestCasesInput(BaseModel):
     )
     page: int = Field(0, description="Page number to fetch (0-based).", ge=0)
     size: int = Field(50, description="Page size (number of test cases to fetch).", ge=1, le=500)
+    view: Literal["summary", "steps", "full"] = Field(
+        "summary",
+        description=(
+            "summary: code, summary, status, attributes, step count; "
+            "steps: plus steps as [description, data, result]; full: raw units (large)."
+        ),
+    )
 
 
 class CreateTestCaseInput(BaseModel):
@@ -190,11 +273,104 @@ class UpdateTestCaseInput(BaseModel):
     )
 
 
+class CreateTestCasesWithStepsInput(BaseModel):
+    test_cases: Union[str, List[Any]] = Field(
+        ...,
+        description=(
+            "List of test cases to create (or JSON string of that list). Each item: summary, "
+            "folder_code, space, optional suit (default `test_case`) and steps "
+            "(ordered list of step_description, step_data, step_result)."
+        ),
+    )
+    max_workers: int = Field(
+        4,
+        description="How many test cases to create concurrently.",
+        ge=1,
+        le=16,
+    )
+
+
 class GetSingleTestCaseInput(BaseModel):
     code: str = Field(
         ...,
         description="Code of the TaskTracker test case to fetch, e.g. `PVM-123`.",
     )
+    view: Literal["summary", "steps", "full"] = Field(
+        "steps",
+        description=(
+            "steps (default): compact fields plus steps as [description, data, result]; "
+            "summary: without steps; full: raw unit (large)."
+        ),
+    )
+
+
+class GetTestCasesByCodesInput(BaseModel):
+    codes: Union[str, List[str]] = Field(
+        ...,
+        description="Codes of the test cases to fetch, e.g. [\"PVM-123\", \"PVM-124\"] (or JSON string of that list).",
+    )
+    view: Literal["summary", "steps", "full"] = Field(
+        "steps",
+        description=(
+            "steps (default): compact fields plus steps as [description, data, result]; "
+            "summary: without steps; full: raw units (large)."
+        ),
+    )
+    max_workers: int = Field(
+        8,
+        description="How many test cases to fetch concurrently.",
+        ge=1,
+        le=16,
+    )
+
+
+class CrawlFolderSubtreeInput(BaseModel):
+    folder_code: str = Field(
+        ...,
+        description="Code of the folder whose subtree to read (from resolve_folder).",
+    )
+    space_id_code: str = Field(
+        "PVM",
+        description="Space ID code (e.g. VIEW, PVM).",
+    )
+    view: Literal["summary", "steps", "full"] = Field(
+        "summary",
+        description="How units are returned: summary (compact), steps (plus plain-text steps) or full (raw).",
+    )
+    max_depth: Optional[int] = Field(
+        None,
+        description="How many subfolder levels to descend (0 = only this folder; default: all).",
+        ge=0,
+    )
+    max_result_bytes: int = Field(
+        60_000,
+        description="JSON size budget for returned units; folders beyond it report units_omitted.",
+        ge=1_000,
+        le=500_000,
+    )
+
+
+class CloneFolderTestCasesInput(BaseModel):
+    source_folder_code: str = Field(..., description="Code of the folder whose test cases are copied.")
+    target_folder_code: str = Field(..., description="Code of the folder to create the copies in.")
+    space: str = Field(..., description="TaskTracker space code of the target (e.g. `PVM`, `VIEW`).")
+    substitutions: Union[str, Dict[str, str], None] = Field(
+        None,
+        description=(
+            "Text replacements for summaries and steps as {old: new} (or JSON string of it), "
+            "e.g. {\"postgres\": \"abyss\"}. Case-insensitive, keeps the case of the replaced text."
+        ),
+    )
+    suit: str = Field("test_case", description="TaskTracker suit code (usually `test_case`).")
+    dry_run: bool = Field(
+        False,
+        description="Only return the transformed summaries and steps; create nothing.",
+    )
+    allow_incomplete: bool = Field(
+        False,
+        description="Clone even if some source pages or test cases could not be read (default: refuse).",
+    )
+    max_workers: int = Field(4, description="How many test cases to create concurrently.", ge=1, le=16)
 
 
 # --- Tool implementations that delegate to MCP ---
@@ -208,6 +384,10 @@ def _create_folder(**kwargs: Any) -> Any:
     return _call_mcp_sync("create_folder", kwargs)
 
 
+def _resolve_folder(**kwargs: Any) -> Any:
+    return _call_mcp_sync("resolve_folder", kwargs)
+
+
 def _get_test_cases(**kwargs: Any) -> Any:
     return _call_mcp_sync("get_test_cases", kwargs)
 
@@ -216,6 +396,55 @@ def _get_test_case(**kwargs: Any) -> Any:
     return _call_mcp_sync("get_test_case", kwargs)
 
 
+def _codes_from_string_or_list(v: Any) -> List[str]:
+    """Coerce codes to a list; also accepts a JSON list or a comma/space separated string."""
+    if isinstance(v, str):
+        stripped = v.strip()
+        if stripped.startswith("["):
+            try:
+                v = json.loads(stripped)
+            except json.JSONDecodeError:
+                v = stripped.strip("[]").replace('"', " ").replace("'", " ")
+        if isinstance(v, str):
+            v = v.replace(",", " ").split()
+    return [str(code) for code in v] if isinstance(v, list) else []
+
+
+def _get_test_cases_by_codes(**kwargs: Any) -> Any:
+    codes = _codes_from_string_or_list(kwargs.get("codes"))
+    args: Dict[str, Any] = {"codes": codes}
+    for key in ("view", "max_workers"):
+        if kwargs.get(key) is not None:
+            args[key] = kwargs[key]
+    return _call_mcp_sync("get_test_cases_by_codes", args)
+
+
+def _crawl_folder_subtree(**kwargs: Any) -> Any:
+    args = {key: value for key, value in kwargs.items() if value is not None}
+    return _call_mcp_sync("crawl_folder_subtree", args)
+
+
+def _substitutions_from_string_or_dict(v: Any) -> Dict[str, str] | None:
+    """Coerce substitutions to a dict; LLMs sometimes pass a JSON string or a list of pairs."""
+    if isinstance(v, str):
+        try:
+            v = json.loads(v)
+        except json.JSONDecodeError:
+            try:
+                v = ast.literal_eval(v)
+            except (ValueError, SyntaxError):
+                return None
+    if isinstance(v, list):
+        v = {str(pair[0]): str(pair[1]) for pair in v if isinstance(pair, (list, tuple)) and len(pair) == 2}
+    return {str(old): str(new) for old, new in v.items()} if isinstance(v, dict) else None
+
+
+def _clone_folder_test_cases(**kwargs: Any) -> Any:
+    args = {key: value for key, value in kwargs.items() if value is not None}
+    args["substitutions"] = _substitutions_from_string_or_dict(kwargs.get("substitutions"))
+    return _call_mcp_sync("clone_folder_test_cases", args)
+
+
 def _normalize_steps_for_mcp(steps: Any) -> List[Dict[str, Any]]:
     """Always produce a list of step dicts for MCP; run regardless of schema validation."""
     raw_list = _steps_from_string_or_list(steps)
@@ -247,6 +476,32 @@ def _update_test_case_from_steps(**kwargs: Any) -> Any:
     return _call_mcp_sync("update_test_case_from_steps", args)
 
 
+def _test_cases_from_string_or_list(v: Any) -> List[Any]:
+    """Coerce the batch to a list of dicts; LLMs sometimes pass a JSON string or Python literal."""
+    if isinstance(v, str):
+        try:
+            v = json.loads(v)
+        except (json.JSONDecodeError, TypeError):
+            try:
+                v = ast.literal_eval(v)
+            except (ValueError, SyntaxError):
+                return []
+    return list(v) if isinstance(v, list) else []
+
+
+def _create_test_cases_with_steps(**kwargs: Any) -> Any:
+    items = []
+    for item in _test_cases_from_string_or_list(kwargs.get("test_cases")):
+        if isinstance(item, dict):
+            item = {**item, "steps": _normalize_steps_for_mcp(item.get("steps") or [])}
+        items.append(item)
+    args: Dict[str, Any] = {"test_cases": items}
+    if kwargs.get("max_workers") is not None:
+        args["max_workers"] = kwargs["max_workers"]
+    log.info("create_test_cases_with_steps (to MCP): items=%s", len(items))
+    return _call_mcp_sync("create_test_cases_with_steps", args)
+
+
 # --- LangChain StructuredTools ---
 
 
@@ -274,6 +529,19 @@ def create_folder_tool() -> StructuredTool:
     )
 
 
+def resolve_folder_tool() -> StructuredTool:
+    return StructuredTool.from_function(
+        name="resolve_folder",
+        description=(
+            "Find a TaskTracker folder code by folder name or path (e.g. "
+            "`Datasources/postgres datasource`) without loading the whole folder tree. "
+            "Returns matching folders with code, path and direct children."
+        ),
+        func=_resolve_folder,
+        args_schema=ResolveFolderInput,
+    )
+
+
 def get_test_cases_tool() -> StructuredTool:
     return StructuredTool.from_function(
         name="get_test_cases",
@@ -295,6 +563,48 @@ def get_single_test_case_tool() -> StructuredTool:
     )
 
 
+def get_test_cases_by_codes_tool() -> StructuredTool:
+    return StructuredTool.from_function(
+        name="get_test_cases_by_codes",
+        description=(
+            "Fetch several TaskTracker test cases by code in one call (in parallel). "
+            "Returns a per-code status with the test case or the error; use it instead of "
+            "calling get_test_case once per code."
+        ),
+        func=_get_test_cases_by_codes,
+        args_schema=GetTestCasesByCodesInput,
+    )
+
+
+def crawl_folder_subtree_tool() -> StructuredTool:
+    return StructuredTool.from_function(
+        name="crawl_folder_subtree",
+        description=(
+            "Read the test cases of a folder and all of its subfolders in one call. "
+            "Returns every folder with its path, depth, unit count and units; when the result "
+            "would be too large, later folders report units_omitted."
+        ),
+        func=_crawl_folder_subtree,
+        args_schema=CrawlFolderSubtreeInput,
+    )
+
+
+def clone_folder_test_cases_tool() -> StructuredTool:
+    return StructuredTool.from_function(
+        name="clone_folder_test_cases",
+        description=(
+            "Copy every test case of a source folder into a target folder in one call, replacing "
+            "text in summaries and steps (e.g. postgres -> abyss). Use this for 'tests in folder A "
+            "like folder B' instead of creating each test case yourself; try dry_run first to check "
+            "the substitutions. Returns the new codes and a per-item status. Not idempotent: every "
+            "call without dry_run creates new copies, so never repeat a call that succeeded; retry "
+            "only the failed items."
+        ),
+        func=_clone_folder_test_cases,
+        args_schema=CloneFolderTestCasesInput,
+    )
+
+
 def create_test_case_tool() -> StructuredTool:
     return StructuredTool.from_function(
         name="create_test_case",
@@ -320,3 +630,16 @@ def update_test_case_tool() -> StructuredTool:
         func=_update_test_case_from_steps,
         args_schema=UpdateTestCaseInput,
     )
+
+
+def create_test_cases_with_steps_tool() -> StructuredTool:
+    return StructuredTool.from_function(
+        name="create_test_cases_with_steps",
+        description=(
+            "Create several new test cases with their steps in one call. Provide a list of "
+            "test cases (summary, folder_code, space, optional suit, steps). Each is created "
+            "and filled with steps in parallel; returns the new codes and a per-item status/error report."
+        ),
+        func=_create_test_cases_with_steps,
+        args_schema=CreateTestCasesWithStepsInput,
+    )
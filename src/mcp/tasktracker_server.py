@@ -4,29 +4,65 @@ TaskTracker MCP server using FastMCP.
 Exposes folder and test case operations as MCP tools so Cursor and other
 MCP clients can manage TaskTracker test cases. Uses existing TaskTracker
 client and config (TASKTRACKER_BASE_URL, auth, TASKTRACKER_DRY_RUN).
+
+Tools are `async def` on top of `AsyncTaskTrackerClient`, so TaskTracker
+round-trips never block the server's event loop and concurrent MCP requests
+are served concurrently.
+
+Runs over stdio by default. With `--transport http` (streamable HTTP) or
+`--transport sse` one process serves many clients: they share the
+TaskTracker connection pool, read caches and rate limiter, and
+`ClientConcurrencyMiddleware` caps concurrent tool calls per client and in
+total (`--workers`).
 """
 from __future__ import annotations
 
+import argparse
+import asyncio
 import logging
-from typing import Any
+from typing import Any, List, Optional
 
 from fastmcp import FastMCP
 
+from src.config import (
+    get_mcp_call_wait_timeout,
+    get_mcp_host,
+    get_mcp_max_calls_per_client,
+    get_mcp_port,
+    get_mcp_transport,
+    get_mcp_workers,
+)
+from src.mcp.concurrency import ClientConcurrencyMiddleware
+from src.mcp.projection import (
+    View,
+    project_code_results,
+    project_crawl,
+    project_folder_units,
+    project_single_unit,
+    project_units,
+)
+
 log = logging.getLogger(__name__)
 
 from src.tasktracker.steps import (
+    DEFAULT_BATCH_WORKERS,
     TestStepSpec,
-    create_test_case_with_summary,
-    update_test_case_from_steps as steps_update_from_steps,
+    acreate_test_case_with_summary,
+    acreate_test_cases_with_steps,
+    aupdate_test_case_from_steps as steps_aupdate_from_steps,
 )
 from src.tasktracker.tools import (
-    create_folder as tt_create_folder,
-    create_test_case as tt_create_test_case,
-    get_root_folder_units as tt_get_root_folder_units,
-    get_test_case as tt_get_test_case,
-    get_test_cases as tt_get_test_cases,
-    update_test_case as tt_update_test_case,
+    acreate_folder as tt_acreate_folder,
+    aget_root_folder_units as tt_aget_root_folder_units,
+    aget_test_case as tt_aget_test_case,
+    aget_test_cases as tt_aget_test_cases,
+    aget_test_cases_by_codes as tt_aget_test_cases_by_codes,
+    aresolve_folder as tt_aresolve_folder,
 )
+from src.tasktracker.clone import aclone_folder
+from src.tasktracker.crawl import acollect_subtree
+from src.tasktracker.pagination import DEFAULT_FETCH_CONCURRENCY
+from src.tasktracker.pool import aclose_shared_async_client
 
 mcp = FastMCP(
     name="tasktracker-ui-tests",
@@ -44,25 +80,29 @@ def _serialize_result(value: Any) -> Any:
 
 
 @mcp.tool()
-def get_root_folder_units(
+async def get_root_folder_units(
     space_id_code: str = "PVM",
     page: int = 0,
     size: int = 50,
+    view: View = "summary",
 ) -> dict[str, Any]:
     """
     Get the root folder hierarchy and paginated units (test cases) from the root.
     Use this to discover folder structure and root-level test cases.
+
+    `view` controls how units are returned: `summary` (default, compact),
+    `steps` (plus plain-text steps) or `full` (raw TaskTracker units).
     """
-    result = tt_get_root_folder_units(
+    result = await tt_aget_root_folder_units(
         space_id_code=space_id_code,
         page=page,
         size=size,
     )
-    return _serialize_result(result)
+    return _serialize_result(project_folder_units("get_root_folder_units", result, view))
 
 
 @mcp.tool()
-def create_folder(
+async def create_folder(
     name: str,
     parent_id_code: str,
     space_id_code: str = "PVM",
@@ -71,7 +111,7 @@ def create_folder(
     Create a new TaskTracker folder under the given parent.
     Use get_root_folder_units to discover parent folder codes.
     """
-    result = tt_create_folder(
+    result = await tt_acreate_folder(
         name=name,
         parent_id_code=parent_id_code,
         space_id_code=space_id_code,
@@ -80,28 +120,136 @@ def create_folder(
 
 
 @mcp.tool()
-def get_test_cases(
+async def resolve_folder(
+    path_or_name: str,
+    space_id_code: str = "PVM",
+) -> dict[str, Any]:
+    """
+    Resolve a TaskTracker folder code by name or path instead of reading the whole tree.
+
+    `path_or_name` may be a folder title (e.g. `postgres datasource`), a
+    slash-separated path of titles (e.g. `Datasources/postgres datasource`)
+    or a folder code. Returns the matching folders with code, title, path,
+    parent code and direct children; several matches mean the name is ambiguous.
+    """
+    result = await tt_aresolve_folder(path_or_name=path_or_name, space_id_code=space_id_code)
+    return _serialize_result(result)
+
+
+@mcp.tool()
+async def get_test_cases(
     folder_code: str,
     page: int = 0,
     size: int = 50,
+    view: View = "summary",
 ) -> list[dict[str, Any]]:
     """
     List TaskTracker test cases in the given folder.
     Use this to read existing tests to use as templates for new ones.
+
+    `view`: `summary` (default: code, summary, status, folder, non-empty
+    attributes, step count), `steps` (plus steps as [description, data,
+    result] plain-text triples) or `full` (raw TaskTracker units).
     """
-    result = tt_get_test_cases(
+    result = await tt_aget_test_cases(
         folder_code=folder_code,
         page=page,
         size=size,
     )
-    return _serialize_result(result)
+    return _serialize_result(project_units("get_test_cases", result, view))
 
 
 @mcp.tool()
-def get_test_case(code: str) -> dict[str, Any]:
-    """Fetch a single TaskTracker test case by code (e.g. PVM-123)."""
-    result = tt_get_test_case(code=code)
-    return _serialize_result(result)
+async def get_test_case(code: str, view: View = "steps") -> dict[str, Any]:
+    """
+    Fetch a single TaskTracker test case by code (e.g. PVM-123).
+
+    `view`: `steps` (default: compact fields plus steps as [description,
+    data, result] plain-text triples), `summary` (no steps) or `full`
+    (raw TaskTracker unit with ProseMirror step documents).
+    """
+    result = await tt_aget_test_case(code=code)
+    return _serialize_result(project_single_unit("get_test_case", result, view))
+
+
+@mcp.tool()
+async def get_test_cases_by_codes(
+    codes: list[str],
+    view: View = "steps",
+    max_workers: int = DEFAULT_FETCH_CONCURRENCY,
+) -> dict[str, Any]:
+    """
+    Fetch several TaskTracker test cases by code in one call (e.g. the
+    templates to clone).
+
+    Codes are fetched concurrently, up to `max_workers` at a time; duplicates
+    are fetched once. `view` is as for `get_test_case` (default `steps`).
+    Returns `total`, `succeeded`, `failed` and per-code `results` in input
+    order: `code`, `status` (`ok` / `error`) and `test_case` or `error`.
+    """
+    log.info("get_test_cases_by_codes tool: codes=%s max_workers=%s", len(codes or []), max_workers)
+    results = await tt_aget_test_cases_by_codes(codes or [], max_concurrency=max(1, min(max_workers, 16)))
+    succeeded = sum(1 for entry in results if entry["status"] == "ok")
+    return {
+        "total": len(results),
+        "succeeded": succeeded,
+        "failed": len(results) - succeeded,
+        "results": project_code_results("get_test_cases_by_codes", results, view),
+    }
+
+
+# Default JSON size budget of `crawl_folder_subtree` results (units only).
+DEFAULT_CRAWL_MAX_BYTES = 60_000
+
+
+@mcp.tool()
+async def crawl_folder_subtree(
+    folder_code: str,
+    space_id_code: str = "PVM",
+    view: View = "summary",
+    max_depth: int | None = None,
+    max_workers: int = DEFAULT_FETCH_CONCURRENCY,
+    max_result_bytes: int = DEFAULT_CRAWL_MAX_BYTES,
+) -> dict[str, Any]:
+    """
+    Read the test cases of a folder and all its subfolders in one call.
+
+    Walks the folder tree below `folder_code` breadth-first (down to
+    `max_depth` levels, default all) and lists every folder's test cases,
+    up to `max_workers` folders at a time. Each folder comes with `path`,
+    `depth`, `unit_count` and its `units` in `view` (default `summary`).
+    Units are kept until `max_result_bytes` of JSON; then `truncated` is
+    true and later folders report `units_omitted` (read them with
+    `get_test_cases` or another crawl of that folder). The folder tree is
+    re-read at the start of each crawl; folders created while it runs are
+    not included.
+    """
+    log.info(
+        "crawl_folder_subtree tool: folder=%s space=%s max_depth=%s max_workers=%s",
+        folder_code,
+        space_id_code,
+        max_depth,
+        max_workers,
+    )
+    folders = await acollect_subtree(
+        folder_code,
+        space_id_code,
+        max_depth=max_depth,
+        max_concurrency=max(1, min(max_workers, 16)),
+    )
+    result = project_crawl(
+        "crawl_folder_subtree",
+        [folder.to_dict() for folder in folders],
+        view,
+        max_bytes=max(1_000, max_result_bytes),
+    )
+    return {
+        "folder_code": folder_code,
+        "folders_total": len(folders),
+        "units_total": sum(len(folder.units) for folder in folders),
+        "failed_folders": sum(1 for folder in folders if folder.error is not None),
+        **result,
+    }
 
 
 def _step_item_to_dict(s: Any) -> dict[str, Any]:
@@ -114,7 +262,7 @@ def _step_item_to_dict(s: Any) -> dict[str, Any]:
 
 
 @mcp.tool()
-def create_test_case(
+async def create_test_case(
     summary: str,
     suit: str,
     space: str,
@@ -137,7 +285,7 @@ def create_test_case(
         summary,
         folder_code,
     )
-    result = create_test_case_with_summary(
+    result = await acreate_test_case_with_summary(
         summary=summary,
         suit=suit,
         space=space,
@@ -148,14 +296,17 @@ def create_test_case(
 
 
 @mcp.tool()
-def update_test_case_from_steps(code: str, steps: list[Any]) -> dict[str, Any]:
+async def update_test_case_from_steps(code: str, steps: list[Any]) -> dict[str, Any]:
     """
     Update an existing test case's steps by code.
 
     This tool:
-    - Fetches the current test case to preserve existing step codes.
+    - Preserves existing step codes (known from the last write, or fetched).
     - Builds the appropriate `attributes.test_step.testStepList` patch body.
-    - Calls the TaskTracker update API.
+    - Calls the TaskTracker update API, unless the steps are unchanged.
+
+    The result has `status`: `updated`, or `unchanged` when a fresh read of the
+    test case already has these steps and no PATCH was needed.
     """
     steps_dicts = [_step_item_to_dict(s) for s in (steps or [])]
     log.info(
@@ -173,13 +324,150 @@ def update_test_case_from_steps(code: str, steps: list[Any]) -> dict[str, Any]:
         for d in steps_dicts
     ]
     log.debug("update_test_case_from_steps step_specs: %s", [(s.step_description[:50], s.step_result[:50]) for s in step_specs])
-    result = steps_update_from_steps(code=code, steps=step_specs)
+    result = await steps_aupdate_from_steps(code=code, steps=step_specs)
+    return _serialize_result(result)
+
+
+@mcp.tool()
+async def create_test_cases_with_steps(
+    test_cases: list[dict[str, Any]],
+    max_workers: int = DEFAULT_BATCH_WORKERS,
+) -> dict[str, Any]:
+    """
+    Create several test cases with their steps in one call.
+
+    Each item: `summary`, `folder_code`, `space`, optional `suit` (default
+    `test_case`) and `steps` (list of step_description, step_data, step_result).
+    Every test case is created empty and then gets its steps; up to
+    `max_workers` test cases are processed concurrently.
+
+    Returns `total`, `succeeded`, `failed` and per-item `results` in input
+    order (`code`, `status`, and on error the failed `stage` and `error`).
+    """
+    items = []
+    for item in test_cases or []:
+        if isinstance(item, dict) and item.get("steps") is not None:
+            item = {**item, "steps": [_step_item_to_dict(s) for s in item["steps"]]}
+        items.append(item)
+    log.info("create_test_cases_with_steps tool: items=%s max_workers=%s", len(items), max_workers)
+    result = await acreate_test_cases_with_steps(items, max_workers=max(1, min(max_workers, 16)))
+    return _serialize_result(result)
+
+
+# Test cases shown by a `clone_folder_test_cases` dry run (the rest are only counted).
+_CLONE_PREVIEW_ITEMS = 5
+
+
+@mcp.tool()
+async def clone_folder_test_cases(
+    source_folder_code: str,
+    target_folder_code: str,
+    space: str,
+    substitutions: dict[str, str] | None = None,
+    suit: str = "test_case",
+    ignore_case: bool = True,
+    dry_run: bool = False,
+    allow_incomplete: bool = False,
+    max_workers: int = DEFAULT_BATCH_WORKERS,
+) -> dict[str, Any]:
+    """
+    Copy every test case of a source folder into a target folder in one call,
+    replacing text in summaries and steps (e.g. {"postgres": "abyss"}).
+
+    All keys are replaced in one pass, longest first; matching ignores case by
+    default and keeps the case of the matched text (Postgres -> Abyss). With
+    `dry_run` nothing is created and `results` shows the transformed summaries
+    and steps of the first test cases. Otherwise returns `total`, `succeeded`, `failed` and per-item
+    `results` (`source_code`, new `code`, `status`, and the failed `stage` and
+    `error`); retry only the failed items.
+
+    Not idempotent: calling it again creates another copy of every test case.
+    If the source folder could not be read completely nothing is created,
+    unless `allow_incomplete` is true.
+    """
+    log.info(
+        "clone_folder_test_cases tool: %s -> %s substitutions=%s dry_run=%s",
+        source_folder_code,
+        target_folder_code,
+        len(substitutions or {}),
+        dry_run,
+    )
+    result = await aclone_folder(
+        source_folder_code,
+        target_folder_code,
+        space,
+        substitutions,
+        suit=suit,
+        ignore_case=ignore_case,
+        dry_run=dry_run,
+        allow_incomplete=allow_incomplete,
+        max_workers=max(1, min(max_workers, 16)),
+    )
+    if dry_run and len(result["results"]) > _CLONE_PREVIEW_ITEMS:
+        result["results_omitted"] = len(result["results"]) - _CLONE_PREVIEW_ITEMS
+        result["results"] = result["results"][:_CLONE_PREVIEW_ITEMS]
     return _serialize_result(result)
 
 
-def main() -> None:
-    """Run the MCP server over stdio (for Cursor and other MCP hosts)."""
-    mcp.run()
+_TRANSPORTS = ("stdio", "http", "streamable-http", "sse")
+
+
+def _parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="TaskTracker MCP server")
+    parser.add_argument(
+        "--transport",
+        choices=_TRANSPORTS,
+        default=get_mcp_transport(),
+        help="stdio (one process per MCP host) or http/sse (one process for many clients); env MCP_TRANSPORT",
+    )
+    parser.add_argument("--host", default=get_mcp_host(), help="HTTP/SSE bind address; env MCP_HOST")
+    parser.add_argument("--port", type=int, default=get_mcp_port(), help="HTTP/SSE port; env MCP_PORT")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=get_mcp_workers(),
+        help="tool calls run at once across all HTTP/SSE clients; env MCP_WORKERS",
+    )
+    parser.add_argument(
+        "--max-calls-per-client",
+        type=int,
+        default=get_mcp_max_calls_per_client(),
+        help="tool calls one HTTP/SSE client may run at once; env MCP_MAX_CALLS_PER_CLIENT",
+    )
+    return parser.parse_args(argv)
+
+
+async def _serve_http(transport: str, host: str, port: int) -> None:
+    try:
+        await mcp.run_async(transport=transport, host=host, port=port)
+    finally:
+        # Everything ran on this loop; close the shared pool before it stops.
+        await aclose_shared_async_client()
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Run the MCP server over stdio (for Cursor and other MCP hosts) or HTTP/SSE."""
+    args = _parse_args(argv)
+    if args.transport == "stdio":
+        mcp.run()
+        return
+    wait_timeout = get_mcp_call_wait_timeout()
+    mcp.add_middleware(
+        ClientConcurrencyMiddleware(
+            max_per_client=args.max_calls_per_client,
+            max_total=args.workers,
+            acquire_timeout=wait_timeout if wait_timeout > 0 else None,
+        )
+    )
+    log.info(
+        "MCP server on %s://%s:%s (workers=%s, per client=%s)",
+        args.transport,
+        args.host,
+        args.port,
+        args.workers,
+        args.max_calls_per_client,
+    )
+    asyncio.run(_serve_http(args.transport, args.host, args.port))
 
 
 if __name__ == "__main__":
@@ -29,6 +29,13 @@ def write_created_tests(run_dir: Path, created_tests: List[Dict[str, Any]]) -> P
     return out
 
 
+def write_plan_json(run_dir: Path, plan: Dict[str, Any]) -> Path:
+    """Write the structured plan of plan-then-execute mode to run_dir/plan.json."""
+    out = run_dir / "plan.json"
+    out.write_text(json.dumps(plan, ensure_ascii=False, indent=2), encoding="utf-8")
+    return out
+
+
 def write_failure_reason(run_dir: Path, content: str) -> Path:
     """Write failure reason to run_dir/failure_reason.txt."""
     out = run_dir / "failure_reason.txt"
@@ -2,7 +2,22 @@
 TaskTracker client and Deep Agents tools.
 
 This package exposes:
-- a thin HTTP client for the TaskTracker API (`client.py`);
+- a thin HTTP client for the TaskTracker API (`client.py`) and its async
+  counterpart (`async_client.py`);
+- auto-paginating unit iterators with look-ahead prefetch (`pagination.py`);
+- an in-process folder index with name/path lookup (`folders.py`);
+- a concurrent breadth-first crawl of a folder subtree (`crawl.py`);
+- a folder clone engine with text substitutions over the batch pipeline (`clone.py`);
+- a revalidating LRU+TTL cache for single units (`cache.py`);
+- a write-through ledger of step codes after our own writes (`step_ledger.py`);
+- content-based alignment that keeps step codes across edits (`step_alignment.py`);
+- copy-on-write create payloads over shared templates (`payloads.py`);
+- ProseMirror step fields decoded to plain text / markdown and encoded from
+  a template (`prosemirror.py`);
+- retries with backoff and per-endpoint circuit breakers (`resilience.py`);
+- an adaptive rate and in-flight limiter shared by all callers (`limiter.py`);
+- single-flight coalescing of identical concurrent reads (`singleflight.py`);
+- a process-wide pooled client shared by all tool calls (`pool.py`);
 - Deep Agents / LangChain tools wrapping common operations (`tools.py`).
 """
 
@@ -0,0 +1,256 @@
+"""
+Non-blocking TaskTracker client built on `httpx.AsyncClient`.
+
+Mirrors every operation of `TaskTrackerClient` (same paths, request bodies and
+return values) so async callers such as the FastMCP server can await
+TaskTracker round-trips instead of blocking the event loop.
+"""
+from __future__ import annotations
+
+import json as jsonlib
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Dict, Mapping, Optional
+
+import httpx
+
+from src.tasktracker.client import (
+    CREATE_FOLDER_PATH,
+    ROOT_FOLDER_UNITS_PATH,
+    BaseTaskTrackerClient,
+    client_settings_from_env,
+    create_folder_body,
+    create_unit_path,
+    folder_units_body,
+    folder_units_path,
+    is_idempotent,
+    request_body_kwargs,
+    root_folder_units_body,
+    unit_path,
+    update_unit_path,
+)
+from src.tasktracker.pagination import (
+    DEFAULT_FETCH_CONCURRENCY,
+    DEFAULT_PAGE_SIZE,
+    FolderFetchResult,
+    afetch_all_pages,
+    aiter_units,
+)
+from src.tasktracker.singleflight import AsyncSingleFlight
+
+
+@dataclass
+class AsyncTaskTrackerClient(BaseTaskTrackerClient):
+    """
+    Async counterpart of `TaskTrackerClient`.
+
+    The underlying `httpx.AsyncClient` is bound to the event loop it is first
+    used on; use `src.tasktracker.pool.get_shared_async_client()` to get the
+    instance for the current loop.
+    """
+
+    def __post_init__(self) -> None:
+        self._client = httpx.AsyncClient(**self._httpx_kwargs())
+        self._inflight = AsyncSingleFlight()
+
+    @classmethod
+    def from_env(cls) -> "AsyncTaskTrackerClient":
+        return cls(**client_settings_from_env())
+
+    # --- Folder operations (TMS plugin) ---
+
+    async def get_root_folder_units(
+        self,
+        *,
+        space_id_code: str = "PVM",
+        page: int = 0,
+        size: int = 50,
+    ) -> Dict[str, Any]:
+        """Get folder hierarchy from root and paginated units."""
+        result = await self._send(
+            "POST",
+            ROOT_FOLDER_UNITS_PATH,
+            json=root_folder_units_body(space_id_code, page, size),
+            endpoint="get_root_folder_units",
+            idempotent=True,
+        )
+        return self._observe_units(result)
+
+    async def create_folder(
+        self,
+        name: str,
+        parent_id_code: str,
+        space_id_code: str = "PVM",
+    ) -> Dict[str, Any]:
+        """Create a folder under the given parent; returns FolderDto."""
+        return await self._send(
+            "POST",
+            CREATE_FOLDER_PATH,
+            json=create_folder_body(name, parent_id_code, space_id_code),
+            endpoint="create_folder",
+        )
+
+    # --- High-level operations used by tools ---
+
+    async def get_test_cases(
+        self,
+        folder_code: str,
+        page: int = 0,
+        size: int = 50,
+    ) -> Dict[str, Any]:
+        """Fetch one page of test cases for a given folder (FolderUnitsDto)."""
+        result = await self._send(
+            "POST",
+            folder_units_path(folder_code),
+            json=folder_units_body(page, size),
+            endpoint="get_test_cases",
+            idempotent=True,
+        )
+        return self._observe_units(result)
+
+    def iter_test_cases(
+        self,
+        folder_code: str,
+        *,
+        page_size: int = DEFAULT_PAGE_SIZE,
+        prefetch: bool = True,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Async-iterate every test case unit in a folder, prefetching the next page."""
+        return aiter_units(
+            lambda page: self.get_test_cases(folder_code, page=page, size=page_size),
+            page_size=page_size,
+            prefetch=prefetch,
+        )
+
+    async def fetch_all_test_cases(
+        self,
+        folder_code: str,
+        *,
+        max_concurrency: int = DEFAULT_FETCH_CONCURRENCY,
+        page_size: int = DEFAULT_PAGE_SIZE,
+    ) -> FolderFetchResult:
+        """Async variant of `TaskTrackerClient.fetch_all_test_cases`."""
+        return await afetch_all_pages(
+            lambda page: self.get_test_cases(folder_code, page=page, size=page_size),
+            page_size=page_size,
+            max_concurrency=max_concurrency,
+        )
+
+    def iter_root_folder_units(
+        self,
+        *,
+        space_id_code: str = "PVM",
+        page_size: int = DEFAULT_PAGE_SIZE,
+        prefetch: bool = True,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Async-iterate every unit from the root folder across pages."""
+        return aiter_units(
+            lambda page: self.get_root_folder_units(
+                space_id_code=space_id_code, page=page, size=page_size
+            ),
+            page_size=page_size,
+            prefetch=prefetch,
+        )
+
+    async def create_test_case(
+        self,
+        suit: str,
+        payload: Mapping[str, Any],
+    ) -> Dict[str, Any]:
+        """Create a new test case via `/rest/api/unit/v2/{suit}/create`."""
+        return await self._send(
+            "POST",
+            create_unit_path(suit),
+            json=payload,
+            endpoint="create_test_case",
+        )
+
+    async def get_test_case(self, code: str) -> Dict[str, Any]:
+        """Fetch a single test case (unit) by code, through `unit_cache` when configured."""
+        cache = self.unit_cache
+        if cache is None:
+            return await self._send("GET", unit_path(code), endpoint="get_test_case")
+        generation = cache.generation()
+        content, conditional = cache.lookup(code)
+        if content is not None:
+            return jsonlib.loads(content)
+        response = await self._request(
+            "GET", unit_path(code), headers=conditional, endpoint="get_test_case"
+        )
+        if response.status_code == 304:
+            content = cache.not_modified(code)
+            if content is not None:
+                return jsonlib.loads(content)
+            response = await self._request("GET", unit_path(code), endpoint="get_test_case")
+        response.raise_for_status()
+        data = response.json()
+        cache.store(code, response.content, data, response.headers, generation)
+        return data
+
+    async def update_test_case(
+        self,
+        code: str,
+        patch_body: Dict[str, Any],
+    ) -> Dict[str, Any]:
+        """Update an existing test case via `/rest/api/unit/v2/update/{code}`."""
+        try:
+            return await self._send(
+                "PATCH",
+                update_unit_path(code),
+                json=patch_body,
+                endpoint="update_test_case",
+            )
+        finally:
+            if self.unit_cache is not None:
+                self.unit_cache.invalidate(code)
+
+    # --- Low-level helpers ---
+
+    async def _request(
+        self,
+        method: str,
+        path: str,
+        *,
+        json: Any = None,
+        headers: Optional[Dict[str, str]] = None,
+        endpoint: Optional[str] = None,
+        idempotent: Optional[bool] = None,
+    ) -> httpx.Response:
+        """Send one request (coalesced, retried and limited like the sync client); no status check."""
+
+        body = request_body_kwargs(json, headers)
+
+        async def send() -> httpx.Response:
+            if self.limiter is None:
+                return await self._client.request(method, path, **body)
+            return await self.limiter.acall(lambda: self._client.request(method, path, **body))
+
+        async def attempt() -> httpx.Response:
+            if self.resilience is None:
+                return await send()
+            return await self.resilience.acall(
+                endpoint or method,
+                send,
+                idempotent=is_idempotent(method, idempotent),
+            )
+
+        key = self._coalesce_key(method, path, json, headers, idempotent)
+        if key is None:
+            return await attempt()
+        return await self._inflight.do(key, attempt)
+
+    async def _send(
+        self,
+        method: str,
+        path: str,
+        *,
+        json: Any = None,
+        endpoint: Optional[str] = None,
+        idempotent: Optional[bool] = None,
+    ) -> Any:
+        """Send one request, raise on HTTP errors and return the decoded JSON body."""
+        response = await self._request(method, path, json=json, endpoint=endpoint, idempotent=idempotent)
+        response.raise_for_status()
+        return response.json()
+
+    async def aclose(self) -> None:
+        await self._client.aclose()
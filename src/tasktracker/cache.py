@@ -0,0 +1,222 @@
+"""
+Read-through cache for single units (`GET /rest/api/unit/v2/{code}`).
+
+The agent and `update_test_case_from_steps` fetch the same test cases over and
+over. `UnitCache` keeps the raw response bodies in an LRU with a TTL:
+
+- fresh entries are served without a request;
+- expired entries are revalidated with `If-None-Match` / `If-Modified-Since`
+  when the server sent `ETag` / `Last-Modified`, and a `304` only refreshes
+  the TTL;
+- folder listings report each unit's `updatedAt`, which refreshes a matching
+  entry or evicts a stale one (`observe`);
+- writes through `update_test_case` invalidate the code.
+
+A read takes a `generation()` token before its request and passes it to
+`store`; a body whose code was invalidated (or the cache cleared) after the
+token was taken is dropped, so a GET racing a PATCH cannot re-cache the
+pre-PATCH unit.
+
+Entries hold the response bytes, so every hit decodes a private copy and
+callers may mutate what they get back.
+"""
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from typing import Any, Callable, Dict, Iterable, Mapping, Optional, Tuple
+
+
+@dataclass
+class UnitCacheStats:
+    """Counters exposed for tuning; `bytes_saved` counts bodies not re-downloaded."""
+
+    hits: int = 0
+    misses: int = 0
+    revalidations: int = 0
+    not_modified: int = 0
+    invalidations: int = 0
+    evictions: int = 0
+    bytes_saved: int = 0
+
+    @property
+    def hit_ratio(self) -> float:
+        served = self.hits + self.not_modified
+        total = served + self.misses
+        return served / total if total else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = asdict(self)
+        data["hit_ratio"] = round(self.hit_ratio, 4)
+        return data
+
+
+class _Entry:
+    __slots__ = ("content", "updated_at", "etag", "last_modified", "stored_at")
+
+    def __init__(
+        self,
+        content: bytes,
+        updated_at: Optional[str],
+        etag: Optional[str],
+        last_modified: Optional[str],
+        stored_at: float,
+    ) -> None:
+        self.content = content
+        self.updated_at = updated_at
+        self.etag = etag
+        self.last_modified = last_modified
+        self.stored_at = stored_at
+
+
+class UnitCache:
+    """Thread-safe LRU + TTL cache of unit response bodies keyed by unit code."""
+
+    def __init__(
+        self,
+        max_entries: int = 512,
+        ttl: float = 60.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._clock = clock
+        self._entries: "OrderedDict[str, _Entry]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = UnitCacheStats()
+        self._generation = 0
+        # code -> generation of its last invalidation; only consulted while a
+        # read is in flight, so it is trimmed like the entries.
+        self._invalidated: "OrderedDict[str, int]" = OrderedDict()
+        # Reads with an older token are treated as invalidated: raised on
+        # `clear()` and to the generation of every trimmed marker.
+        self._trimmed_floor = 0
+
+    def generation(self) -> int:
+        """Token to pass to `store` for a read that starts now."""
+        with self._lock:
+            return self._generation
+
+    def _mark_invalidated(self, code: str) -> None:
+        """Record that `code` changed, for reads in flight. Caller holds `_lock`."""
+        self._generation += 1
+        self._invalidated[code] = self._generation
+        self._invalidated.move_to_end(code)
+        while len(self._invalidated) > max(self.max_entries, 1):
+            _, trimmed = self._invalidated.popitem(last=False)
+            self._trimmed_floor = max(self._trimmed_floor, trimmed)
+
+    def lookup(self, code: str) -> Tuple[Optional[bytes], Optional[Dict[str, str]]]:
+        """
+        Return `(content, None)` for a fresh hit, `(None, conditional_headers)`
+        for an expired entry that can be revalidated, or `(None, None)` on a miss.
+        """
+        with self._lock:
+            entry = self._entries.get(code)
+            if entry is None:
+                self._stats.misses += 1
+                return None, None
+            self._entries.move_to_end(code)
+            if self._clock() - entry.stored_at < self.ttl:
+                self._stats.hits += 1
+                self._stats.bytes_saved += len(entry.content)
+                return entry.content, None
+            headers: Dict[str, str] = {}
+            if entry.etag:
+                headers["If-None-Match"] = entry.etag
+            if entry.last_modified:
+                headers["If-Modified-Since"] = entry.last_modified
+            if not headers:
+                # No validators: the expired entry is useless, refetch in full.
+                del self._entries[code]
+                self._stats.misses += 1
+                return None, None
+            self._stats.revalidations += 1
+            return None, headers
+
+    def not_modified(self, code: str) -> Optional[bytes]:
+        """Handle a `304` for `code`: refresh the TTL and return the cached body."""
+        with self._lock:
+            entry = self._entries.get(code)
+            if entry is None:
+                return None
+            entry.stored_at = self._clock()
+            self._stats.not_modified += 1
+            self._stats.bytes_saved += len(entry.content)
+            return entry.content
+
+    def store(
+        self,
+        code: str,
+        content: bytes,
+        data: Mapping[str, Any],
+        headers: Mapping[str, str],
+        generation: Optional[int] = None,
+    ) -> None:
+        """
+        Cache a full `200` response body for `code`. With `generation` (from
+        `generation()` before the request), the body is dropped if `code` was
+        invalidated or the cache cleared since.
+        """
+        if self.max_entries <= 0:
+            return
+        entry = _Entry(
+            content=content,
+            updated_at=data.get("updatedAt") if isinstance(data, Mapping) else None,
+            etag=headers.get("etag"),
+            last_modified=headers.get("last-modified"),
+            stored_at=self._clock(),
+        )
+        with self._lock:
+            if generation is not None and (
+                generation < self._trimmed_floor or self._invalidated.get(code, 0) > generation
+            ):
+                return
+            self._entries[code] = entry
+            self._entries.move_to_end(code)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._stats.evictions += 1
+
+    def observe(self, units: Iterable[Mapping[str, Any]]) -> None:
+        """
+        Revalidate cached units against `updatedAt` values seen elsewhere
+        (e.g. in a folder listing): matching entries get a fresh TTL, entries
+        whose unit has changed are dropped.
+        """
+        with self._lock:
+            if not self._entries:
+                return
+            now = self._clock()
+            for unit in units:
+                code = unit.get("code")
+                entry = self._entries.get(code) if code else None
+                if entry is None or not unit.get("updatedAt"):
+                    continue
+                if entry.updated_at == unit["updatedAt"]:
+                    entry.stored_at = now
+                else:
+                    del self._entries[code]
+                    self._mark_invalidated(code)
+                    self._stats.invalidations += 1
+
+    def invalidate(self, code: str) -> None:
+        with self._lock:
+            self._mark_invalidated(code)
+            if self._entries.pop(code, None) is not None:
+                self._stats.invalidations += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._invalidated.clear()
+            self._generation += 1
+            self._trimmed_floor = self._generation
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            data = self._stats.to_dict()
+            data["entries"] = len(self._entries)
+            return data
@@ -1,53 +1,174 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import Any, Dict, List, Optional
+import json as jsonlib
+import logging
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, Mapping, Optional, Tuple
 
 import httpx
 
 from src.config import (
     get_tasktracker_base_url,
     get_tasktracker_basic_auth,
+    get_tasktracker_http2,
+    get_tasktracker_keepalive_expiry,
+    get_tasktracker_max_connections,
+    get_tasktracker_max_keepalive_connections,
     get_tasktracker_token,
 )
+from src.tasktracker.cache import UnitCache
+from src.tasktracker.limiter import AdaptiveLimiter
+from src.tasktracker.pagination import (
+    DEFAULT_FETCH_CONCURRENCY,
+    DEFAULT_PAGE_SIZE,
+    FolderFetchResult,
+    fetch_all_pages,
+    flatten_test_cases,
+    iter_units,
+)
+from src.tasktracker.resilience import Resilience
+from src.tasktracker.singleflight import SingleFlight, request_key
 
+log = logging.getLogger(__name__)
 
-@dataclass
-class TaskTrackerClient:
+# TMS plugin / unit API paths shared by the sync and async clients.
+TMS_PLUGIN_PREFIX = "/extension/plugin/v2/rest/api/swtr_tms_plugin/v1"
+ROOT_FOLDER_UNITS_PATH = f"{TMS_PLUGIN_PREFIX}/folder/root/units"
+CREATE_FOLDER_PATH = f"{TMS_PLUGIN_PREFIX}/folder/create"
+
+
+def folder_units_path(folder_code: str) -> str:
+    return f"{TMS_PLUGIN_PREFIX}/folder/hierarchy/{folder_code}/units/filtered"
+
+
+def create_unit_path(suit: str) -> str:
+    return f"/rest/api/unit/v2/{suit}/create"
+
+
+def unit_path(code: str) -> str:
+    return f"/rest/api/unit/v2/{code}"
+
+
+def update_unit_path(code: str) -> str:
+    return f"/rest/api/unit/v2/update/{code}"
+
+
+def root_folder_units_body(space_id_code: str, page: int, size: int) -> Dict[str, Any]:
+    """Request body for the root folder units endpoint (getRootFolderRq + unitFilters)."""
+    return {
+        "getRootFolderRq": {
+            "type": "TEST_CASE",
+            "spaceId": {"code": space_id_code},
+        },
+        "linkedTo": None,
+        "unitFilters": {"page": {"page": page, "size": size}},
+    }
+
+
+def create_folder_body(name: str, parent_id_code: str, space_id_code: str) -> Dict[str, Any]:
+    """Request body for the folder create endpoint."""
+    return {
+        "name": name,
+        "parentId": {"code": parent_id_code},
+        "spaceId": {"code": space_id_code},
+    }
+
+
+def folder_units_body(page: int, size: int) -> Dict[str, Any]:
+    """Request body for the filtered folder units endpoint (`type=TEST_CASE`)."""
+    return {
+        "type": "TEST_CASE",
+        "linkedTo": None,
+        "unitFilters": {
+            "page": {"page": page, "size": size},
+        },
+    }
+
+
+def is_idempotent(method: str, idempotent: Optional[bool] = None) -> bool:
     """
-    Minimal HTTP client for the TaskTracker API described in `api-docs.yaml`.
+    Whether a request may be retried after it possibly reached the server.
 
-    This client focuses on the subset of operations needed for managing
-    test cases:
+    GET and PATCH are idempotent here: the update API replaces
+    `testStepList` with explicit step codes, so repeating it is harmless.
+    POST creates resources unless the caller marks a read-only query.
+    """
+    if idempotent is not None:
+        return idempotent
+    return method.upper() in {"GET", "HEAD", "OPTIONS", "PUT", "DELETE", "PATCH"}
 
-    - Listing test cases in a folder.
-    - Creating a new test case.
-    - Updating an existing test case.
-    - Deleting a test case.
 
-    It can be extended as needed if you start using more of the OpenAPI spec.
+def request_body_kwargs(json: Any, headers: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
+    """
+    `httpx` body arguments for `json`.
+
+    Payloads that are already serialized (objects with `to_json_bytes()`, such
+    as `payloads.TestCasePayload`) are sent as-is instead of via `json.dumps`.
+    """
+    to_json_bytes = getattr(json, "to_json_bytes", None)
+    if to_json_bytes is None:
+        return {"json": json, "headers": headers}
+    return {"content": to_json_bytes(), "headers": {"Content-Type": "application/json", **(headers or {})}}
+
+
+def client_settings_from_env() -> Dict[str, Any]:
+    """
+    Collect TaskTracker client constructor arguments from the environment.
+
+    Used by `TaskTrackerClient.from_env()` and by the shared client pool, which
+    compares these settings to decide when the pooled client must be rebuilt.
+    """
+    return {
+        "base_url": get_tasktracker_base_url(),
+        "token": get_tasktracker_token(),
+        "basic_auth": get_tasktracker_basic_auth(),
+        "max_connections": get_tasktracker_max_connections(),
+        "max_keepalive_connections": get_tasktracker_max_keepalive_connections(),
+        "keepalive_expiry": get_tasktracker_keepalive_expiry(),
+        "http2": get_tasktracker_http2(),
+    }
+
+
+def _http2_available() -> bool:
+    """Return True if the optional `h2` package needed by httpx for HTTP/2 is installed."""
+    try:
+        import h2  # type: ignore[import]  # noqa: F401
+    except ImportError:  # pragma: no cover - optional dependency
+        return False
+    return True
+
+
+@dataclass
+class BaseTaskTrackerClient:
+    """
+    Connection settings shared by the sync and async TaskTracker clients.
+
+    Subclasses build their own httpx client in `__post_init__` from
+    `_httpx_kwargs()`.
     """
 
     base_url: str
     token: Optional[str] = None
     basic_auth: Optional[str] = None
     timeout: float = 300.0
-
-    def __post_init__(self) -> None:
-        self._client = httpx.Client(
-            base_url=self.base_url,
-            timeout=self.timeout,
-            headers=self._build_headers(),
-            verify=False,
-        )
-
-    @classmethod
-    def from_env(cls) -> "TaskTrackerClient":
-        return cls(
-            base_url=get_tasktracker_base_url(),
-            token=get_tasktracker_token(),
-            basic_auth=get_tasktracker_basic_auth(),
-        )
+    max_connections: int = 20
+    max_keepalive_connections: int = 10
+    keepalive_expiry: float = 30.0
+    http2: bool = False
+    unit_cache: Optional[UnitCache] = field(default=None, repr=False, compare=False)
+    resilience: Optional[Resilience] = field(default=None, repr=False, compare=False)
+    limiter: Optional[AdaptiveLimiter] = field(default=None, repr=False, compare=False)
+    coalesce_reads: bool = True
+
+    def _httpx_kwargs(self) -> Dict[str, Any]:
+        return {
+            "base_url": self.base_url,
+            "timeout": self.timeout,
+            "headers": self._build_headers(),
+            "verify": False,
+            "limits": self._build_limits(),
+            "http2": self._resolve_http2(),
+        }
 
     def _build_headers(self) -> Dict[str, str]:
         headers: Dict[str, str] = {
@@ -65,6 +186,74 @@ class TaskTrackerClient:
             headers["Authorization"] = f"Bearer {self.token}"
         return headers
 
+    def _build_limits(self) -> httpx.Limits:
+        return httpx.Limits(
+            max_connections=self.max_connections,
+            max_keepalive_connections=self.max_keepalive_connections,
+            keepalive_expiry=self.keepalive_expiry,
+        )
+
+    def _observe_units(self, result: Dict[str, Any]) -> Dict[str, Any]:
+        """Let the unit cache revalidate against `updatedAt` values in a listing."""
+        if self.unit_cache is not None:
+            self.unit_cache.observe(flatten_test_cases(result))
+        return result
+
+    def _coalesce_key(
+        self,
+        method: str,
+        path: str,
+        json: Any,
+        headers: Optional[Dict[str, str]],
+        idempotent: Optional[bool],
+    ) -> Optional[Tuple[Any, ...]]:
+        """Single-flight key for reads (GET, read-only POST queries); None for anything else."""
+        if not self.coalesce_reads:
+            return None
+        verb = method.upper()
+        if verb == "GET" or (verb == "POST" and idempotent):
+            return request_key(verb, path, json, headers)
+        return None
+
+    def _resolve_http2(self) -> bool:
+        if self.http2 and not _http2_available():
+            log.warning(
+                "TASKTRACKER_HTTP2 is enabled but the `h2` package is not installed; "
+                "falling back to HTTP/1.1. Install `httpx[http2]` to enable HTTP/2."
+            )
+            return False
+        return self.http2
+
+
+@dataclass
+class TaskTrackerClient(BaseTaskTrackerClient):
+    """
+    Minimal HTTP client for the TaskTracker API described in `api-docs.yaml`.
+
+    This client focuses on the subset of operations needed for managing
+    test cases:
+
+    - Listing test cases in a folder.
+    - Creating a new test case.
+    - Updating an existing test case.
+    - Deleting a test case.
+
+    It can be extended as needed if you start using more of the OpenAPI spec.
+
+    Each instance owns an `httpx.Client` connection pool. Tools should not
+    build one per call; use `src.tasktracker.pool.get_shared_client()` to
+    reuse the process-wide instance. See `AsyncTaskTrackerClient` in
+    `async_client.py` for the non-blocking counterpart.
+    """
+
+    def __post_init__(self) -> None:
+        self._client = httpx.Client(**self._httpx_kwargs())
+        self._inflight = SingleFlight()
+
+    @classmethod
+    def from_env(cls) -> "TaskTrackerClient":
+        return cls(**client_settings_from_env())
+
     # --- Folder operations (TMS plugin) ---
 
     def get_root_folder_units(
@@ -80,20 +269,14 @@ class TaskTrackerClient:
         POST /extension/plugin/v2/rest/api/swtr_tms_plugin/v1/folder/root/units
         Request: getRootFolderRq (type TEST_CASE, spaceId), unitFilters (page).
         """
-        body = {
-            "getRootFolderRq": {
-                "type": "TEST_CASE",
-                "spaceId": {"code": space_id_code},
-            },
-            "linkedTo": None,
-            "unitFilters": {"page": {"page": page, "size": size}},
-        }
-        response = self._client.post(
-            "/extension/plugin/v2/rest/api/swtr_tms_plugin/v1/folder/root/units",
-            json=body,
+        result = self._send(
+            "POST",
+            ROOT_FOLDER_UNITS_PATH,
+            json=root_folder_units_body(space_id_code, page, size),
+            endpoint="get_root_folder_units",
+            idempotent=True,
         )
-        response.raise_for_status()
-        return response.json()
+        return self._observe_units(result)
 
     def create_folder(
         self,
@@ -108,17 +291,12 @@ class TaskTrackerClient:
         Request: name, parentId { code }, spaceId { code }.
         Response: FolderDto (id, key, title, children).
         """
-        body = {
-            "name": name,
-            "parentId": {"code": parent_id_code},
-            "spaceId": {"code": space_id_code},
-        }
-        response = self._client.post(
-            "/extension/plugin/v2/rest/api/swtr_tms_plugin/v1/folder/create",
-            json=body,
+        return self._send(
+            "POST",
+            CREATE_FOLDER_PATH,
+            json=create_folder_body(name, parent_id_code, space_id_code),
+            endpoint="create_folder",
         )
-        response.raise_for_status()
-        return response.json()
 
     # --- High-level operations used by tools ---
 
@@ -135,24 +313,73 @@ class TaskTrackerClient:
         `/extension/plugin/v2/rest/api/swtr_tms_plugin/v1/folder/hierarchy/{folder_code}/units/filtered`
         with `type=TEST_CASE`.
         """
-        body = {
-            "type": "TEST_CASE",
-            "linkedTo": None,
-            "unitFilters": {
-                "page": {"page": page, "size": size},
-            },
-        }
-        response = self._client.post(
-            f"/extension/plugin/v2/rest/api/swtr_tms_plugin/v1/folder/hierarchy/{folder_code}/units/filtered",
-            json=body,
+        result = self._send(
+            "POST",
+            folder_units_path(folder_code),
+            json=folder_units_body(page, size),
+            endpoint="get_test_cases",
+            idempotent=True,
+        )
+        return self._observe_units(result)
+
+    def iter_test_cases(
+        self,
+        folder_code: str,
+        *,
+        page_size: int = DEFAULT_PAGE_SIZE,
+        prefetch: bool = True,
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Yield every test case unit in a folder, following `hasNext` across pages.
+
+        The next page is prefetched in the background while the caller consumes
+        the current one; at most two pages are held in memory.
+        """
+        return iter_units(
+            lambda page: self.get_test_cases(folder_code, page=page, size=page_size),
+            page_size=page_size,
+            prefetch=prefetch,
+        )
+
+    def fetch_all_test_cases(
+        self,
+        folder_code: str,
+        *,
+        max_concurrency: int = DEFAULT_FETCH_CONCURRENCY,
+        page_size: int = DEFAULT_PAGE_SIZE,
+    ) -> FolderFetchResult:
+        """
+        Read every test case in a folder, fetching pages after the first in parallel.
+
+        Returns a `FolderFetchResult` with units in page order; pages that failed
+        are reported in `failed_pages` while the successful ones are kept.
+        """
+        return fetch_all_pages(
+            lambda page: self.get_test_cases(folder_code, page=page, size=page_size),
+            page_size=page_size,
+            max_concurrency=max_concurrency,
+        )
+
+    def iter_root_folder_units(
+        self,
+        *,
+        space_id_code: str = "PVM",
+        page_size: int = DEFAULT_PAGE_SIZE,
+        prefetch: bool = True,
+    ) -> Iterator[Dict[str, Any]]:
+        """Yield every unit from the root folder across pages (see `iter_test_cases`)."""
+        return iter_units(
+            lambda page: self.get_root_folder_units(
+                space_id_code=space_id_code, page=page, size=page_size
+            ),
+            page_size=page_size,
+            prefetch=prefetch,
         )
-        response.raise_for_status()
-        return response.json()
 
     def create_test_case(
         self,
         suit: str,
-        payload: Dict[str, Any],
+        payload: Mapping[str, Any],
     ) -> Dict[str, Any]:
         """
         Create a new test case via:
@@ -161,22 +388,41 @@ class TaskTrackerClient:
         The exact schema for `payload` is defined by TaskTracker. You can
         pass through the JSON generated by the agent, as long as it matches
         what the server expects (for test cases that is typically `suit=test_case`).
+        A `payloads.TestCasePayload` is sent pre-serialized.
         """
-        response = self._client.post(
-            f"/rest/api/unit/v2/{suit}/create",
+        return self._send(
+            "POST",
+            create_unit_path(suit),
             json=payload,
+            endpoint="create_test_case",
         )
-        response.raise_for_status()
-        return response.json()
 
     def get_test_case(self, code: str) -> Dict[str, Any]:
         """
         Fetch a single test case (unit) by code:
         `/rest/api/unit/v2/{code}`
+
+        Served from `unit_cache` when configured (see `src.tasktracker.cache`).
         """
-        response = self._client.get(f"/rest/api/unit/v2/{code}")
+        cache = self.unit_cache
+        if cache is None:
+            return self._send("GET", unit_path(code), endpoint="get_test_case")
+        generation = cache.generation()
+        content, conditional = cache.lookup(code)
+        if content is not None:
+            return jsonlib.loads(content)
+        response = self._request(
+            "GET", unit_path(code), headers=conditional, endpoint="get_test_case"
+        )
+        if response.status_code == 304:
+            content = cache.not_modified(code)
+            if content is not None:
+                return jsonlib.loads(content)
+            response = self._request("GET", unit_path(code), endpoint="get_test_case")
         response.raise_for_status()
-        return response.json()
+        data = response.json()
+        cache.store(code, response.content, data, response.headers, generation)
+        return data
 
     def update_test_case(
         self,
@@ -187,12 +433,16 @@ class TaskTrackerClient:
         Update an existing test case:
         `/rest/api/unit/v2/update/{code}`
         """
-        response = self._client.patch(
-            f"/rest/api/unit/v2/update/{code}",
-            json=patch_body,
-        )
-        response.raise_for_status()
-        return response.json()
+        try:
+            return self._send(
+                "PATCH",
+                update_unit_path(code),
+                json=patch_body,
+                endpoint="update_test_case",
+            )
+        finally:
+            if self.unit_cache is not None:
+                self.unit_cache.invalidate(code)
 
     def delete_test_case(self, code: str) -> Dict[str, Any]:
         """
@@ -213,15 +463,62 @@ class TaskTrackerClient:
 
     # --- Low-level helpers ---
 
-    def close(self) -> None:
-        self._client.close()
+    def _request(
+        self,
+        method: str,
+        path: str,
+        *,
+        json: Any = None,
+        headers: Optional[Dict[str, str]] = None,
+        endpoint: Optional[str] = None,
+        idempotent: Optional[bool] = None,
+    ) -> httpx.Response:
+        """
+        Send one request and return the raw response (no status check).
+
+        When `resilience` is set, transient failures are retried and the
+        per-endpoint circuit breaker is consulted (see `resilience.py`).
+        `endpoint` names the breaker; `idempotent` overrides the default
+        derived from the HTTP method (read-only POST queries pass True).
+        Each attempt waits for the shared `limiter` (see `limiter.py`).
+        Identical concurrent reads share one request (see `singleflight.py`).
+        """
 
+        body = request_body_kwargs(json, headers)
 
-def flatten_test_cases(result: Dict[str, Any]) -> List[Dict[str, Any]]:
-    """
-    Extract the list of test case units from the `FolderUnitsDto` response.
-    """
-    units_page = result.get("units") or {}
-    content = units_page.get("content") or []
-    return [item.get("unit", item) for item in content]
+        def send() -> httpx.Response:
+            if self.limiter is None:
+                return self._client.request(method, path, **body)
+            return self.limiter.call(lambda: self._client.request(method, path, **body))
+
+        def attempt() -> httpx.Response:
+            if self.resilience is None:
+                return send()
+            return self.resilience.call(
+                endpoint or method,
+                send,
+                idempotent=is_idempotent(method, idempotent),
+            )
+
+        key = self._coalesce_key(method, path, json, headers, idempotent)
+        if key is None:
+            return attempt()
+        return self._inflight.do(key, attempt)
+
+    def _send(
+        self,
+        method: str,
+        path: str,
+        *,
+        json: Any = None,
+        endpoint: Optional[str] = None,
+        idempotent: Optional[bool] = None,
+    ) -> Any:
+        """Send one request, raise on HTTP errors and return the decoded JSON body."""
+        response = self._request(method, path, json=json, endpoint=endpoint, idempotent=idempotent)
+        response.raise_for_status()
+        return response.json()
+
+    def close(self) -> None:
+        self._client.close()
 
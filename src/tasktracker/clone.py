@@ -0,0 +1,279 @@
+"""
+Deterministic "tests in folder A like folder B": clone a folder's test cases.
+
+Cloning by hand costs the LLM a read plus `create_test_case` and
+`update_test_case_from_steps` per test case. `clone_folder` does the bulk
+work in code: it lists the source folder (all pages), reads every listed
+test case in full with the `get_test_cases_by_codes` batch (folder listings
+do not carry step attributes), applies text substitutions (e.g. `postgres` -> `abyss`) to the summary and
+to every step field, and creates the results in the target folder through
+the `create_test_cases_with_steps` batch pipeline (create + one steps PATCH
+per test case, bounded concurrency, per-item report).
+
+`Substitutions` replaces all keys in one pass (longest key first), so a
+replacement is never rewritten by another rule. Matching ignores case by
+default and keeps the case of the matched text: `Postgres` -> `Abyss`,
+`POSTGRES` -> `ABYSS`. Only summaries and steps are copied; other
+attributes get the defaults of a new test case.
+
+Cloning is not idempotent: every run creates new test cases. So nothing is
+created from an incomplete source read (failed listing pages or test cases)
+unless the caller passes `allow_incomplete`.
+"""
+from __future__ import annotations
+
+import logging
+import re
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple, Union
+
+from src.tasktracker.pagination import DEFAULT_FETCH_CONCURRENCY, FolderFetchResult
+from src.tasktracker.steps import (
+    DEFAULT_BATCH_WORKERS,
+    NewTestCaseSpec,
+    StepTuple,
+    acreate_test_cases_with_steps,
+    create_test_cases_with_steps,
+    unit_step_triples,
+)
+from src.tasktracker.tools import (
+    afetch_all_test_cases,
+    aget_test_cases_by_codes,
+    fetch_all_test_cases,
+    get_test_cases_by_codes,
+)
+
+log = logging.getLogger(__name__)
+
+SubstitutionsInput = Union[Mapping[str, str], Sequence[Tuple[str, str]], None]
+
+
+def _match_case(matched: str, replacement: str) -> str:
+    if matched.isupper() and len(matched) > 1:
+        return replacement.upper()
+    if matched.islower():
+        return replacement
+    if matched[:1].isupper() and matched[1:].islower():
+        return replacement[:1].upper() + replacement[1:]
+    return replacement
+
+
+class Substitutions:
+    """Text replacements applied in a single pass."""
+
+    def __init__(self, rules: Sequence[Tuple[str, str]] = (), ignore_case: bool = True, preserve_case: bool = True) -> None:
+        self.rules: Tuple[Tuple[str, str], ...] = tuple((str(old), str(new)) for old, new in rules if old)
+        self.ignore_case = ignore_case
+        self.preserve_case = preserve_case
+        self._pattern: Optional["re.Pattern[str]"] = None
+        # First rule wins for keys that collide (exactly, or case-insensitively).
+        self._lookup: Dict[str, str] = {}
+        for old, new in self.rules:
+            self._lookup.setdefault(self._key(old), new)
+        if self.rules:
+            keys = sorted({old for old, _ in self.rules}, key=len, reverse=True)
+            flags = re.IGNORECASE if ignore_case else 0
+            self._pattern = re.compile("|".join(re.escape(key) for key in keys), flags)
+
+    @classmethod
+    def from_input(cls, value: SubstitutionsInput, **kwargs: Any) -> "Substitutions":
+        """From a `{old: new}` mapping or a list of `(old, new)` pairs (order kept)."""
+        if value is None:
+            return cls(**kwargs)
+        pairs = value.items() if isinstance(value, Mapping) else value
+        return cls(rules=[(old, new) for old, new in pairs], **kwargs)
+
+    def _key(self, text: str) -> str:
+        return text.casefold() if self.ignore_case else text
+
+    def _replace(self, match: "re.Match[str]") -> str:
+        matched = match.group(0)
+        replacement = self._lookup[self._key(matched)]
+        return _match_case(matched, replacement) if self.ignore_case and self.preserve_case else replacement
+
+    def apply(self, text: str) -> str:
+        if self._pattern is None or not text:
+            return text
+        return self._pattern.sub(self._replace, text)
+
+    def __bool__(self) -> bool:
+        return bool(self.rules)
+
+
+def clone_spec(
+    unit: Mapping[str, Any],
+    *,
+    target_folder_code: str,
+    space: str,
+    substitutions: Substitutions,
+    suit: str = "test_case",
+) -> NewTestCaseSpec:
+    """The `create_test_cases_with_steps` item that clones `unit` into the target folder."""
+    steps = [
+        StepTuple(substitutions.apply(description), substitutions.apply(data), substitutions.apply(result))
+        for description, data, result in unit_step_triples(dict(unit))
+    ]
+    # Built from our own strings: skip validating every step again.
+    return NewTestCaseSpec.model_construct(
+        summary=substitutions.apply(str(unit.get("summary") or unit.get("code") or "")),
+        folder_code=target_folder_code,
+        space=space,
+        suit=suit,
+        steps=steps,
+    )
+
+
+def _listed_codes(fetched: FolderFetchResult) -> List[str]:
+    return [str(unit["code"]) for unit in fetched.units if unit.get("code")]
+
+
+def _source_units(
+    fetched: FolderFetchResult,
+    reads: List[Dict[str, Any]],
+) -> Tuple[List[Dict[str, Any]], Dict[str, str]]:
+    """Full units in listing order, and the codes that could not be read (code -> error)."""
+    by_code = {entry["code"]: entry for entry in reads}
+    units: List[Dict[str, Any]] = []
+    failed: Dict[str, str] = {}
+    for unit in fetched.units:
+        code = unit.get("code")
+        entry = by_code.get(str(code)) if code else None
+        if entry is None:
+            # Nothing to read by: clone what the listing has.
+            units.append(unit)
+        elif entry["status"] == "ok":
+            units.append(entry["test_case"])
+        else:
+            failed[str(code)] = entry["error"]
+    return units, failed
+
+
+def _check_source(
+    source_folder_code: str,
+    fetched: FolderFetchResult,
+    failed_codes: Dict[str, str],
+    *,
+    dry_run: bool,
+    allow_incomplete: bool,
+) -> None:
+    if dry_run or allow_incomplete or (fetched.complete and not failed_codes):
+        return
+    raise ValueError(
+        f"Source folder {source_folder_code} was not read completely "
+        f"(listed {len(fetched.units)} of {fetched.total_elements} units, failed pages {sorted(fetched.failed_pages)}, "
+        f"failed test cases {sorted(failed_codes)}); nothing was created. "
+        "Retry, or pass allow_incomplete=True to clone what was read."
+    )
+
+
+def _clone_plan(
+    units: List[Dict[str, Any]],
+    target_folder_code: str,
+    space: str,
+    substitutions: Substitutions,
+    suit: str,
+) -> Tuple[List[Optional[str]], List[NewTestCaseSpec]]:
+    sources = [unit.get("code") for unit in units]
+    specs = [
+        clone_spec(unit, target_folder_code=target_folder_code, space=space, substitutions=substitutions, suit=suit)
+        for unit in units
+    ]
+    return sources, specs
+
+
+def _preview(specs: List[NewTestCaseSpec]) -> List[Dict[str, Any]]:
+    return [
+        {"index": index, "summary": spec.summary, "steps": [list(step) for step in spec.steps]}
+        for index, spec in enumerate(specs)
+    ]
+
+
+def _clone_report(
+    source_folder_code: str,
+    target_folder_code: str,
+    fetched: FolderFetchResult,
+    failed_codes: Dict[str, str],
+    sources: List[Optional[str]],
+    specs: List[NewTestCaseSpec],
+    batch: Optional[Dict[str, Any]],
+) -> Dict[str, Any]:
+    report: Dict[str, Any] = {
+        "source_folder_code": source_folder_code,
+        "target_folder_code": target_folder_code,
+        "source_complete": fetched.complete and not failed_codes,
+    }
+    if fetched.failed_pages:
+        report["source_failed_pages"] = {str(page): error for page, error in fetched.failed_pages.items()}
+    if failed_codes:
+        report["source_failed_codes"] = failed_codes
+    if batch is None:
+        report.update(dry_run=True, total=len(specs), results=_preview(specs))
+    else:
+        report.update(batch)
+    for entry in report["results"]:
+        entry["source_code"] = sources[entry["index"]]
+    log.info(
+        "clone_folder: %s -> %s total=%s failed=%s dry_run=%s",
+        source_folder_code,
+        target_folder_code,
+        report["total"],
+        report.get("failed", 0),
+        batch is None,
+    )
+    return report
+
+
+def clone_folder(
+    source_folder_code: str,
+    target_folder_code: str,
+    space: str,
+    substitutions: SubstitutionsInput = None,
+    *,
+    suit: str = "test_case",
+    ignore_case: bool = True,
+    dry_run: bool = False,
+    allow_incomplete: bool = False,
+    max_workers: int = DEFAULT_BATCH_WORKERS,
+    max_fetch_concurrency: int = DEFAULT_FETCH_CONCURRENCY,
+) -> Dict[str, Any]:
+    """
+    Copy every test case of `source_folder_code` into `target_folder_code`,
+    applying `substitutions` to summaries and steps.
+
+    Returns the `create_test_cases_with_steps` report (`total`, `succeeded`,
+    `failed`, per-item `results` with `code` and `source_code`). With
+    `dry_run` nothing is created and `results` holds the transformed
+    summaries and steps. Raises ValueError, creating nothing, when the source
+    was not read completely and `allow_incomplete` is False.
+    """
+    rules = Substitutions.from_input(substitutions, ignore_case=ignore_case)
+    fetched = fetch_all_test_cases(source_folder_code, max_concurrency=max_fetch_concurrency)
+    reads = get_test_cases_by_codes(_listed_codes(fetched), max_concurrency=max_fetch_concurrency)
+    units, failed_codes = _source_units(fetched, reads)
+    _check_source(source_folder_code, fetched, failed_codes, dry_run=dry_run, allow_incomplete=allow_incomplete)
+    sources, specs = _clone_plan(units, target_folder_code, space, rules, suit)
+    batch = None if dry_run else create_test_cases_with_steps(list(specs), max_workers=max_workers)
+    return _clone_report(source_folder_code, target_folder_code, fetched, failed_codes, sources, specs, batch)
+
+
+async def aclone_folder(
+    source_folder_code: str,
+    target_folder_code: str,
+    space: str,
+    substitutions: SubstitutionsInput = None,
+    *,
+    suit: str = "test_case",
+    ignore_case: bool = True,
+    dry_run: bool = False,
+    allow_incomplete: bool = False,
+    max_workers: int = DEFAULT_BATCH_WORKERS,
+    max_fetch_concurrency: int = DEFAULT_FETCH_CONCURRENCY,
+) -> Dict[str, Any]:
+    """Async variant of `clone_folder`."""
+    rules = Substitutions.from_input(substitutions, ignore_case=ignore_case)
+    fetched = await afetch_all_test_cases(source_folder_code, max_concurrency=max_fetch_concurrency)
+    reads = await aget_test_cases_by_codes(_listed_codes(fetched), max_concurrency=max_fetch_concurrency)
+    units, failed_codes = _source_units(fetched, reads)
+    _check_source(source_folder_code, fetched, failed_codes, dry_run=dry_run, allow_incomplete=allow_incomplete)
+    sources, specs = _clone_plan(units, target_folder_code, space, rules, suit)
+    batch = None if dry_run else await acreate_test_cases_with_steps(list(specs), max_workers=max_workers)
+    return _clone_report(source_folder_code, target_folder_code, fetched, failed_codes, sources, specs, batch)
@@ -0,0 +1,190 @@
+"""
+Concurrent crawl of the test cases in a folder subtree.
+
+`get_test_cases` lists a single folder, so reading "everything under folder
+X" meant walking subfolders one tool call at a time. The folder tree comes
+from the folder index (`FolderDto.children` of the root listing, see
+`folders.py`), rebuilt from one root listing at the start of every crawl so
+subfolders created since (by anyone) are included; the crawl reflects that
+snapshot of the tree. `crawl_subtree` /
+`acrawl_subtree` walk it breadth-first and fetch the units of up to
+`max_concurrency` folders at a time (all pages of each folder), yielding one
+`FolderUnits` per folder as soon as it is read, tagged with its path and
+depth. A failing folder is reported in its `error` and does not stop the
+crawl; `order` restores breadth-first order when results are collected.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional, Set, Tuple
+
+from src.tasktracker.folders import FolderNode
+from src.tasktracker.pagination import DEFAULT_FETCH_CONCURRENCY, DEFAULT_PAGE_SIZE, FolderFetchResult
+from src.tasktracker.tools import afetch_all_test_cases, afolder_subtree, fetch_all_test_cases, folder_subtree
+
+log = logging.getLogger(__name__)
+
+# Pages fetched concurrently within one folder; folders are the main fan-out.
+_PAGES_PER_FOLDER = 2
+
+
+@dataclass(frozen=True)
+class CrawledFolder:
+    """A folder of the crawled subtree; `order` is its breadth-first position."""
+
+    code: str
+    title: str
+    path: str
+    depth: int
+    parent_code: Optional[str]
+    order: int
+
+
+@dataclass
+class FolderUnits:
+    """Units of one crawled folder, or the error that prevented reading them."""
+
+    folder: CrawledFolder
+    units: List[Dict[str, Any]] = field(default_factory=list)
+    total_elements: Optional[int] = None
+    complete: bool = True
+    error: Optional[str] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        result: Dict[str, Any] = {
+            "code": self.folder.code,
+            "title": self.folder.title,
+            "path": self.folder.path,
+            "depth": self.folder.depth,
+            "unit_count": len(self.units),
+            "complete": self.complete,
+            "units": self.units,
+        }
+        if self.error is not None:
+            result["error"] = self.error
+        return result
+
+
+def _crawled_folders(subtree: List[Tuple[FolderNode, str, int]]) -> List[CrawledFolder]:
+    return [
+        CrawledFolder(
+            code=node.code,
+            title=node.title,
+            path=path,
+            depth=depth,
+            parent_code=node.parent_code,
+            order=order,
+        )
+        for order, (node, path, depth) in enumerate(subtree)
+    ]
+
+
+def _folder_units(folder: CrawledFolder, fetched: FolderFetchResult) -> FolderUnits:
+    failed = "; ".join(f"page {page}: {error}" for page, error in sorted(fetched.failed_pages.items()))
+    return FolderUnits(
+        folder=folder,
+        units=fetched.units,
+        total_elements=fetched.total_elements,
+        complete=fetched.complete,
+        error=failed or None,
+    )
+
+
+def _folder_failed(folder: CrawledFolder, exc: Exception) -> FolderUnits:
+    log.warning("crawl: folder %s (%s) failed: %s: %s", folder.code, folder.path, type(exc).__name__, exc)
+    return FolderUnits(folder=folder, complete=False, error=f"{type(exc).__name__}: {exc}")
+
+
+def _read_folder(folder: CrawledFolder, page_size: int) -> FolderUnits:
+    try:
+        fetched = fetch_all_test_cases(folder.code, max_concurrency=_PAGES_PER_FOLDER, page_size=page_size)
+    except Exception as exc:
+        return _folder_failed(folder, exc)
+    return _folder_units(folder, fetched)
+
+
+async def _aread_folder(folder: CrawledFolder, page_size: int, semaphore: asyncio.Semaphore) -> FolderUnits:
+    async with semaphore:
+        try:
+            fetched = await afetch_all_test_cases(folder.code, max_concurrency=_PAGES_PER_FOLDER, page_size=page_size)
+        except Exception as exc:
+            return _folder_failed(folder, exc)
+    return _folder_units(folder, fetched)
+
+
+def plan_subtree(folder_code: str, space_id_code: str = "PVM", max_depth: Optional[int] = None) -> List[CrawledFolder]:
+    """Folders a crawl of `folder_code` visits, in breadth-first order (refreshes the index; no unit requests)."""
+    return _crawled_folders(folder_subtree(folder_code, space_id_code, max_depth, refresh=True))
+
+
+def crawl_subtree(
+    folder_code: str,
+    space_id_code: str = "PVM",
+    *,
+    max_depth: Optional[int] = None,
+    max_concurrency: int = DEFAULT_FETCH_CONCURRENCY,
+    page_size: int = DEFAULT_PAGE_SIZE,
+) -> Iterator[FolderUnits]:
+    """
+    Yield the units of every folder in the subtree at `folder_code`, as each
+    folder finishes. Folders are submitted in breadth-first order, at most
+    `max_concurrency` at a time; closing the iterator early cancels the rest.
+    Raises ValueError when the folder does not exist.
+    """
+    folders = plan_subtree(folder_code, space_id_code, max_depth)
+    log.info("crawl: %s (space=%s) folders=%s max_concurrency=%s", folder_code, space_id_code, len(folders), max_concurrency)
+    queue = iter(folders)
+    workers = max(1, min(max_concurrency, len(folders)))
+    executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="tt-crawl")
+    pending: Set[Future] = set()
+    try:
+        # Keep at most `workers` folders queued so an abandoned crawl does not keep fetching.
+        for folder in queue:
+            pending.add(executor.submit(_read_folder, folder, page_size))
+            if len(pending) >= workers:
+                break
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                folder = next(queue, None)
+                if folder is not None:
+                    pending.add(executor.submit(_read_folder, folder, page_size))
+                yield future.result()
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+async def acrawl_subtree(
+    folder_code: str,
+    space_id_code: str = "PVM",
+    *,
+    max_depth: Optional[int] = None,
+    max_concurrency: int = DEFAULT_FETCH_CONCURRENCY,
+    page_size: int = DEFAULT_PAGE_SIZE,
+) -> AsyncIterator[FolderUnits]:
+    """Async variant of `crawl_subtree` (concurrency bounded by a semaphore)."""
+    folders = _crawled_folders(await afolder_subtree(folder_code, space_id_code, max_depth, refresh=True))
+    log.info("crawl: %s (space=%s) folders=%s max_concurrency=%s", folder_code, space_id_code, len(folders), max_concurrency)
+    semaphore = asyncio.Semaphore(max(1, max_concurrency))
+    tasks = [asyncio.ensure_future(_aread_folder(folder, page_size, semaphore)) for folder in folders]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            yield await next_done
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+
+def collect_subtree(folder_code: str, space_id_code: str = "PVM", **kwargs: Any) -> List[FolderUnits]:
+    """All folders of `crawl_subtree`, in breadth-first order."""
+    return sorted(crawl_subtree(folder_code, space_id_code, **kwargs), key=lambda result: result.folder.order)
+
+
+async def acollect_subtree(folder_code: str, space_id_code: str = "PVM", **kwargs: Any) -> List[FolderUnits]:
+    """Async variant of `collect_subtree`."""
+    results = [result async for result in acrawl_subtree(folder_code, space_id_code, **kwargs)]
+    return sorted(results, key=lambda result: result.folder.order)
@@ -4,12 +4,29 @@ Wrapper around the real TaskTracker client that stubs only mutating operations.
 When TASKTRACKER_DRY_RUN is set, read operations (get_root_folder_units,
 get_test_cases, get_test_case) go to the real API. create_folder, create_test_case,
 and update_test_case return success without calling the API.
+
+`AsyncDryRunTaskTrackerClient` does the same for `AsyncTaskTrackerClient`.
 """
 from __future__ import annotations
 
-from typing import Any, Dict, List
+import itertools
+from typing import Any, AsyncIterator, Dict, Iterator
+
+# next() on itertools.count is atomic, so batch worker threads never share a code.
+_DRY_RUN_CREATE_COUNTER = itertools.count(1)
+
+
+def _dry_run_folder(name: str) -> Dict[str, Any]:
+    return {
+        "id": {"code": "dry-run-folder"},
+        "key": "dry-run-folder",
+        "title": name,
+        "children": [],
+    }
 
-_DRY_RUN_CREATE_COUNTER = 0
+
+def _dry_run_test_case_id() -> Dict[str, Any]:
+    return {"id": f"DRY-RUN-{next(_DRY_RUN_CREATE_COUNTER)}"}
 
 
 class DryRunTaskTrackerClient:
@@ -40,12 +57,7 @@ class DryRunTaskTrackerClient:
         parent_id_code: str,
         space_id_code: str = "PVM",
     ) -> Dict[str, Any]:
-        return {
-            "id": {"code": "dry-run-folder"},
-            "key": "dry-run-folder",
-            "title": name,
-            "children": [],
-        }
+        return _dry_run_folder(name)
 
     def get_test_cases(
         self,
@@ -59,13 +71,81 @@ class DryRunTaskTrackerClient:
             size=size,
         )
 
+    def iter_test_cases(self, folder_code: str, **kwargs: Any) -> Iterator[Dict[str, Any]]:
+        return self._client.iter_test_cases(folder_code, **kwargs)
+
+    def iter_root_folder_units(self, **kwargs: Any) -> Iterator[Dict[str, Any]]:
+        return self._client.iter_root_folder_units(**kwargs)
+
+    def fetch_all_test_cases(self, folder_code: str, **kwargs: Any) -> Any:
+        return self._client.fetch_all_test_cases(folder_code, **kwargs)
+
     def create_test_case(self, suit: str, payload: Dict[str, Any]) -> Dict[str, Any]:
-        global _DRY_RUN_CREATE_COUNTER
-        _DRY_RUN_CREATE_COUNTER += 1
-        return {"id": f"DRY-RUN-{_DRY_RUN_CREATE_COUNTER}"}
+        return _dry_run_test_case_id()
 
     def get_test_case(self, code: str) -> Dict[str, Any]:
         return self._client.get_test_case(code=code)
 
     def update_test_case(self, code: str, patch_body: Dict[str, Any]) -> Dict[str, Any]:
         return {"id": code}
+
+
+class AsyncDryRunTaskTrackerClient:
+    """
+    Async counterpart of `DryRunTaskTrackerClient` wrapping `AsyncTaskTrackerClient`.
+    Reads are awaited on the real client; mutating calls return fake success.
+    """
+
+    def __init__(self, real_client: Any) -> None:
+        self._client = real_client
+
+    async def get_root_folder_units(
+        self,
+        *,
+        space_id_code: str = "PVM",
+        page: int = 0,
+        size: int = 50,
+    ) -> Dict[str, Any]:
+        return await self._client.get_root_folder_units(
+            space_id_code=space_id_code,
+            page=page,
+            size=size,
+        )
+
+    async def create_folder(
+        self,
+        name: str,
+        parent_id_code: str,
+        space_id_code: str = "PVM",
+    ) -> Dict[str, Any]:
+        return _dry_run_folder(name)
+
+    async def get_test_cases(
+        self,
+        folder_code: str,
+        page: int = 0,
+        size: int = 50,
+    ) -> Dict[str, Any]:
+        return await self._client.get_test_cases(
+            folder_code=folder_code,
+            page=page,
+            size=size,
+        )
+
+    def iter_test_cases(self, folder_code: str, **kwargs: Any) -> AsyncIterator[Dict[str, Any]]:
+        return self._client.iter_test_cases(folder_code, **kwargs)
+
+    def iter_root_folder_units(self, **kwargs: Any) -> AsyncIterator[Dict[str, Any]]:
+        return self._client.iter_root_folder_units(**kwargs)
+
+    async def fetch_all_test_cases(self, folder_code: str, **kwargs: Any) -> Any:
+        return await self._client.fetch_all_test_cases(folder_code, **kwargs)
+
+    async def create_test_case(self, suit: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+        return _dry_run_test_case_id()
+
+    async def get_test_case(self, code: str) -> Dict[str, Any]:
+        return await self._client.get_test_case(code=code)
+
+    async def update_test_case(self, code: str, patch_body: Dict[str, Any]) -> Dict[str, Any]:
+        return {"id": code}
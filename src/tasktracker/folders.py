@@ -0,0 +1,300 @@
+"""
+In-process index of the TaskTracker folder tree (`FolderDto` hierarchy).
+
+`get_root_folder_units` returns the whole `folderHierarchy`; dumping it into
+the LLM context just to find one folder code is slow and expensive.
+`FolderIndex` keeps the tree in memory with O(1) lookup by code, by folder
+name and by slash-separated path (e.g. `"Datasources/postgres datasource"`),
+plus parent/child navigation. It is updated incrementally when a folder is
+created, and `FolderIndexRegistry` keeps one index per space.
+"""
+from __future__ import annotations
+
+import threading
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, List, Mapping, Optional, Tuple
+
+PATH_SEPARATOR = "/"
+
+
+def _normalize(text: str) -> str:
+    return " ".join(text.split()).casefold()
+
+
+def _split_path(path: str) -> Tuple[str, ...]:
+    return tuple(_normalize(part) for part in path.split(PATH_SEPARATOR) if part.strip())
+
+
+def _folder_code(folder_dto: Mapping[str, Any]) -> Optional[str]:
+    folder_id = folder_dto.get("id")
+    if isinstance(folder_id, Mapping) and folder_id.get("code"):
+        return str(folder_id["code"])
+    key = folder_dto.get("key")
+    return str(key) if key else None
+
+
+@dataclass
+class FolderNode:
+    """A single folder: its code, title, parent and child codes."""
+
+    code: str
+    title: str
+    parent_code: Optional[str] = None
+    children: List[str] = field(default_factory=list)
+
+
+class FolderIndex:
+    """
+    Folder tree with lookup by code, name and path.
+
+    Paths are built from folder titles below the root (the root title itself
+    may be given as a leading segment and is ignored). Name and path lookups
+    are case-insensitive and collapse whitespace.
+    """
+
+    def __init__(self) -> None:
+        self.root_code: Optional[str] = None
+        self._nodes: Dict[str, FolderNode] = {}
+        self._by_name: Dict[str, List[str]] = {}
+        self._by_path: Dict[Tuple[str, ...], List[str]] = {}
+
+    @classmethod
+    def from_folder_dto(cls, tree: Mapping[str, Any]) -> "FolderIndex":
+        """Build an index from a `FolderDto` root (e.g. `folderHierarchy`)."""
+        index = cls()
+        index.root_code = index.add(tree, parent_code=None)
+        return index
+
+    def __len__(self) -> int:
+        return len(self._nodes)
+
+    def __contains__(self, code: object) -> bool:
+        return code in self._nodes
+
+    def add(self, folder_dto: Mapping[str, Any], parent_code: Optional[str]) -> Optional[str]:
+        """
+        Add (or replace) a folder and its subtree under `parent_code`.
+
+        Used for incremental refresh after `create_folder`, which returns the
+        new `FolderDto`. Returns the code of the added folder.
+        """
+        code = _folder_code(folder_dto)
+        if code is None:
+            return None
+        if code in self._nodes:
+            self._remove(code)
+        node = FolderNode(
+            code=code,
+            title=str(folder_dto.get("title") or code),
+            parent_code=parent_code,
+        )
+        self._nodes[code] = node
+        self._by_name.setdefault(_normalize(node.title), []).append(code)
+        if parent_code is not None:
+            parent = self._nodes.get(parent_code)
+            if parent is not None and code not in parent.children:
+                parent.children.append(code)
+            self._by_path.setdefault(self._path_key(code), []).append(code)
+
+        # Iterative walk so deep trees cannot hit the recursion limit.
+        stack = [(child, code) for child in reversed(folder_dto.get("children") or [])]
+        while stack:
+            child_dto, child_parent = stack.pop()
+            if not isinstance(child_dto, Mapping):
+                continue
+            child_code = _folder_code(child_dto)
+            if child_code is None:
+                continue
+            child = FolderNode(
+                code=child_code,
+                title=str(child_dto.get("title") or child_code),
+                parent_code=child_parent,
+            )
+            self._nodes[child_code] = child
+            self._nodes[child_parent].children.append(child_code)
+            self._by_name.setdefault(_normalize(child.title), []).append(child_code)
+            self._by_path.setdefault(self._path_key(child_code), []).append(child_code)
+            stack.extend((grandchild, child_code) for grandchild in reversed(child_dto.get("children") or []))
+        return code
+
+    def _remove(self, code: str) -> None:
+        if code not in self._nodes:
+            return
+        subtree: List[str] = []
+        stack = [code]
+        while stack:
+            current = stack.pop()
+            subtree.append(current)
+            stack.extend(self._nodes[current].children)
+        # Descendants first, so every path key is computed while its ancestors still exist.
+        for current in reversed(subtree):
+            node = self._nodes[current]
+            if node.parent_code is not None:
+                key = self._path_key(current)
+                self._discard(self._by_path, key, current)
+                parent = self._nodes.get(node.parent_code)
+                if parent is not None and current in parent.children:
+                    parent.children.remove(current)
+            self._discard(self._by_name, _normalize(node.title), current)
+            del self._nodes[current]
+
+    @staticmethod
+    def _discard(table: Dict[Any, List[str]], key: Any, code: str) -> None:
+        codes = table.get(key)
+        if codes and code in codes:
+            codes.remove(code)
+            if not codes:
+                del table[key]
+
+    def _path_key(self, code: str) -> Tuple[str, ...]:
+        parts: List[str] = []
+        node = self._nodes.get(code)
+        while node is not None and node.parent_code is not None:
+            parts.append(_normalize(node.title))
+            node = self._nodes.get(node.parent_code)
+        return tuple(reversed(parts))
+
+    # --- Navigation ---
+
+    def get(self, code: str) -> Optional[FolderNode]:
+        return self._nodes.get(code)
+
+    def parent(self, code: str) -> Optional[FolderNode]:
+        node = self._nodes.get(code)
+        return self._nodes.get(node.parent_code) if node and node.parent_code else None
+
+    def children(self, code: str) -> List[FolderNode]:
+        node = self._nodes.get(code)
+        return [self._nodes[c] for c in node.children] if node else []
+
+    def path(self, code: str) -> str:
+        """Human-readable path of titles below the root, e.g. `Datasources/postgres datasource`."""
+        titles: List[str] = []
+        node = self._nodes.get(code)
+        while node is not None and node.parent_code is not None:
+            titles.append(node.title)
+            node = self._nodes.get(node.parent_code)
+        return PATH_SEPARATOR.join(reversed(titles))
+
+    def walk(self, code: str, max_depth: Optional[int] = None) -> Iterator[Tuple[FolderNode, int]]:
+        """Breadth-first `(folder, depth)` pairs of the subtree at `code` (the folder itself at depth 0)."""
+        node = self._nodes.get(code)
+        if node is None:
+            return
+        queue = deque([(node, 0)])
+        while queue:
+            node, depth = queue.popleft()
+            yield node, depth
+            if max_depth is None or depth < max_depth:
+                queue.extend((self._nodes[child], depth + 1) for child in node.children)
+
+    # --- Lookup ---
+
+    def resolve(self, path_or_name: str) -> List[FolderNode]:
+        """
+        Find folders by code, exact path, path suffix or name.
+
+        An exact code returns one folder; a full path returns every folder
+        at that path (siblings may share a title). A bare name returns
+        every folder with that title. A partial path such as
+        `Datasources/postgres datasource` matches folders whose path ends
+        with those segments.
+        """
+        query = path_or_name.strip()
+        if not query:
+            return []
+        if query in self._nodes:
+            return [self._nodes[query]]
+
+        segments = _split_path(query)
+        if not segments:
+            return []
+        root = self._nodes.get(self.root_code) if self.root_code else None
+        if root is not None and len(segments) > 1 and segments[0] == _normalize(root.title):
+            segments = segments[1:]
+
+        candidates = self._by_name.get(segments[-1], [])
+        if len(segments) == 1:
+            return [self._nodes[c] for c in candidates]
+
+        exact = self._by_path.get(segments)
+        if exact:
+            return [self._nodes[c] for c in exact]
+        return [
+            self._nodes[c]
+            for c in candidates
+            if self._path_key(c)[-len(segments):] == segments
+        ]
+
+    def describe(self, node: FolderNode) -> Dict[str, Any]:
+        """Compact JSON-friendly view of a folder for tool results."""
+        return {
+            "code": node.code,
+            "title": node.title,
+            "path": self.path(node.code),
+            "parent_code": node.parent_code,
+            "children": [
+                {"code": child.code, "title": child.title}
+                for child in self.children(node.code)
+            ],
+        }
+
+
+class FolderIndexRegistry:
+    """Thread-safe holder of one `FolderIndex` per space code."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._indexes: Dict[str, FolderIndex] = {}
+
+    def get(self, space_id_code: str) -> Optional[FolderIndex]:
+        with self._lock:
+            return self._indexes.get(space_id_code)
+
+    def set_from_hierarchy(self, space_id_code: str, folder_hierarchy: Mapping[str, Any]) -> FolderIndex:
+        index = FolderIndex.from_folder_dto(folder_hierarchy)
+        with self._lock:
+            self._indexes[space_id_code] = index
+        return index
+
+    def resolve(self, space_id_code: str, path_or_name: str) -> Optional[List[Dict[str, Any]]]:
+        """Resolve against the space's index; None when the space has not been indexed yet."""
+        with self._lock:
+            index = self._indexes.get(space_id_code)
+            if index is None:
+                return None
+            return [index.describe(node) for node in index.resolve(path_or_name)]
+
+    def subtree(
+        self,
+        space_id_code: str,
+        code: str,
+        max_depth: Optional[int] = None,
+    ) -> Optional[List[Tuple[FolderNode, str, int]]]:
+        """
+        Snapshot of the subtree at `code` in breadth-first order as
+        `(folder, path, depth)`; None when the space is not indexed or does
+        not contain `code`.
+        """
+        with self._lock:
+            index = self._indexes.get(space_id_code)
+            if index is None or code not in index:
+                return None
+            return [(node, index.path(node.code), depth) for node, depth in index.walk(code, max_depth)]
+
+    def note_folder_created(
+        self,
+        space_id_code: str,
+        parent_id_code: str,
+        folder_dto: Mapping[str, Any],
+    ) -> None:
+        """Incrementally add a folder returned by `create_folder` to an existing index."""
+        with self._lock:
+            index = self._indexes.get(space_id_code)
+            if index is not None and parent_id_code in index:
+                index.add(folder_dto, parent_code=parent_id_code)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._indexes.clear()
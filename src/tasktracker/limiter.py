@@ -0,0 +1,247 @@
+"""
+Adaptive client-side concurrency limit for TaskTracker requests.
+
+Concurrent single-runs and the MCP server's parallel tool calls used to send
+as many requests as they liked, so an already busy TaskTracker answered with
+cascading 429s and timeouts. `AdaptiveLimiter` sits in front of every HTTP
+attempt made by the TaskTracker clients and combines:
+
+- a token bucket capping requests per second (with a burst allowance);
+- an in-flight cap adjusted AIMD-style: +1 after a full window of healthy
+  responses, multiplied by `decrease_factor` on 429, 5xx, timeouts,
+  connection errors or a latency spike (sample far above the smoothed
+  baseline). Decreases are rate-limited so one burst of errors cuts once.
+
+One limiter is shared process-wide (see `pool.py`); it is thread-safe and
+usable from any event loop, since async waiters poll instead of holding
+loop-bound primitives. `snapshot()` exposes the current limit for tuning.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import threading
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+import httpx
+
+log = logging.getLogger(__name__)
+
+# Poll interval for async waiters while the in-flight cap is reached.
+_ASYNC_POLL_INTERVAL = 0.01
+
+
+class TokenBucket:
+    """Requests-per-second bucket; `reserve()` returns how long the caller must wait."""
+
+    def __init__(
+        self,
+        rate: float,
+        burst: float,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.rate = rate
+        self.burst = max(1.0, burst)
+        self._clock = clock
+        self._tokens = self.burst
+        self._updated = clock()
+
+    def reserve(self) -> float:
+        """Take one token (possibly borrowing from the future). Caller holds the limiter lock."""
+        now = self._clock()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+        self._tokens -= 1.0
+        if self._tokens >= 0:
+            return 0.0
+        return -self._tokens / self.rate
+
+
+class AdaptiveLimiter:
+    """
+    Shared limiter: token bucket for the request rate plus an AIMD in-flight cap.
+
+    `rate <= 0` disables the token bucket. The in-flight limit starts at
+    `initial_limit` and moves between `min_limit` and `max_limit`.
+    """
+
+    def __init__(
+        self,
+        rate: float = 20.0,
+        burst: Optional[float] = None,
+        initial_limit: int = 8,
+        min_limit: int = 1,
+        max_limit: int = 20,
+        decrease_factor: float = 0.5,
+        latency_tolerance: float = 2.0,
+        decrease_cooldown: float = 1.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.min_limit = max(1, min_limit)
+        self.max_limit = max(self.min_limit, max_limit)
+        self.decrease_factor = decrease_factor
+        self.latency_tolerance = latency_tolerance
+        self.decrease_cooldown = decrease_cooldown
+        self._clock = clock
+        self._bucket = TokenBucket(rate, burst or rate, clock) if rate > 0 else None
+        self._cond = threading.Condition()
+        self._limit = float(min(self.max_limit, max(self.min_limit, initial_limit)))
+        self._in_flight = 0
+        self._healthy_in_window = 0
+        self._baseline: Optional[float] = None
+        self._last_decrease = float("-inf")
+        self._increases = 0
+        self._decreases = 0
+        self._throttled = 0
+        self._wait_seconds = 0.0
+
+    @property
+    def limit(self) -> int:
+        with self._cond:
+            return int(self._limit)
+
+    # --- Acquire / release ---
+
+    def _try_take_slot(self) -> Optional[float]:
+        """Take an in-flight slot and a token; returns the token delay, or None if at the cap. Caller holds the lock."""
+        if self._in_flight >= int(self._limit):
+            return None
+        self._in_flight += 1
+        return self._bucket.reserve() if self._bucket is not None else 0.0
+
+    def _note_wait(self, waited: float) -> None:
+        if waited > 0.001:
+            with self._cond:
+                self._throttled += 1
+                self._wait_seconds += waited
+
+    def _abandon_slot(self) -> None:
+        with self._cond:
+            self._in_flight -= 1
+            self._cond.notify_all()
+
+    def acquire(self) -> None:
+        """Block until a request may be sent. Pair with `release()`."""
+        started = self._clock()
+        with self._cond:
+            delay = self._try_take_slot()
+            while delay is None:
+                self._cond.wait()
+                delay = self._try_take_slot()
+        if delay > 0:
+            try:
+                time.sleep(delay)
+            except BaseException:
+                self._abandon_slot()
+                raise
+        self._note_wait(self._clock() - started)
+
+    async def aacquire(self) -> None:
+        """Async variant of `acquire`; safe to use from any event loop."""
+        started = self._clock()
+        while True:
+            with self._cond:
+                delay = self._try_take_slot()
+            if delay is not None:
+                break
+            await asyncio.sleep(_ASYNC_POLL_INTERVAL)
+        if delay > 0:
+            try:
+                await asyncio.sleep(delay)
+            except BaseException:
+                # Cancelled while waiting for a token: give the slot back.
+                self._abandon_slot()
+                raise
+        self._note_wait(self._clock() - started)
+
+    def release(
+        self,
+        latency: float,
+        status_code: Optional[int] = None,
+        error: Optional[BaseException] = None,
+    ) -> None:
+        """Free the slot and feed the outcome of the request into the AIMD controller."""
+        with self._cond:
+            self._in_flight -= 1
+            if error is not None:
+                overloaded = isinstance(error, httpx.TransportError)
+            else:
+                overloaded = status_code is not None and (status_code == 429 or status_code >= 500)
+                overloaded = overloaded or self._is_latency_spike(latency)
+            if overloaded:
+                self._decrease()
+            elif error is None:
+                self._increase()
+            self._cond.notify_all()
+
+    def _is_latency_spike(self, latency: float) -> bool:
+        baseline = self._baseline
+        if baseline is None:
+            self._baseline = latency
+            return False
+        if latency > baseline * self.latency_tolerance and latency - baseline > 0.05:
+            return True
+        # Slow EWMA so the baseline follows the server without chasing spikes.
+        self._baseline = baseline + 0.1 * (latency - baseline)
+        return False
+
+    def _increase(self) -> None:
+        self._healthy_in_window += 1
+        if self._healthy_in_window >= int(self._limit) and self._limit < self.max_limit:
+            self._limit += 1
+            self._healthy_in_window = 0
+            self._increases += 1
+
+    def _decrease(self) -> None:
+        self._healthy_in_window = 0
+        now = self._clock()
+        if now - self._last_decrease < self.decrease_cooldown:
+            return
+        new_limit = max(float(self.min_limit), self._limit * self.decrease_factor)
+        if new_limit < self._limit:
+            log.info("TaskTracker in-flight limit lowered %s -> %s", int(self._limit), int(new_limit))
+            self._limit = new_limit
+            self._decreases += 1
+        self._last_decrease = now
+
+    # --- Wrappers used by the clients ---
+
+    def call(self, send: Callable[[], httpx.Response]) -> httpx.Response:
+        """Run one HTTP attempt under the limiter."""
+        self.acquire()
+        started = self._clock()
+        try:
+            response = send()
+        except BaseException as exc:
+            self.release(self._clock() - started, error=exc)
+            raise
+        self.release(self._clock() - started, status_code=response.status_code)
+        return response
+
+    async def acall(self, send: Callable[[], Awaitable[httpx.Response]]) -> httpx.Response:
+        """Async variant of `call`."""
+        await self.aacquire()
+        started = self._clock()
+        try:
+            response = await send()
+        except BaseException as exc:
+            self.release(self._clock() - started, error=exc)
+            raise
+        self.release(self._clock() - started, status_code=response.status_code)
+        return response
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._cond:
+            return {
+                "limit": int(self._limit),
+                "min_limit": self.min_limit,
+                "max_limit": self.max_limit,
+                "in_flight": self._in_flight,
+                "rate": self._bucket.rate if self._bucket is not None else None,
+                "latency_baseline_ms": round(self._baseline * 1000, 1) if self._baseline is not None else None,
+                "increases": self._increases,
+                "decreases": self._decreases,
+                "throttled": self._throttled,
+                "wait_seconds": round(self._wait_seconds, 3),
+            }
@@ -0,0 +1,308 @@
+"""
+Pagination helpers for TaskTracker `FolderUnitsDto` responses.
+
+`get_test_cases` and `get_root_folder_units` return one page at a time. The
+iterators here follow `units.hasNext` / `units.totalElements` and fetch the
+next page in the background while the caller consumes the current one, so at
+most two pages are held in memory at any time.
+
+`fetch_all_pages` / `afetch_all_pages` read a whole folder at once: after the
+first page reports `totalElements`, the remaining pages are requested in
+parallel (bounded by `max_concurrency`) and reassembled in page order. The
+page count uses the page size the server reports (`units.pageSize`), which may
+be smaller than the one requested when the server caps it.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import math
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Iterator, List, Optional
+
+log = logging.getLogger(__name__)
+
+DEFAULT_PAGE_SIZE = 200
+DEFAULT_FETCH_CONCURRENCY = 8
+
+
+@dataclass
+class FolderFetchResult:
+    """
+    Units of every page fetched by `fetch_all_pages`, in page order.
+
+    Pages that failed are listed in `failed_pages` (page number -> error) and
+    their units are missing from `units`; all other pages are kept. The result
+    is also incomplete when fewer units than `total_elements` came back.
+    """
+
+    units: List[Dict[str, Any]] = field(default_factory=list)
+    total_elements: Optional[int] = None
+    page_size: int = DEFAULT_PAGE_SIZE
+    pages_fetched: int = 0
+    failed_pages: Dict[int, str] = field(default_factory=dict)
+
+    @property
+    def complete(self) -> bool:
+        if self.failed_pages:
+            return False
+        return self.total_elements is None or len(self.units) >= self.total_elements
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "units": self.units,
+            "total_elements": self.total_elements,
+            "page_size": self.page_size,
+            "pages_fetched": self.pages_fetched,
+            "failed_pages": {str(page): error for page, error in self.failed_pages.items()},
+            "complete": self.complete,
+        }
+
+
+def flatten_test_cases(result: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """
+    Extract the list of test case units from the `FolderUnitsDto` response.
+    """
+    units_page = result.get("units") or {}
+    content = units_page.get("content") or []
+    return [item.get("unit", item) for item in content]
+
+
+def next_page_number(result: Dict[str, Any], page: int, size: int) -> Optional[int]:
+    """
+    Return the number of the page after `page`, or None if `page` was the last one.
+
+    Uses `hasNext` when the server reports it, then `totalElements`, and finally
+    falls back to "a full page means there may be more".
+    """
+    units_page = result.get("units") or {}
+    if not units_page.get("content"):
+        return None
+    has_next = units_page.get("hasNext")
+    if has_next is not None:
+        return page + 1 if has_next else None
+    size = served_page_size(result, size)
+    total = units_page.get("totalElements")
+    if total is not None:
+        return page + 1 if (page + 1) * size < total else None
+    return page + 1 if len(units_page["content"]) >= size else None
+
+
+def served_page_size(result: Dict[str, Any], requested: int) -> int:
+    """
+    Page size the server actually used: `units.pageSize` when reported, else
+    the length of a short page that is not the last one, else `requested`.
+    """
+    units_page = result.get("units") or {}
+    reported = units_page.get("pageSize")
+    if isinstance(reported, int) and reported > 0:
+        return reported
+    content = units_page.get("content") or []
+    total = units_page.get("totalElements")
+    if content and len(content) < requested and total is not None and total > len(content):
+        return len(content)
+    return requested
+
+
+def iter_pages(
+    fetch_page: Callable[[int], Dict[str, Any]],
+    *,
+    page_size: int = DEFAULT_PAGE_SIZE,
+    start_page: int = 0,
+    prefetch: bool = True,
+) -> Iterator[Dict[str, Any]]:
+    """
+    Yield raw `FolderUnitsDto` pages from `fetch_page(page)` until the last page.
+
+    With `prefetch=True` the next page is requested on a background thread as
+    soon as the current page is known to have a successor.
+    """
+    if not prefetch:
+        page: Optional[int] = start_page
+        while page is not None:
+            result = fetch_page(page)
+            yield result
+            page = next_page_number(result, page, page_size)
+        return
+
+    executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="tasktracker-prefetch")
+    try:
+        page = start_page
+        future = executor.submit(fetch_page, page)
+        while future is not None:
+            result = future.result()
+            following = next_page_number(result, page, page_size)
+            future = executor.submit(fetch_page, following) if following is not None else None
+            yield result
+            page = following if following is not None else page
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+def iter_units(
+    fetch_page: Callable[[int], Dict[str, Any]],
+    *,
+    page_size: int = DEFAULT_PAGE_SIZE,
+    prefetch: bool = True,
+) -> Iterator[Dict[str, Any]]:
+    """Yield flattened units across all pages (see `flatten_test_cases`)."""
+    for result in iter_pages(fetch_page, page_size=page_size, prefetch=prefetch):
+        yield from flatten_test_cases(result)
+
+
+async def aiter_pages(
+    fetch_page: Callable[[int], Awaitable[Dict[str, Any]]],
+    *,
+    page_size: int = DEFAULT_PAGE_SIZE,
+    start_page: int = 0,
+    prefetch: bool = True,
+) -> AsyncIterator[Dict[str, Any]]:
+    """Async variant of `iter_pages`; the next page is prefetched as an asyncio task."""
+    page = start_page
+    pending: Optional[asyncio.Task[Dict[str, Any]]] = None
+    try:
+        result = await fetch_page(page)
+        while True:
+            following = next_page_number(result, page, page_size)
+            if following is not None and prefetch:
+                pending = asyncio.ensure_future(fetch_page(following))
+            yield result
+            if following is None:
+                return
+            if pending is not None:
+                result, pending = await pending, None
+            else:
+                result = await fetch_page(following)
+            page = following
+    finally:
+        if pending is not None:
+            pending.cancel()
+
+
+async def aiter_units(
+    fetch_page: Callable[[int], Awaitable[Dict[str, Any]]],
+    *,
+    page_size: int = DEFAULT_PAGE_SIZE,
+    prefetch: bool = True,
+) -> AsyncIterator[Dict[str, Any]]:
+    """Async variant of `iter_units`."""
+    async for result in aiter_pages(fetch_page, page_size=page_size, prefetch=prefetch):
+        for unit in flatten_test_cases(result):
+            yield unit
+
+
+def _page_count(first: Dict[str, Any], page_size: int) -> Optional[int]:
+    total = (first.get("units") or {}).get("totalElements")
+    if total is None:
+        return None
+    return max(1, math.ceil(total / served_page_size(first, page_size)))
+
+
+def _describe_error(exc: BaseException) -> str:
+    return f"{type(exc).__name__}: {exc}"
+
+
+def _assemble(
+    first: Dict[str, Any],
+    pages: Dict[int, Dict[str, Any]],
+    failed: Dict[int, str],
+    page_size: int,
+) -> FolderFetchResult:
+    result = FolderFetchResult(
+        total_elements=(first.get("units") or {}).get("totalElements"),
+        page_size=served_page_size(first, page_size),
+        pages_fetched=len(pages),
+        failed_pages=dict(sorted(failed.items())),
+    )
+    for page in sorted(pages):
+        result.units.extend(flatten_test_cases(pages[page]))
+    if failed:
+        log.warning("fetch_all_pages: %s page(s) failed: %s", len(failed), sorted(failed))
+    elif not result.complete:
+        log.warning(
+            "fetch_all_pages: got %s of %s units (page size %s)",
+            len(result.units),
+            result.total_elements,
+            result.page_size,
+        )
+    return result
+
+
+def fetch_all_pages(
+    fetch_page: Callable[[int], Dict[str, Any]],
+    *,
+    page_size: int = DEFAULT_PAGE_SIZE,
+    max_concurrency: int = DEFAULT_FETCH_CONCURRENCY,
+) -> FolderFetchResult:
+    """
+    Fetch every page and return all units in order.
+
+    The first page is fetched alone (its failure is raised). If it reports
+    `totalElements`, the remaining pages are fetched on up to `max_concurrency`
+    threads; otherwise pages are followed one by one via `hasNext`. A failing
+    page is recorded in `failed_pages` without dropping the others.
+    """
+    first = fetch_page(0)
+    pages: Dict[int, Dict[str, Any]] = {0: first}
+    failed: Dict[int, str] = {}
+    count = _page_count(first, page_size)
+
+    if count is None:
+        page: Optional[int] = next_page_number(first, 0, page_size)
+        while page is not None:
+            try:
+                pages[page] = fetch_page(page)
+            except Exception as exc:
+                failed[page] = _describe_error(exc)
+                break
+            page = next_page_number(pages[page], page, page_size)
+        return _assemble(first, pages, failed, page_size)
+
+    remaining = range(1, count)
+    if remaining:
+        workers = max(1, min(max_concurrency, len(remaining)))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="tasktracker-fanout") as executor:
+            futures = {page: executor.submit(fetch_page, page) for page in remaining}
+            for page, future in futures.items():
+                try:
+                    pages[page] = future.result()
+                except Exception as exc:
+                    failed[page] = _describe_error(exc)
+    return _assemble(first, pages, failed, page_size)
+
+
+async def afetch_all_pages(
+    fetch_page: Callable[[int], Awaitable[Dict[str, Any]]],
+    *,
+    page_size: int = DEFAULT_PAGE_SIZE,
+    max_concurrency: int = DEFAULT_FETCH_CONCURRENCY,
+) -> FolderFetchResult:
+    """Async variant of `fetch_all_pages`; fan-out is bounded by an asyncio semaphore."""
+    first = await fetch_page(0)
+    pages: Dict[int, Dict[str, Any]] = {0: first}
+    failed: Dict[int, str] = {}
+    count = _page_count(first, page_size)
+
+    if count is None:
+        page: Optional[int] = next_page_number(first, 0, page_size)
+        while page is not None:
+            try:
+                pages[page] = await fetch_page(page)
+            except Exception as exc:
+                failed[page] = _describe_error(exc)
+                break
+            page = next_page_number(pages[page], page, page_size)
+        return _assemble(first, pages, failed, page_size)
+
+    semaphore = asyncio.Semaphore(max(1, max_concurrency))
+
+    async def _fetch(page: int) -> None:
+        async with semaphore:
+            try:
+                pages[page] = await fetch_page(page)
+            except Exception as exc:
+                failed[page] = _describe_error(exc)
+
+    await asyncio.gather(*(_fetch(page) for page in range(1, count)))
+    return _assemble(first, pages, failed, page_size)
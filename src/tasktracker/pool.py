@@ -0,0 +1,329 @@
+"""
+Process-wide shared TaskTracker client.
+
+Every `TaskTrackerClient` owns an httpx connection pool, so building one per
+tool call means a new TCP/TLS handshake per request and leaked sockets. The
+tool wrappers in `tools.py` use `get_shared_client()` instead: one client per
+process, rebuilt only when the TaskTracker settings in the environment change
+and closed on interpreter shutdown. A client replaced after a settings change
+may still be in use by other threads, so it is retired rather than closed and
+its connections are released at exit too.
+
+`get_shared_async_client()` does the same for `AsyncTaskTrackerClient`. An
+`httpx.AsyncClient` cannot be shared across event loops, so the async client
+is also rebuilt when it is requested from a different running loop.
+
+Both clients share one `UnitCache` (see `get_shared_unit_cache()`), which is
+cleared whenever the settings change so units from another server or another
+identity are never served. They also share one `Resilience` (retry policy and
+per-endpoint circuit breakers), so a TaskTracker outage seen by one client
+fails fast in the other, and one `AdaptiveLimiter`, so the request rate and
+in-flight cap hold across threads, event loops and concurrent tool calls.
+"""
+from __future__ import annotations
+
+import asyncio
+import atexit
+import logging
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+from src.config import (
+    get_tasktracker_breaker_failure_threshold,
+    get_tasktracker_breaker_reset_timeout,
+    get_tasktracker_max_in_flight,
+    get_tasktracker_min_in_flight,
+    get_tasktracker_rate_burst,
+    get_tasktracker_rate_limit,
+    get_tasktracker_retry_base_delay,
+    get_tasktracker_retry_max_attempts,
+    get_tasktracker_retry_max_delay,
+    get_tasktracker_step_ledger_size,
+    get_tasktracker_step_ledger_ttl,
+    get_tasktracker_unit_cache_size,
+    get_tasktracker_unit_cache_ttl,
+)
+from src.tasktracker.async_client import AsyncTaskTrackerClient
+from src.tasktracker.cache import UnitCache
+from src.tasktracker.client import TaskTrackerClient, client_settings_from_env
+from src.tasktracker.limiter import AdaptiveLimiter
+from src.tasktracker.resilience import Resilience, RetryPolicy
+from src.tasktracker.step_ledger import StepLedger
+
+log = logging.getLogger(__name__)
+
+_LOCK = threading.Lock()
+_CLIENT: Optional[TaskTrackerClient] = None
+_CLIENT_KEY: Optional[Tuple[Any, ...]] = None
+# Clients replaced after a settings change; closed at exit, not while in use.
+_RETIRED_CLIENTS: List[TaskTrackerClient] = []
+_ASYNC_CLIENT: Optional[AsyncTaskTrackerClient] = None
+_ASYNC_CLIENT_KEY: Optional[Tuple[Any, ...]] = None
+_ASYNC_CLIENT_LOOP: Optional[asyncio.AbstractEventLoop] = None
+_UNIT_CACHE: Optional[UnitCache] = None
+_UNIT_CACHE_KEY: Optional[Tuple[Any, ...]] = None
+_RESILIENCE: Optional[Resilience] = None
+_RESILIENCE_KEY: Optional[Tuple[Any, ...]] = None
+_LIMITER: Optional[AdaptiveLimiter] = None
+_LIMITER_KEY: Optional[Tuple[Any, ...]] = None
+_STEP_LEDGER: Optional[StepLedger] = None
+_STEP_LEDGER_KEY: Optional[Tuple[Any, ...]] = None
+
+
+def _settings_key(settings: Dict[str, Any]) -> Tuple[Any, ...]:
+    return tuple(sorted(settings.items()))
+
+
+def _unit_cache_for(key: Tuple[Any, ...]) -> Optional[UnitCache]:
+    """Return the shared unit cache for `key`, clearing it if settings changed. Caller holds `_LOCK`."""
+    global _UNIT_CACHE, _UNIT_CACHE_KEY
+
+    size = get_tasktracker_unit_cache_size()
+    if size <= 0:
+        _UNIT_CACHE = None
+        _UNIT_CACHE_KEY = None
+        return None
+    ttl = get_tasktracker_unit_cache_ttl()
+    if _UNIT_CACHE is None or (_UNIT_CACHE.max_entries, _UNIT_CACHE.ttl) != (size, ttl):
+        _UNIT_CACHE = UnitCache(max_entries=size, ttl=ttl)
+    elif _UNIT_CACHE_KEY != key:
+        _UNIT_CACHE.clear()
+    _UNIT_CACHE_KEY = key
+    return _UNIT_CACHE
+
+
+def _resilience_for(key: Tuple[Any, ...]) -> Resilience:
+    """Return the shared retry/breaker layer, rebuilt when its settings or the client settings change. Caller holds `_LOCK`."""
+    global _RESILIENCE, _RESILIENCE_KEY
+
+    policy = RetryPolicy(
+        max_attempts=max(1, get_tasktracker_retry_max_attempts()),
+        base_delay=get_tasktracker_retry_base_delay(),
+        max_delay=get_tasktracker_retry_max_delay(),
+    )
+    threshold = get_tasktracker_breaker_failure_threshold()
+    reset_timeout = get_tasktracker_breaker_reset_timeout()
+    resilience_key = (key, policy.max_attempts, policy.base_delay, policy.max_delay, threshold, reset_timeout)
+    if _RESILIENCE is None or _RESILIENCE_KEY != resilience_key:
+        _RESILIENCE = Resilience(policy, failure_threshold=threshold, reset_timeout=reset_timeout)
+        _RESILIENCE_KEY = resilience_key
+    return _RESILIENCE
+
+
+def _limiter_for(key: Tuple[Any, ...]) -> Optional[AdaptiveLimiter]:
+    """Return the shared adaptive limiter (None when disabled), rebuilt on settings change. Caller holds `_LOCK`."""
+    global _LIMITER, _LIMITER_KEY
+
+    max_limit = get_tasktracker_max_in_flight()
+    if max_limit <= 0:
+        _LIMITER = None
+        _LIMITER_KEY = None
+        return None
+    min_limit = get_tasktracker_min_in_flight()
+    rate = get_tasktracker_rate_limit()
+    burst = get_tasktracker_rate_burst()
+    limiter_key = (key, min_limit, max_limit, rate, burst)
+    if _LIMITER is None or _LIMITER_KEY != limiter_key:
+        _LIMITER = AdaptiveLimiter(
+            rate=rate,
+            burst=burst,
+            initial_limit=max(min_limit, max_limit // 2),
+            min_limit=min_limit,
+            max_limit=max_limit,
+        )
+        _LIMITER_KEY = limiter_key
+    return _LIMITER
+
+
+def _step_ledger_for(key: Tuple[Any, ...]) -> Optional[StepLedger]:
+    """Return the shared step ledger for `key`, clearing it if settings changed. Caller holds `_LOCK`."""
+    global _STEP_LEDGER, _STEP_LEDGER_KEY
+
+    size = get_tasktracker_step_ledger_size()
+    ttl = get_tasktracker_step_ledger_ttl()
+    if size <= 0 or ttl <= 0:
+        _STEP_LEDGER = None
+        _STEP_LEDGER_KEY = None
+        return None
+    if _STEP_LEDGER is None or (_STEP_LEDGER.max_entries, _STEP_LEDGER.ttl) != (size, ttl):
+        _STEP_LEDGER = StepLedger(max_entries=size, ttl=ttl)
+    elif _STEP_LEDGER_KEY != key:
+        _STEP_LEDGER.clear()
+    _STEP_LEDGER_KEY = key
+    return _STEP_LEDGER
+
+
+def get_shared_step_ledger() -> Optional[StepLedger]:
+    """
+    Return the process-wide step ledger used by `update_test_case_from_steps`
+    (None when disabled). Cleared when the TaskTracker settings change.
+    """
+    key = _settings_key(client_settings_from_env())
+    with _LOCK:
+        return _step_ledger_for(key)
+
+
+def get_shared_unit_cache() -> Optional[UnitCache]:
+    """Return the unit cache shared by the pooled clients (None when disabled or not built yet)."""
+    return _UNIT_CACHE
+
+
+def get_shared_client() -> TaskTrackerClient:
+    """
+    Return the process-wide TaskTracker client, creating it on first use.
+
+    Thread-safe. If the TaskTracker settings (base URL, auth, pool limits,
+    HTTP/2) differ from the ones the current client was built with, a new
+    client is created; the old one is retired and closed at exit, since other
+    threads may still be sending requests through it.
+    """
+    global _CLIENT, _CLIENT_KEY
+
+    settings = client_settings_from_env()
+    key = _settings_key(settings)
+    with _LOCK:
+        cache = _unit_cache_for(key)
+        resilience = _resilience_for(key)
+        limiter = _limiter_for(key)
+        if (
+            _CLIENT is not None
+            and _CLIENT_KEY == key
+            and _CLIENT.unit_cache is cache
+            and _CLIENT.resilience is resilience
+            and _CLIENT.limiter is limiter
+        ):
+            return _CLIENT
+        stale = _CLIENT
+        if stale is not None:
+            _RETIRED_CLIENTS.append(stale)
+        _CLIENT = TaskTrackerClient(
+            **settings,
+            unit_cache=cache,
+            resilience=resilience,
+            limiter=limiter,
+        )
+        _CLIENT_KEY = key
+        client = _CLIENT
+    if stale is not None:
+        log.info("TaskTracker settings changed; rebuilding shared client for %s", client.base_url)
+    return client
+
+
+def get_shared_async_client() -> AsyncTaskTrackerClient:
+    """
+    Return the shared async TaskTracker client for the running event loop.
+
+    Must be called from a coroutine. The client is rebuilt when settings change
+    or when called from a different loop than the one it was created on; the
+    previous client is closed on its own loop if that loop is still running.
+    """
+    global _ASYNC_CLIENT, _ASYNC_CLIENT_KEY, _ASYNC_CLIENT_LOOP
+
+    loop = asyncio.get_running_loop()
+    settings = client_settings_from_env()
+    key = _settings_key(settings)
+    with _LOCK:
+        cache = _unit_cache_for(key)
+        resilience = _resilience_for(key)
+        limiter = _limiter_for(key)
+        if (
+            _ASYNC_CLIENT is not None
+            and _ASYNC_CLIENT_KEY == key
+            and _ASYNC_CLIENT_LOOP is loop
+            and _ASYNC_CLIENT.unit_cache is cache
+            and _ASYNC_CLIENT.resilience is resilience
+            and _ASYNC_CLIENT.limiter is limiter
+        ):
+            return _ASYNC_CLIENT
+        stale, stale_loop = _ASYNC_CLIENT, _ASYNC_CLIENT_LOOP
+        _ASYNC_CLIENT = AsyncTaskTrackerClient(
+            **settings,
+            unit_cache=cache,
+            resilience=resilience,
+            limiter=limiter,
+        )
+        _ASYNC_CLIENT_KEY = key
+        _ASYNC_CLIENT_LOOP = loop
+        client = _ASYNC_CLIENT
+    if stale is not None:
+        _close_async_client(stale, stale_loop)
+    return client
+
+
+def _close_async_client(
+    client: AsyncTaskTrackerClient,
+    loop: Optional[asyncio.AbstractEventLoop],
+) -> None:
+    """Best-effort close of an async client on the loop that owns its connections."""
+    if loop is None or loop.is_closed():
+        # Connections of a finished loop cannot be closed gracefully anymore;
+        # they are released when the client is garbage-collected.
+        return
+    try:
+        running = asyncio.get_running_loop()
+    except RuntimeError:
+        running = None
+    if running is loop:
+        loop.create_task(client.aclose())
+    elif loop.is_running():
+        asyncio.run_coroutine_threadsafe(client.aclose(), loop)
+    else:
+        loop.run_until_complete(client.aclose())
+
+
+async def aclose_shared_async_client() -> None:
+    """Close the shared async client if it belongs to the running loop (call before that loop stops)."""
+    global _ASYNC_CLIENT, _ASYNC_CLIENT_KEY, _ASYNC_CLIENT_LOOP
+
+    loop = asyncio.get_running_loop()
+    with _LOCK:
+        if _ASYNC_CLIENT is None or _ASYNC_CLIENT_LOOP is not loop:
+            return
+        client = _ASYNC_CLIENT
+        _ASYNC_CLIENT = None
+        _ASYNC_CLIENT_KEY = None
+        _ASYNC_CLIENT_LOOP = None
+    await client.aclose()
+
+
+def get_client_metrics() -> Dict[str, Any]:
+    """Snapshot of counters from the shared client layer (for logging and tuning)."""
+    cache = get_shared_unit_cache()
+    resilience = _RESILIENCE
+    limiter = _LIMITER
+    ledger = _STEP_LEDGER
+    return {
+        "unit_cache": cache.stats() if cache is not None else None,
+        "resilience": resilience.stats() if resilience is not None else None,
+        "limiter": limiter.snapshot() if limiter is not None else None,
+        "step_ledger": ledger.stats() if ledger is not None else None,
+        "coalesced_reads": {
+            "sync": _CLIENT._inflight.coalesced if _CLIENT is not None else 0,
+            "async": _ASYNC_CLIENT._inflight.coalesced if _ASYNC_CLIENT is not None else 0,
+        },
+    }
+
+
+def close_shared_client() -> None:
+    """Close the shared clients (if any). Called automatically at interpreter exit."""
+    global _CLIENT, _CLIENT_KEY, _ASYNC_CLIENT, _ASYNC_CLIENT_KEY, _ASYNC_CLIENT_LOOP
+
+    with _LOCK:
+        client = _CLIENT
+        _CLIENT = None
+        _CLIENT_KEY = None
+        retired = list(_RETIRED_CLIENTS)
+        _RETIRED_CLIENTS.clear()
+        async_client, async_loop = _ASYNC_CLIENT, _ASYNC_CLIENT_LOOP
+        _ASYNC_CLIENT = None
+        _ASYNC_CLIENT_KEY = None
+        _ASYNC_CLIENT_LOOP = None
+    for stale in retired:
+        stale.close()
+    if client is not None:
+        client.close()
+    if async_client is not None:
+        _close_async_client(async_client, async_loop)
+
+
+atexit.register(close_shared_client)
@@ -0,0 +1,240 @@
+"""
+Decoder for the ProseMirror documents TaskTracker stores in rich-text fields.
+
+`/rest/api/unit/v2/{code}` returns every step field (`stepDescription`,
+`stepData`, `stepResult`) and every `wisiwig` attribute as ProseMirror JSON
+encoded as a string inside the JSON response, with editor positions
+(`from` / `to`), block ids and styling on every node. `to_plain_text` and
+`to_markdown` turn such a document (string or already decoded) into compact
+text in a single walk over the tree:
+
+- paragraphs, headings and code blocks become lines; hard breaks become
+  newlines;
+- bullet / ordered list items become lines (`- ` / `1. ` markers and nested
+  indentation in markdown);
+- in markdown, bold / italic / strike / code / link marks are kept; colour
+  and other styling marks are dropped in both forms.
+
+Both tiptap (`bulletList`) and prosemirror-schema (`bullet_list`) node names
+are understood. Input that is not a ProseMirror document is returned as-is.
+Results for JSON strings are memoized, so the empty documents TaskTracker
+stores for unused fields (and steps repeated across test cases) decode once.
+
+The other direction, `text_doc`, encodes plain text as the one-paragraph
+document we write into step fields: a precompiled template around the C
+string escaper of `json`, byte-identical to `json.dumps` of the nested dict
+and memoized as well (empty `step_data` is the most common field).
+"""
+from __future__ import annotations
+
+import json
+from functools import lru_cache
+from json.encoder import encode_basestring
+from typing import Any, Iterable, List, Mapping, Optional, Sequence, Union
+
+Doc = Union[str, Mapping[str, Any], None]
+
+_BULLET_LIST = {"bulletList", "bullet_list"}
+_ORDERED_LIST = {"orderedList", "ordered_list"}
+_CODE_BLOCK = {"codeBlock", "code_block"}
+_HARD_BREAK = {"hardBreak", "hard_break"}
+_HORIZONTAL_RULE = {"horizontalRule", "horizontal_rule"}
+_TABLE_ROW = {"tableRow", "table_row"}
+
+# Markdown delimiters for marks; `link` is handled separately.
+_MARK_DELIMITERS = {
+    "bold": "**",
+    "strong": "**",
+    "italic": "*",
+    "em": "*",
+    "strike": "~~",
+    "code": "`",
+}
+
+# Memoized (document string, markdown) -> text results, and text -> document.
+_CACHE_SIZE = 4096
+
+# `json.dumps(doc, ensure_ascii=False)` of a one-paragraph document, split around the text value.
+_TEXT_DOC_PREFIX = '{"type": "doc", "content": [{"type": "paragraph", "content": [{"type": "text", "text": '
+_TEXT_DOC_SUFFIX = "}]}]}"
+
+
+def loads_doc(value: Doc) -> Optional[Mapping[str, Any]]:
+    """The document as a dict, decoding a JSON string; None if `value` is not a ProseMirror node."""
+    if isinstance(value, str):
+        if value[:1] != "{" and not value.lstrip().startswith("{"):
+            return None
+        try:
+            value = json.loads(value)
+        except ValueError:
+            return None
+    if isinstance(value, Mapping) and isinstance(value.get("type"), str):
+        return value
+    return None
+
+
+def to_plain_text(doc: Doc) -> str:
+    """Plain text of a document: one line per block, hard breaks as newlines."""
+    return _render(doc, markdown=False)
+
+
+def to_markdown(doc: Doc) -> str:
+    """Compact markdown of a document (lists, headings, code and text marks preserved)."""
+    return _render(doc, markdown=True)
+
+
+def _render(doc: Doc, markdown: bool) -> str:
+    if isinstance(doc, str):
+        return _render_json(doc, markdown)
+    node = loads_doc(doc)
+    return "" if node is None else _render_node(node, markdown)
+
+
+@lru_cache(maxsize=_CACHE_SIZE)
+def _render_json(doc_json: str, markdown: bool) -> str:
+    node = loads_doc(doc_json)
+    return doc_json if node is None else _render_node(node, markdown)
+
+
+def _render_node(node: Mapping[str, Any], markdown: bool) -> str:
+    blocks: List[str] = []
+    _blocks(node, markdown, blocks)
+    return "\n".join(blocks)
+
+
+def _marked(text: str, marks: Sequence[Any]) -> str:
+    """Wrap `text` in markdown for its marks, keeping surrounding spaces outside the delimiters."""
+    core = text.strip()
+    if not core:
+        return text
+    href = None
+    for mark in marks:
+        if not isinstance(mark, dict):
+            continue
+        kind = mark.get("type")
+        delimiter = _MARK_DELIMITERS.get(kind)
+        if delimiter:
+            core = f"{delimiter}{core}{delimiter}"
+        elif kind == "link":
+            href = (mark.get("attrs") or {}).get("href")
+    if href:
+        core = f"[{core}]({href})"
+    start = len(text) - len(text.lstrip())
+    end = len(text.rstrip())
+    return f"{text[:start]}{core}{text[end:]}"
+
+
+def _inline(nodes: Sequence[Any], markdown: bool) -> str:
+    parts: List[str] = []
+    for node in nodes:
+        if not isinstance(node, dict):
+            continue
+        kind = node.get("type")
+        if kind == "text":
+            text = node.get("text")
+            if not text:
+                continue
+            text = str(text)
+            marks = node.get("marks")
+            parts.append(_marked(text, marks) if markdown and marks else text)
+        elif kind in _HARD_BREAK:
+            parts.append("\n")
+        elif kind == "image":
+            attrs = node.get("attrs") or {}
+            alt = attrs.get("alt") or attrs.get("title") or ""
+            parts.append(f"![{alt}]({attrs.get('src') or ''})" if markdown else alt)
+        elif kind == "mention":
+            attrs = node.get("attrs") or {}
+            parts.append(str(attrs.get("label") or attrs.get("id") or ""))
+        else:
+            parts.append(_inline(node.get("content") or (), markdown))
+    return "".join(parts)
+
+
+def _list_item_blocks(items: Sequence[Any], markdown: bool, ordered: bool, start: int, out: List[str]) -> None:
+    for index, item in enumerate(items):
+        item_blocks: List[str] = []
+        _blocks(item, markdown, item_blocks)
+        if not item_blocks:
+            continue
+        if not markdown:
+            out.extend(item_blocks)
+            continue
+        marker = f"{start + index}. " if ordered else "- "
+        indent = "\n" + " " * len(marker)
+        out.append(marker + indent.join("\n".join(item_blocks).split("\n")))
+
+
+def _blocks(node: Any, markdown: bool, out: List[str]) -> None:
+    """Append the text blocks of `node` to `out`."""
+    if not isinstance(node, dict):
+        return
+    kind = node.get("type")
+    content = node.get("content") or ()
+    if kind == "paragraph":
+        text = _inline(content, markdown)
+        if text.strip():
+            out.append(text)
+    elif kind == "heading":
+        text = _inline(content, markdown)
+        if text.strip():
+            level = (node.get("attrs") or {}).get("level") or 1
+            out.append(f"{'#' * int(level)} {text}" if markdown else text)
+    elif kind in _CODE_BLOCK:
+        text = _inline(content, False)
+        if text:
+            language = (node.get("attrs") or {}).get("language") or ""
+            out.append(f"```{language}\n{text}\n```" if markdown else text)
+    elif kind in _BULLET_LIST:
+        _list_item_blocks(content, markdown, False, 1, out)
+    elif kind in _ORDERED_LIST:
+        attrs = node.get("attrs") or {}
+        start = attrs.get("start") or attrs.get("order") or 1
+        _list_item_blocks(content, markdown, True, int(start), out)
+    elif kind == "blockquote":
+        quoted: List[str] = []
+        for child in content:
+            _blocks(child, markdown, quoted)
+        if markdown:
+            out.extend("> " + block.replace("\n", "\n> ") for block in quoted)
+        else:
+            out.extend(quoted)
+    elif kind in _TABLE_ROW:
+        cells = []
+        for cell in content:
+            cell_blocks: List[str] = []
+            _blocks(cell, markdown, cell_blocks)
+            cells.append(" ".join(" ".join(cell_blocks).split("\n")))
+        if any(cells):
+            out.append(f"| {' | '.join(cells)} |" if markdown else " | ".join(cells))
+    elif kind in _HORIZONTAL_RULE:
+        if markdown:
+            out.append("---")
+    elif kind == "text":
+        # Text directly under a block container (malformed, but seen in the wild).
+        text = _inline((node,), markdown)
+        if text.strip():
+            out.append(text)
+    else:
+        # doc, listItem, table, tableCell and unknown containers.
+        for child in content:
+            _blocks(child, markdown, out)
+
+
+# --- Encoding ---
+
+
+@lru_cache(maxsize=_CACHE_SIZE)
+def text_doc(text: str) -> str:
+    """
+    ProseMirror JSON string of `text` as a single paragraph.
+
+    Same bytes as `json.dumps({"type": "doc", "content": [{"type": "paragraph",
+    "content": [{"type": "text", "text": text}]}]}, ensure_ascii=False)`.
+    """
+    return f"{_TEXT_DOC_PREFIX}{encode_basestring(text)}{_TEXT_DOC_SUFFIX}"
+
+
+def text_docs(texts: Iterable[str]) -> List[str]:
+    """`text_doc` for many texts at once (e.g. every field of a step list)."""
+    return [text_doc(text) for text in texts]
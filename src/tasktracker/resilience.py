@@ -0,0 +1,331 @@
+"""
+Retry, backoff and circuit breaking for TaskTracker HTTP calls.
+
+A single 502 or 429 used to fail a whole single-run after minutes of LLM
+work. `Resilience` wraps each request sent by the TaskTracker clients:
+
+- transient failures are retried with exponential backoff and full jitter,
+  honouring `Retry-After` on 429/503;
+- idempotent calls (GET, read-only POST queries, full-replacement PATCH) are
+  retried on timeouts, dropped connections and 502/503/504;
+- mutating calls that are not idempotent (create) are retried only when the
+  request provably never reached the application: connection failures and 429;
+- a per-endpoint circuit breaker fails fast with `CircuitOpenError` while
+  TaskTracker is down, letting one probe through after `reset_timeout`.
+
+Retry counts and breaker states are exposed through `stats()`.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import random
+import threading
+import time
+from dataclasses import dataclass
+from email.utils import parsedate_to_datetime
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+import httpx
+
+log = logging.getLogger(__name__)
+
+RETRYABLE_STATUS_IDEMPOTENT = frozenset({429, 502, 503, 504})
+RETRYABLE_STATUS_UNSAFE = frozenset({429})
+
+# Errors raised before the request was written to the wire: safe to retry any call.
+_NOT_SENT_ERRORS = (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout)
+
+
+def _retryable_statuses(idempotent: bool) -> frozenset:
+    return RETRYABLE_STATUS_IDEMPOTENT if idempotent else RETRYABLE_STATUS_UNSAFE
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised instead of sending a request while the endpoint's circuit is open."""
+
+
+@dataclass
+class RetryPolicy:
+    """Exponential backoff with full jitter: sleep ~ U(0, min(max_delay, base_delay * 2**attempt))."""
+
+    max_attempts: int = 4
+    base_delay: float = 0.5
+    max_delay: float = 30.0
+    max_retry_after: float = 120.0
+
+    def backoff(self, attempt: int) -> float:
+        return random.uniform(0, min(self.max_delay, self.base_delay * (2 ** attempt)))
+
+
+def retry_after_seconds(response: httpx.Response) -> Optional[float]:
+    """Parse `Retry-After` (delta-seconds or HTTP-date); None if absent or invalid."""
+    value = response.headers.get("retry-after")
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, when.timestamp() - time.time())
+
+
+class CircuitBreaker:
+    """
+    Classic closed / open / half-open breaker.
+
+    Opens after `failure_threshold` consecutive failures (transport errors or
+    5xx). While open, calls fail fast; after `reset_timeout` seconds a single
+    probe is let through and its outcome closes or re-opens the circuit.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int = 5,
+        reset_timeout: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+        self.times_opened = 0
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._current_state()
+
+    def _current_state(self) -> str:
+        if self._state == self.OPEN and self._clock() - self._opened_at >= self.reset_timeout:
+            self._state = self.HALF_OPEN
+            self._probe_in_flight = False
+        return self._state
+
+    def before_call(self) -> None:
+        """Raise `CircuitOpenError` unless a request may be sent now."""
+        with self._lock:
+            state = self._current_state()
+            if state == self.CLOSED:
+                return
+            if state == self.HALF_OPEN and not self._probe_in_flight:
+                self._probe_in_flight = True
+                return
+            remaining = max(0.0, self.reset_timeout - (self._clock() - self._opened_at))
+        raise CircuitOpenError(
+            f"TaskTracker circuit for {self.name!r} is open after repeated failures; "
+            f"retry in {remaining:.0f}s."
+        )
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._state = self.CLOSED
+            self._failures = 0
+            self._probe_in_flight = False
+
+    def release_probe(self) -> None:
+        """Give up a half-open probe that ended without an outcome (e.g. cancelled)."""
+        with self._lock:
+            self._probe_in_flight = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            if self._state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+                if self._state != self.OPEN:
+                    self.times_opened += 1
+                    log.warning(
+                        "TaskTracker circuit %r opened after %s consecutive failure(s)",
+                        self.name,
+                        self._failures,
+                    )
+                self._state = self.OPEN
+                self._opened_at = self._clock()
+                self._probe_in_flight = False
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "state": self._current_state(),
+                "consecutive_failures": self._failures,
+                "times_opened": self.times_opened,
+            }
+
+
+class Resilience:
+    """Retry policy plus one circuit breaker per endpoint, shared by all clients."""
+
+    def __init__(
+        self,
+        policy: Optional[RetryPolicy] = None,
+        failure_threshold: int = 5,
+        reset_timeout: float = 30.0,
+    ) -> None:
+        self.policy = policy or RetryPolicy()
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._lock = threading.Lock()
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._retries: Dict[str, int] = {}
+        self._gave_up: Dict[str, int] = {}
+
+    def breaker(self, endpoint: str) -> CircuitBreaker:
+        with self._lock:
+            breaker = self._breakers.get(endpoint)
+            if breaker is None:
+                breaker = CircuitBreaker(
+                    endpoint,
+                    failure_threshold=self.failure_threshold,
+                    reset_timeout=self.reset_timeout,
+                )
+                self._breakers[endpoint] = breaker
+            return breaker
+
+    def _count(self, bucket: Dict[str, int], endpoint: str) -> None:
+        with self._lock:
+            bucket[endpoint] = bucket.get(endpoint, 0) + 1
+
+    def _delay_after_error(self, exc: Exception, attempt: int, idempotent: bool) -> Optional[float]:
+        if attempt + 1 >= self.policy.max_attempts:
+            return None
+        if isinstance(exc, _NOT_SENT_ERRORS):
+            return self.policy.backoff(attempt)
+        if idempotent and isinstance(exc, httpx.TransportError):
+            return self.policy.backoff(attempt)
+        return None
+
+    def _delay_after_response(
+        self,
+        response: httpx.Response,
+        attempt: int,
+        idempotent: bool,
+    ) -> Optional[float]:
+        if response.status_code not in _retryable_statuses(idempotent) or attempt + 1 >= self.policy.max_attempts:
+            return None
+        retry_after = retry_after_seconds(response)
+        if retry_after is None:
+            return self.policy.backoff(attempt)
+        if retry_after > self.policy.max_retry_after:
+            return None
+        return retry_after
+
+    def _record_response(self, breaker: CircuitBreaker, response: httpx.Response) -> None:
+        if response.status_code >= 500:
+            breaker.record_failure()
+        else:
+            breaker.record_success()
+
+    def _before_retry(self, endpoint: str, attempt: int, delay: float, reason: str) -> None:
+        self._count(self._retries, endpoint)
+        log.warning(
+            "TaskTracker %s failed (%s); retry %s/%s in %.2fs",
+            endpoint,
+            reason,
+            attempt + 1,
+            self.policy.max_attempts - 1,
+            delay,
+        )
+
+    def call(
+        self,
+        endpoint: str,
+        send: Callable[[], httpx.Response],
+        *,
+        idempotent: bool,
+    ) -> httpx.Response:
+        """Run `send()` with retries and circuit breaking; returns the final response."""
+        breaker = self.breaker(endpoint)
+        attempt = 0
+        while True:
+            breaker.before_call()
+            try:
+                response = send()
+            except Exception as exc:
+                breaker.record_failure()
+                delay = self._delay_after_error(exc, attempt, idempotent)
+                if delay is None:
+                    self._count(self._gave_up, endpoint)
+                    raise
+                reason = type(exc).__name__
+            except BaseException:
+                # Cancelled or interrupted: no verdict on the endpoint, but a
+                # half-open probe must not keep its slot.
+                breaker.release_probe()
+                raise
+            else:
+                self._record_response(breaker, response)
+                delay = self._delay_after_response(response, attempt, idempotent)
+                if delay is None:
+                    if response.status_code in _retryable_statuses(idempotent):
+                        self._count(self._gave_up, endpoint)
+                    return response
+                reason = f"HTTP {response.status_code}"
+                response.close()
+            self._before_retry(endpoint, attempt, delay, reason)
+            time.sleep(delay)
+            attempt += 1
+
+    async def acall(
+        self,
+        endpoint: str,
+        send: Callable[[], Awaitable[httpx.Response]],
+        *,
+        idempotent: bool,
+    ) -> httpx.Response:
+        """Async variant of `call`."""
+        breaker = self.breaker(endpoint)
+        attempt = 0
+        while True:
+            breaker.before_call()
+            try:
+                response = await send()
+            except Exception as exc:
+                breaker.record_failure()
+                delay = self._delay_after_error(exc, attempt, idempotent)
+                if delay is None:
+                    self._count(self._gave_up, endpoint)
+                    raise
+                reason = type(exc).__name__
+            except BaseException:
+                # Cancelled or interrupted: no verdict on the endpoint, but a
+                # half-open probe must not keep its slot.
+                breaker.release_probe()
+                raise
+            else:
+                self._record_response(breaker, response)
+                delay = self._delay_after_response(response, attempt, idempotent)
+                if delay is None:
+                    if response.status_code in _retryable_statuses(idempotent):
+                        self._count(self._gave_up, endpoint)
+                    return response
+                reason = f"HTTP {response.status_code}"
+                await response.aclose()
+            self._before_retry(endpoint, attempt, delay, reason)
+            await asyncio.sleep(delay)
+            attempt += 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            breakers = dict(self._breakers)
+            retries = dict(self._retries)
+            gave_up = dict(self._gave_up)
+        return {
+            "retries": retries,
+            "gave_up": gave_up,
+            "breakers": {name: breaker.snapshot() for name, breaker in breakers.items()},
+        }
@@ -0,0 +1,106 @@
+"""
+Coalescing of identical in-flight TaskTracker reads ("single-flight").
+
+Parallel agent threads and parallel tool calls often ask for the same page
+of a folder or the same unit at the same moment. The clients route reads
+through `SingleFlight` / `AsyncSingleFlight`: the first caller for a key
+sends the request, later callers with the same key wait for it and receive
+the same `httpx.Response`. Responses are fully read before they are shared,
+so every caller decodes its own copy with `.json()`.
+
+Only reads are coalesced (GET and read-only POST queries); the key covers
+method, path, canonical JSON body and request headers.
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+import threading
+from typing import Any, Awaitable, Callable, Dict, Hashable, Mapping, Optional, Tuple
+
+import httpx
+
+
+def request_key(
+    method: str,
+    path: str,
+    body: Any = None,
+    headers: Optional[Mapping[str, str]] = None,
+) -> Tuple[Hashable, ...]:
+    """Key identifying identical requests; the JSON body is canonicalised (sorted keys)."""
+    canonical = json.dumps(body, sort_keys=True, separators=(",", ":"), ensure_ascii=False) if body is not None else None
+    header_items = tuple(sorted((k.lower(), v) for k, v in headers.items())) if headers else ()
+    return (method.upper(), path, canonical, header_items)
+
+
+class _Call:
+    __slots__ = ("done", "response", "error")
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.response: Optional[httpx.Response] = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """Thread-safe coalescing of identical blocking requests."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, _Call] = {}
+        self.coalesced = 0
+
+    def do(self, key: Hashable, send: Callable[[], httpx.Response]) -> httpx.Response:
+        """Run `send()` unless an identical request is in flight; then share its outcome."""
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+            else:
+                self.coalesced += 1
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.response
+        try:
+            call.response = send()
+            return call.response
+        except BaseException as exc:
+            call.error = exc
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+            call.done.set()
+
+
+class AsyncSingleFlight:
+    """
+    Coalescing for one event loop.
+
+    The shared request runs as its own task, so a caller that is cancelled
+    does not cancel the request for the others.
+    """
+
+    def __init__(self) -> None:
+        self._tasks: Dict[Hashable, "asyncio.Task[httpx.Response]"] = {}
+        self.coalesced = 0
+
+    async def do(self, key: Hashable, send: Callable[[], Awaitable[httpx.Response]]) -> httpx.Response:
+        task = self._tasks.get(key)
+        if task is None:
+            task = asyncio.ensure_future(send())
+            self._tasks[key] = task
+            task.add_done_callback(lambda _t, key=key: self._forget(key, _t))
+        else:
+            self.coalesced += 1
+        return await asyncio.shield(task)
+
+    def _forget(self, key: Hashable, task: "asyncio.Task[httpx.Response]") -> None:
+        if self._tasks.get(key) is task:
+            del self._tasks[key]
+        if not task.cancelled():
+            # Mark the exception as retrieved even if every waiter was cancelled.
+            task.exception()
@@ -0,0 +1,165 @@
+"""
+Content-based alignment of new steps to the existing steps of a test case.
+
+`build_patch_steps` used to reuse step codes by position, so inserting one
+step at the top moved every following step under a neighbour's code and
+TaskTracker recorded the whole list as changed. `align_steps` instead
+matches steps by content:
+
+1. exact matches in order: longest common subsequence over the normalized
+   plain-text triples (common prefix/suffix trimmed first, so the usual
+   "append" / "insert one" edits cost almost nothing);
+2. exact matches out of order (a step that was moved);
+3. fuzzy matches between neighbouring anchors: for steps that were only
+   reworded, pairs with a `difflib` similarity of at least `fuzzy_threshold`.
+
+Every existing step is matched at most once; unmatched new steps get new codes.
+"""
+from __future__ import annotations
+
+from bisect import bisect_left
+from difflib import SequenceMatcher
+from typing import Dict, List, Optional, Sequence, Tuple
+
+StepTriple = Tuple[str, str, str]
+
+DEFAULT_FUZZY_THRESHOLD = 0.6
+
+# Above this many candidate pairs in one gap, fuzzy matching only considers
+# pairs at the same offset within the gap, to stay fast on huge rewrites.
+_MAX_FUZZY_PAIRS = 4096
+
+
+def _key(triple: StepTriple) -> str:
+    return "\x1f".join(" ".join(part.split()).casefold() for part in triple)
+
+
+def _lcs_pairs(old: Sequence[int], new: Sequence[int]) -> List[Tuple[int, int]]:
+    """
+    Index pairs of a longest common subsequence of two int sequences.
+
+    Hunt–Szymanski: the LCS is the longest strictly increasing chain of
+    matching positions, found with patience sorting in O(r log n) for r
+    matching pairs (r ~ n when steps are mostly distinct).
+    """
+    positions: Dict[int, List[int]] = {}
+    for j, value in enumerate(new):
+        positions.setdefault(value, []).append(j)
+    tails: List[int] = []  # tails[k]: smallest `j` ending a chain of length k + 1
+    tail_nodes: List[int] = []
+    nodes: List[Tuple[int, int, int]] = []  # (i, j, previous node or -1)
+    for i, value in enumerate(old):
+        # Descending `j` so one `i` never extends its own chain.
+        for j in reversed(positions.get(value, ())):
+            k = bisect_left(tails, j)
+            nodes.append((i, j, tail_nodes[k - 1] if k else -1))
+            if k == len(tails):
+                tails.append(j)
+                tail_nodes.append(len(nodes) - 1)
+            else:
+                tails[k] = j
+                tail_nodes[k] = len(nodes) - 1
+    pairs: List[Tuple[int, int]] = []
+    node = tail_nodes[-1] if tail_nodes else -1
+    while node != -1:
+        i, j, node = nodes[node]
+        pairs.append((i, j))
+    pairs.reverse()
+    return pairs
+
+
+def _exact_in_order(old_ids: Sequence[int], new_ids: Sequence[int]) -> List[Tuple[int, int]]:
+    n, m = len(old_ids), len(new_ids)
+    prefix = 0
+    while prefix < n and prefix < m and old_ids[prefix] == new_ids[prefix]:
+        prefix += 1
+    suffix = 0
+    while (
+        suffix < n - prefix
+        and suffix < m - prefix
+        and old_ids[n - 1 - suffix] == new_ids[m - 1 - suffix]
+    ):
+        suffix += 1
+    pairs = [(k, k) for k in range(prefix)]
+    middle = _lcs_pairs(old_ids[prefix:n - suffix], new_ids[prefix:m - suffix])
+    pairs.extend((i + prefix, j + prefix) for i, j in middle)
+    pairs.extend((n - suffix + k, m - suffix + k) for k in range(suffix))
+    return pairs
+
+
+def _fuzzy_in_gaps(
+    old_keys: Sequence[str],
+    new_keys: Sequence[str],
+    matches: List[Optional[int]],
+    threshold: float,
+) -> None:
+    """Pair unmatched steps that lie between the same two anchors by similarity."""
+    used = {i for i in matches if i is not None}
+    anchors = sorted((i, j) for j, i in enumerate(matches) if i is not None)
+    bounds = [(-1, -1)] + anchors + [(len(old_keys), len(new_keys))]
+    for (old_lo, new_lo), (old_hi, new_hi) in zip(bounds, bounds[1:]):
+        old_gap = [i for i in range(old_lo + 1, old_hi) if i not in used]
+        new_gap = [j for j in range(new_lo + 1, new_hi) if matches[j] is None]
+        if not old_gap or not new_gap:
+            continue
+        if len(old_gap) * len(new_gap) > _MAX_FUZZY_PAIRS:
+            candidates = list(zip(old_gap, new_gap))
+        else:
+            candidates = [(i, j) for j in new_gap for i in old_gap]
+        scored: List[Tuple[float, int, int]] = []
+        matcher = SequenceMatcher(autojunk=False)
+        for i, j in candidates:
+            matcher.set_seqs(old_keys[i], new_keys[j])
+            if matcher.real_quick_ratio() < threshold or matcher.quick_ratio() < threshold:
+                continue
+            ratio = matcher.ratio()
+            if ratio >= threshold:
+                scored.append((ratio, i, j))
+        # Best pairs first; ties prefer the earlier positions.
+        scored.sort(key=lambda item: (-item[0], item[2], item[1]))
+        for _, i, j in scored:
+            if i in used or matches[j] is not None:
+                continue
+            matches[j] = i
+            used.add(i)
+
+
+def align_steps(
+    existing: Sequence[StepTriple],
+    new: Sequence[StepTriple],
+    *,
+    fuzzy_threshold: float = DEFAULT_FUZZY_THRESHOLD,
+) -> List[Optional[int]]:
+    """
+    For each new step, the index of the existing step it continues, or None.
+
+    Steps are `(description, data, result)` plain-text triples; comparison
+    ignores case and whitespace differences.
+    """
+    if not existing:
+        # New test case: nothing to align against.
+        return [None] * len(new)
+    old_keys = [_key(triple) for triple in existing]
+    new_keys = [_key(triple) for triple in new]
+    ids: Dict[str, int] = {}
+    old_ids = [ids.setdefault(key, len(ids)) for key in old_keys]
+    new_ids = [ids.setdefault(key, len(ids)) for key in new_keys]
+
+    matches: List[Optional[int]] = [None] * len(new_keys)
+    for i, j in _exact_in_order(old_ids, new_ids):
+        matches[j] = i
+
+    # Moved steps: identical content matched out of order.
+    if None in matches:
+        used = {i for i in matches if i is not None}
+        free: Dict[int, List[int]] = {}
+        for i, key_id in enumerate(old_ids):
+            if i not in used:
+                free.setdefault(key_id, []).append(i)
+        for j, key_id in enumerate(new_ids):
+            if matches[j] is None and free.get(key_id):
+                matches[j] = free[key_id].pop(0)
+
+    if None in matches and fuzzy_threshold < 1.0:
+        _fuzzy_in_gaps(old_keys, new_keys, matches, fuzzy_threshold)
+    return matches
@@ -0,0 +1,85 @@
+"""
+Write-through ledger of known step lists per test case.
+
+`update_test_case_from_steps` needs the current step codes of a test case to
+build its patch, which used to cost a `get_test_case` round-trip before every
+PATCH. Most updates follow our own writes: a test case we just created has no
+steps, and one we just updated has exactly the steps we sent. `StepLedger`
+records that state on every successful create/update (LRU with a TTL, so
+edits made elsewhere are picked up again), and the GET runs only when the
+ledger has nothing fresh for the code. The ledger is never trusted to skip a
+write: when it says the steps are unchanged, the test case is read again.
+"""
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Mapping, Optional, Sequence, Tuple
+
+# Fields of a step kept in the ledger: its code and the plain-text triple.
+_TEXT_FIELDS = ("stepDescription", "stepData", "stepResult")
+
+
+def _compact_step(step: Mapping[str, Any]) -> Dict[str, Any]:
+    compact: Dict[str, Any] = {"code": step.get("code")}
+    for name in _TEXT_FIELDS:
+        value = step.get(name)
+        if isinstance(value, Mapping):
+            compact[name] = {"plainText": value.get("plainText")}
+    return compact
+
+
+class StepLedger:
+    """Thread-safe LRU + TTL map of unit code -> last known step list."""
+
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        ttl: float = 600.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._clock = clock
+        self._entries: "OrderedDict[str, Tuple[float, Tuple[Dict[str, Any], ...]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, code: str) -> Optional[List[Dict[str, Any]]]:
+        """Known steps for `code` (a fresh list of copies), or None if unknown or expired."""
+        with self._lock:
+            entry = self._entries.get(code)
+            if entry is None or self._clock() - entry[0] >= self.ttl:
+                if entry is not None:
+                    del self._entries[code]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(code)
+            self.hits += 1
+            steps = entry[1]
+        return [dict(step) for step in steps]
+
+    def record(self, code: str, steps: Sequence[Mapping[str, Any]]) -> None:
+        """Remember the step list `code` has after a successful write."""
+        if self.max_entries <= 0 or self.ttl <= 0:
+            return
+        compact = tuple(_compact_step(step) for step in steps)
+        with self._lock:
+            self._entries[code] = (self._clock(), compact)
+            self._entries.move_to_end(code)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, code: str) -> None:
+        with self._lock:
+            self._entries.pop(code, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "entries": len(self._entries)}
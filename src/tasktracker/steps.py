@@ -6,18 +6,35 @@ and ProseMirror formatting stay in one place.
 """
 from __future__ import annotations
 
+import asyncio
+import hashlib
 import json
 import logging
-from copy import deepcopy
-from typing import Any, Dict, List, Union
+import unicodedata
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Mapping, NamedTuple, Optional, Sequence, Tuple, Union
 from uuid import uuid4
 
-from pydantic import BaseModel, Field
-
-from src.tasktracker.tools import create_test_case, get_test_case, update_test_case
+from pydantic import BaseModel, Field, ValidationError
+
+from src.tasktracker.payloads import TestCasePayload, payload_json, test_case_payload
+from src.tasktracker.pool import get_shared_step_ledger, get_shared_unit_cache
+from src.tasktracker.prosemirror import text_doc, text_docs, to_plain_text
+from src.tasktracker.step_alignment import align_steps
+from src.tasktracker.tools import (
+    acreate_test_case,
+    aget_test_case,
+    aupdate_test_case,
+    create_test_case,
+    get_test_case,
+    update_test_case,
+)
 
 log = logging.getLogger(__name__)
 
+# Default number of test cases created in parallel by `create_test_cases_with_steps`.
+DEFAULT_BATCH_WORKERS = 4
+
 
 class TestStepSpec(BaseModel):
     """
@@ -41,20 +58,40 @@ class TestStepSpec(BaseModel):
     )
 
 
+class StepTuple(NamedTuple):
+    """
+    Lightweight, unvalidated step for trusted internal callers.
+
+    Accepted wherever `TestStepSpec` is and skips pydantic validation; also a
+    `(description, data, result)` triple as used by `align_steps`.
+    """
+
+    step_description: str
+    step_data: str = ""
+    step_result: str = ""
+
+
+StepInput = Union[TestStepSpec, StepTuple, Dict[str, Any]]
+
+
+class NewTestCaseSpec(BaseModel):
+    """One test case for `create_test_cases_with_steps`: where to create it and its steps."""
+
+    summary: str = Field(..., description="Human-readable test case summary / title.")
+    folder_code: str = Field(..., description="Code of the folder to create the test case in.")
+    space: str = Field(..., description="TaskTracker space code (e.g. `PVM`, `VIEW`).")
+    suit: str = Field("test_case", description="TaskTracker suit code (usually `test_case`).")
+    steps: List[TestStepSpec] = Field(default_factory=list, description="Ordered test steps.")
+
+
 def build_formatted_text(text: str) -> str:
     """
     Wrap plain text into a minimal ProseMirror-like JSON document and dump as string.
+
+    Encoded from a template (see `prosemirror.text_doc`), byte-identical to
+    `json.dumps` of the `doc -> paragraph -> text` dict.
     """
-    doc = {
-        "type": "doc",
-        "content": [
-            {
-                "type": "paragraph",
-                "content": [{"type": "text", "text": text}],
-            }
-        ],
-    }
-    return json.dumps(doc, ensure_ascii=False)
+    return text_doc(text)
 
 
 def build_test_case_base(
@@ -65,58 +102,19 @@ def build_test_case_base(
     folder_code: str,
 ) -> Dict[str, Any]:
     """
-    Build a safe base JSON payload for a new test case.
+    Build a safe base JSON payload for a new test case, as a mutable dict.
 
-    The structure is derived from the example in `test_case_json_example.json`,
-    but kept inline here to avoid any file I/O at runtime.
+    The create helpers use the shared immutable template directly (see
+    `payloads.test_case_payload`); this copy is for callers that edit the
+    payload before passing it to `create_test_case_from_steps`.
     """
-    base: Dict[str, Any] = {
-        "summary": summary,
-        "description": None,
-        "code": None,
-        "space": space,
-        "suit": suit,
-        "draftsInfo": [],
-        "attributes": {
-            "space": space,
-            "tenant": "default",
-            "automated": None,
-            "Automation_framework": None,
-            "estimate": None,
-            "folder": folder_code,
-            "label": None,
-            "owner": None,
-            "precondition": None,
-            "priority": None,
-            "test_case_status": "draft",
-            "test_level": None,
-            "pmi": "not",
-            "component_version": None,
-            "product_version": None,
-            "CRPV_STS_SUPPORT": None,
-            "test_type": "integration_type",
-            "type_of_testing": "regress",
-            "old_jira_key": None,
-            "premigration_author": None,
-            "target_fp": None,
-            "product_name": None,
-            "product_code": None,
-            "component_code": None,
-            "AftTestCaseName": None,
-            "spec_for": None,
-            "more_than_1": None,
-            "case_version_relevant_from": None,
-            "not_updated_since_version": None,
-            # test_step is filled separately by create_test_case_from_steps.
-        },
-    }
-    return deepcopy(base)
+    return test_case_payload(summary=summary, suit=suit, space=space, folder_code=folder_code).to_dict()
 
 
 def create_test_case_from_steps(
     suit: str,
-    test_case_base: Dict[str, Any],
-    steps: List[Union[TestStepSpec, Dict[str, Any]]],
+    test_case_base: Mapping[str, Any],
+    steps: List[StepInput],
 ) -> Dict[str, Any]:
     """
     Create a new test case from a list of steps given an explicit base payload.
@@ -128,16 +126,33 @@ def create_test_case_from_steps(
     Payload shape matches test_case_json_example.json: attributes is a flat dict
     with attributes.test_step as the array of steps.
     """
-    payload = deepcopy(test_case_base)
-    attributes = payload.setdefault("attributes", {})
-    attributes["test_step"] = []  # Create always empty; steps are added via update_test_case_from_steps
+    payload = _prepare_create_payload(suit, test_case_base)
+    result = create_test_case(suit=suit, test_case_json=payload)
+    _remember_created(result)
+    return result
+
+
+def _prepare_create_payload(suit: str, test_case_base: Mapping[str, Any]) -> Mapping[str, Any]:
+    """
+    Payload with an empty `attributes.test_step` for creation.
+
+    A `TestCasePayload` already has one and is used as-is; a plain dict is
+    copied only along the path that changes (top level and `attributes`).
+    """
+    if isinstance(test_case_base, TestCasePayload):
+        payload: Mapping[str, Any] = test_case_base
+    else:
+        # Create always empty; steps are added via update_test_case_from_steps
+        attributes = {**(test_case_base.get("attributes") or {}), "test_step": []}
+        payload = {**test_case_base, "attributes": attributes}
     log.info(
         "create_test_case_from_steps: sending payload summary=%s suit=%s (empty steps)",
         payload.get("summary"),
         suit,
     )
-    log.debug("create_test_case_from_steps payload body: %s", json.dumps(payload, ensure_ascii=False)[:2000])
-    return create_test_case(suit=suit, test_case_json=payload)
+    if log.isEnabledFor(logging.DEBUG):
+        log.debug("create_test_case_from_steps payload body: %s", payload_json(payload)[:2000])
+    return payload
 
 
 def create_test_case_with_summary(
@@ -146,7 +161,7 @@ def create_test_case_with_summary(
     suit: str,
     space: str,
     folder_code: str,
-    steps: List[Union[TestStepSpec, Dict[str, Any]]],
+    steps: List[StepInput],
 ) -> Dict[str, Any]:
     """
     High-level helper: create a new test case from summary/space/folder and steps.
@@ -154,7 +169,7 @@ def create_test_case_with_summary(
     This is the preferred entrypoint for tools and the MCP server. It builds a
     safe base payload from the example JSON and then injects the test steps.
     """
-    base = build_test_case_base(
+    base = test_case_payload(
         summary=summary,
         suit=suit,
         space=space,
@@ -165,46 +180,42 @@ def create_test_case_with_summary(
 
 def build_patch_steps(
     existing_steps: List[Dict[str, Any]],
-    steps: List[Union[TestStepSpec, Dict[str, Any]]],
+    steps: List[StepInput],
 ) -> List[Dict[str, Any]]:
     """
     Build the TaskTracker update patch `attributes.test_step.testStepList` from step specs.
 
     Update API expects each step to have stepDescription/stepData/stepResult with
     formattedText (ProseMirror JSON string) and plainText. Accepts TestStepSpec or dicts.
+
+    Existing step codes are reused by content, not position (see
+    `step_alignment.align_steps`), so inserting, deleting or moving a step
+    keeps the codes of the others; only new steps get a fresh UUID.
     """
+    specs = [_coerce_step(step) for step in steps]
+    live_steps = [s for s in existing_steps if isinstance(s, dict) and not s.get("deleted")]
+    matches = align_steps(step_triples(live_steps), specs)
+    # One batch for all fields: [desc_1, data_1, result_1, desc_2, ...].
+    formatted = text_docs(text for spec in specs for text in spec)
     result: List[Dict[str, Any]] = []
-    for idx, step in enumerate(steps, start=1):
-        if isinstance(step, dict):
-            spec = TestStepSpec(
-                step_description=step.get("step_description", ""),
-                step_data=step.get("step_data", ""),
-                step_result=step.get("step_result", ""),
-            )
-        else:
-            spec = step
-        fmt_desc = build_formatted_text(spec.step_description)
-        fmt_data = build_formatted_text(spec.step_data or "")
-        fmt_result = build_formatted_text(spec.step_result)
-        # Preserve step code for existing steps; use a new UUID for new ones.
-        if idx - 1 < len(existing_steps):
-            code = existing_steps[idx - 1].get("code") or str(uuid4())
-        else:
-            code = str(uuid4())
+    for idx, (spec, match) in enumerate(zip(specs, matches), start=1):
+        offset = 3 * (idx - 1)
+        # Preserve the code of the matched existing step; use a new UUID for new ones.
+        code = (live_steps[match].get("code") if match is not None else None) or str(uuid4())
 
         result.append(
             {
                 "code": code,
                 "stepDescription": {
-                    "formattedText": fmt_desc,
+                    "formattedText": formatted[offset],
                     "plainText": spec.step_description.strip(),
                 },
                 "stepData": {
-                    "formattedText": fmt_data,
-                    "plainText": (spec.step_data or "").strip(),
+                    "formattedText": formatted[offset + 1],
+                    "plainText": spec.step_data.strip(),
                 },
                 "stepResult": {
-                    "formattedText": fmt_result,
+                    "formattedText": formatted[offset + 2],
                     "plainText": spec.step_result.strip(),
                 },
                 "callToTestId": None,
@@ -218,6 +229,97 @@ def build_patch_steps(
     return result
 
 
+def _coerce_step(step: StepInput) -> StepTuple:
+    """`StepTuple` of a step; dicts are validated through `TestStepSpec`, tuples are trusted as-is."""
+    if isinstance(step, StepTuple):
+        return step
+    if isinstance(step, dict):
+        step = TestStepSpec(
+            step_description=step.get("step_description", ""),
+            step_data=step.get("step_data", ""),
+            step_result=step.get("step_result", ""),
+        )
+    return StepTuple(step.step_description, step.step_data or "", step.step_result)
+
+
+# --- Content hashing: detect updates that would not change anything ---
+
+
+StepTriple = Tuple[str, str, str]
+
+
+def _step_field_text(value: Any) -> str:
+    """Plain text of a step field in update (`plainText`) or read (`text` / `formattedText`) shape."""
+    if isinstance(value, str):
+        return value
+    if not isinstance(value, dict):
+        return ""
+    if value.get("plainText") is not None:
+        return str(value["plainText"])
+    formatted = value.get("formattedText") or value.get("text")
+    return to_plain_text(formatted) if formatted else ""
+
+
+def step_triples(steps: Sequence[Any]) -> List[StepTriple]:
+    """(description, data, result) plain-text triples for existing steps or step specs."""
+    triples: List[StepTriple] = []
+    for step in steps:
+        if isinstance(step, (StepTuple, TestStepSpec)) or (isinstance(step, dict) and "step_description" in step):
+            triples.append(tuple(_coerce_step(step)))
+        elif isinstance(step, dict):
+            if step.get("deleted"):
+                continue
+            triples.append(
+                (
+                    _step_field_text(step.get("stepDescription")),
+                    _step_field_text(step.get("stepData")),
+                    _step_field_text(step.get("stepResult")),
+                )
+            )
+    return triples
+
+
+def unit_step_triples(unit: Dict[str, Any]) -> List[StepTriple]:
+    """Plain-text step triples of a unit as returned by `get_test_case` (or a listing)."""
+    return step_triples(_existing_steps_from_test_case(unit))
+
+
+def _normalize_text(text: str) -> str:
+    return " ".join(unicodedata.normalize("NFC", text or "").split())
+
+
+def steps_content_hash(steps: Sequence[Any]) -> str:
+    """
+    Normalized content hash of a step list: its plain-text step triples.
+
+    Whitespace and Unicode normalization differences do not change the hash;
+    formatting (marks, alignment) is ignored.
+    """
+    normalized = [[_normalize_text(part) for part in triple] for triple in step_triples(steps)]
+    encoded = json.dumps(normalized, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    return hashlib.sha256(encoded).hexdigest()
+
+
+def _steps_unchanged(existing_steps: Sequence[Any], specs: Sequence[StepTuple]) -> bool:
+    # The update only writes steps, so only steps are compared.
+    return steps_content_hash(existing_steps) == steps_content_hash(specs)
+
+
+def _forget_cached_unit(code: str) -> None:
+    """Drop `code` from the unit cache so the next `get_test_case` reads the server."""
+    cache = get_shared_unit_cache()
+    if cache is not None:
+        cache.invalidate(code)
+
+
+def _log_unchanged(code: str) -> None:
+    log.info("update_test_case_from_steps: code=%s content unchanged, skipping PATCH", code)
+
+
+def _unchanged_result(code: str) -> Dict[str, Any]:
+    return {"id": code, "status": "unchanged"}
+
+
 def _existing_steps_from_test_case(current: Dict[str, Any]) -> List[Dict[str, Any]]:
     """
     Extract the list of existing steps from a get_test_case response.
@@ -248,21 +350,94 @@ def _existing_steps_from_test_case(current: Dict[str, Any]) -> List[Dict[str, An
 
 def update_test_case_from_steps(
     code: str,
-    steps: List[Union[TestStepSpec, Dict[str, Any]]],
+    steps: List[StepInput],
 ) -> Dict[str, Any]:
     """
     Update an existing test case's steps by code.
 
-    Fetches the current test case to preserve existing step codes, then builds
+    Looks up the existing step codes (from the step ledger when our own last
+    write is still fresh, otherwise by fetching the test case), then builds
     the patch body in the shape expected by the TaskTracker update API
     (attributes.test_step.testStepList) and calls update_test_case.
 
+    When the steps' content hash (`steps_content_hash`) matches the current
+    one, no PATCH is sent and `{"id": code, "status": "unchanged"}` is
+    returned; otherwise the update response gets `"status": "updated"`. The
+    ledger and the unit cache can be stale (edits made in the UI or by other
+    clients), so a skip is decided only against a fresh read of the test case.
+
     Supports get_test_case response shape where attributes is an array of
     attribute objects (see get_test_case_json_example.json).
     """
-    current = get_test_case(code)
-    existing_steps = _existing_steps_from_test_case(current or {})
-
+    specs = [_coerce_step(step) for step in steps]
+    existing_steps = _known_steps(code)
+    if existing_steps is None:
+        existing_steps = _existing_steps_from_test_case(get_test_case(code))
+    if _steps_unchanged(existing_steps, specs):
+        # Ledger and cache may predate an edit made elsewhere: skip only on a fresh read.
+        _forget_cached_unit(code)
+        existing_steps = _existing_steps_from_test_case(get_test_case(code))
+        if _steps_unchanged(existing_steps, specs):
+            _log_unchanged(code)
+            return _unchanged_result(code)
+    patch = _build_update_patch(code, existing_steps, specs)
+    return _send_steps_update(code, patch)
+
+
+# --- Step ledger: known step codes after our own writes (see step_ledger.py) ---
+
+
+def _known_steps(code: str) -> Optional[List[Dict[str, Any]]]:
+    ledger = get_shared_step_ledger()
+    return ledger.get(code) if ledger is not None else None
+
+
+def _remember_created(result: Any) -> None:
+    """A test case we just created has no steps (creation always sends an empty list)."""
+    ledger = get_shared_step_ledger()
+    code = created_test_case_code(result)
+    if ledger is not None and code is not None:
+        ledger.record(code, [])
+
+
+def _send_steps_update(code: str, patch: Dict[str, Any]) -> Dict[str, Any]:
+    """PATCH the steps and record them; on failure the server state is unknown, so forget it."""
+    ledger = get_shared_step_ledger()
+    try:
+        result = update_test_case(code=code, patch_json=patch)
+    except Exception:
+        if ledger is not None:
+            ledger.invalidate(code)
+        raise
+    if ledger is not None:
+        ledger.record(code, patch["attributes"]["test_step"]["testStepList"])
+    return _updated_result(result)
+
+
+async def _asend_steps_update(code: str, patch: Dict[str, Any]) -> Dict[str, Any]:
+    """Async variant of `_send_steps_update`."""
+    ledger = get_shared_step_ledger()
+    try:
+        result = await aupdate_test_case(code=code, patch_json=patch)
+    except Exception:
+        if ledger is not None:
+            ledger.invalidate(code)
+        raise
+    if ledger is not None:
+        ledger.record(code, patch["attributes"]["test_step"]["testStepList"])
+    return _updated_result(result)
+
+
+def _updated_result(result: Any) -> Any:
+    return {**result, "status": "updated"} if isinstance(result, dict) else result
+
+
+def _build_update_patch(
+    code: str,
+    existing_steps: List[Dict[str, Any]],
+    steps: List[StepInput],
+) -> Dict[str, Any]:
+    """Build the `attributes.test_step.testStepList` patch body for an update."""
     test_step_list = build_patch_steps(existing_steps, steps)
     patch = {
         "attributes": {
@@ -276,5 +451,204 @@ def update_test_case_from_steps(
         code,
         len(test_step_list),
     )
-    log.debug("update_test_case_from_steps patch body: %s", json.dumps(patch, ensure_ascii=False)[:2000])
-    return update_test_case(code=code, patch_json=patch)
+    if log.isEnabledFor(logging.DEBUG):
+        log.debug("update_test_case_from_steps patch body: %s", json.dumps(patch, ensure_ascii=False)[:2000])
+    return patch
+
+
+def created_test_case_code(result: Any) -> Optional[str]:
+    """Extract the new test case code from a create response (`{"id": "PVM-1"}` or a unit)."""
+    if not isinstance(result, dict):
+        return None
+    value = result.get("id") or result.get("code")
+    if isinstance(value, dict):
+        value = value.get("code")
+    return str(value) if value else None
+
+
+def _new_test_case_patch(code: str, steps: List[StepInput]) -> Dict[str, Any]:
+    # A test case we just created has no steps, so there is nothing to fetch first.
+    return _build_update_patch(code, [], steps)
+
+
+def _batch_entry(index: int, item: Any) -> Dict[str, Any]:
+    summary = item.get("summary") if isinstance(item, dict) else getattr(item, "summary", None)
+    return {"index": index, "summary": summary, "code": None, "status": "error", "stage": "validate"}
+
+
+def _batch_failed(entry: Dict[str, Any], exc: Exception) -> Dict[str, Any]:
+    if isinstance(exc, ValidationError):
+        details = "; ".join(
+            f"{'.'.join(str(part) for part in err['loc'])}: {err['msg']}" for err in exc.errors()
+        )
+        entry["error"] = f"invalid test case: {details}"
+    else:
+        entry["error"] = f"{type(exc).__name__}: {exc}"
+    log.warning(
+        "create_test_cases_with_steps: item %s failed at %s (code=%s): %s",
+        entry["index"],
+        entry["stage"],
+        entry["code"],
+        entry["error"],
+    )
+    return entry
+
+
+def _batch_succeeded(entry: Dict[str, Any], spec: NewTestCaseSpec) -> Dict[str, Any]:
+    entry.update(status="ok", stage=None, steps=len(spec.steps))
+    return entry
+
+
+def _batch_code(created: Any) -> str:
+    code = created_test_case_code(created)
+    if code is None:
+        raise ValueError(f"create response has no test case code: {created!r}")
+    return code
+
+
+def _batch_report(results: List[Dict[str, Any]]) -> Dict[str, Any]:
+    succeeded = sum(1 for r in results if r["status"] == "ok")
+    log.info(
+        "create_test_cases_with_steps: total=%s succeeded=%s failed=%s",
+        len(results),
+        succeeded,
+        len(results) - succeeded,
+    )
+    return {
+        "total": len(results),
+        "succeeded": succeeded,
+        "failed": len(results) - succeeded,
+        "results": results,
+    }
+
+
+def _create_one_with_steps(index: int, item: Union[NewTestCaseSpec, Dict[str, Any]]) -> Dict[str, Any]:
+    entry = _batch_entry(index, item)
+    try:
+        spec = item if isinstance(item, NewTestCaseSpec) else NewTestCaseSpec.model_validate(item)
+        entry["stage"] = "create"
+        created = create_test_case_with_summary(
+            summary=spec.summary,
+            suit=spec.suit,
+            space=spec.space,
+            folder_code=spec.folder_code,
+            steps=[],
+        )
+        entry["code"] = _batch_code(created)
+        if spec.steps:
+            entry["stage"] = "update"
+            _send_steps_update(entry["code"], _new_test_case_patch(entry["code"], spec.steps))
+    except Exception as exc:
+        return _batch_failed(entry, exc)
+    return _batch_succeeded(entry, spec)
+
+
+def create_test_cases_with_steps(
+    batch: List[Union[NewTestCaseSpec, Dict[str, Any]]],
+    *,
+    max_workers: int = DEFAULT_BATCH_WORKERS,
+) -> Dict[str, Any]:
+    """
+    Create many test cases with their steps through a bounded worker pool.
+
+    Each item is created empty and then gets its steps in one PATCH (no GET:
+    a fresh test case has no step codes to preserve), i.e. two requests per
+    test case, with up to `max_workers` test cases in flight. Failures are
+    reported per item and do not stop the batch.
+
+    Returns `{"total", "succeeded", "failed", "results"}`; `results` follows the
+    input order and each entry has `index`, `summary`, `code`, `status`
+    (`ok` / `error`) and, on error, the failed `stage` (`validate`, `create`,
+    `update`) and `error`. An `update` failure leaves an empty test case
+    behind, whose `code` is reported.
+    """
+    items = list(batch)
+    if not items:
+        return _batch_report([])
+    workers = max(1, min(max_workers, len(items)))
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="tt-batch") as executor:
+        results = list(executor.map(_create_one_with_steps, range(len(items)), items))
+    return _batch_report(results)
+
+
+# --- Async variants (used by the MCP server so it never blocks its event loop) ---
+
+
+async def acreate_test_case_with_summary(
+    *,
+    summary: str,
+    suit: str,
+    space: str,
+    folder_code: str,
+    steps: List[StepInput],
+) -> Dict[str, Any]:
+    """Async variant of `create_test_case_with_summary`."""
+    base = test_case_payload(
+        summary=summary,
+        suit=suit,
+        space=space,
+        folder_code=folder_code,
+    )
+    payload = _prepare_create_payload(suit, base)
+    result = await acreate_test_case(suit=suit, test_case_json=payload)
+    _remember_created(result)
+    return result
+
+
+async def aupdate_test_case_from_steps(
+    code: str,
+    steps: List[StepInput],
+) -> Dict[str, Any]:
+    """Async variant of `update_test_case_from_steps`."""
+    specs = [_coerce_step(step) for step in steps]
+    existing_steps = _known_steps(code)
+    if existing_steps is None:
+        existing_steps = _existing_steps_from_test_case(await aget_test_case(code))
+    if _steps_unchanged(existing_steps, specs):
+        _forget_cached_unit(code)
+        existing_steps = _existing_steps_from_test_case(await aget_test_case(code))
+        if _steps_unchanged(existing_steps, specs):
+            _log_unchanged(code)
+            return _unchanged_result(code)
+    patch = _build_update_patch(code, existing_steps, specs)
+    return await _asend_steps_update(code, patch)
+
+
+async def _acreate_one_with_steps(
+    index: int,
+    item: Union[NewTestCaseSpec, Dict[str, Any]],
+    semaphore: asyncio.Semaphore,
+) -> Dict[str, Any]:
+    entry = _batch_entry(index, item)
+    async with semaphore:
+        try:
+            spec = item if isinstance(item, NewTestCaseSpec) else NewTestCaseSpec.model_validate(item)
+            entry["stage"] = "create"
+            created = await acreate_test_case_with_summary(
+                summary=spec.summary,
+                suit=spec.suit,
+                space=spec.space,
+                folder_code=spec.folder_code,
+                steps=[],
+            )
+            entry["code"] = _batch_code(created)
+            if spec.steps:
+                entry["stage"] = "update"
+                await _asend_steps_update(entry["code"], _new_test_case_patch(entry["code"], spec.steps))
+        except Exception as exc:
+            return _batch_failed(entry, exc)
+    return _batch_succeeded(entry, spec)
+
+
+async def acreate_test_cases_with_steps(
+    batch: List[Union[NewTestCaseSpec, Dict[str, Any]]],
+    *,
+    max_workers: int = DEFAULT_BATCH_WORKERS,
+) -> Dict[str, Any]:
+    """Async variant of `create_test_cases_with_steps` (concurrency bounded by a semaphore)."""
+    items = list(batch)
+    semaphore = asyncio.Semaphore(max(1, max_workers))
+    results = await asyncio.gather(
+        *(_acreate_one_with_steps(i, item, semaphore) for i, item in enumerate(items))
+    )
+    return _batch_report(list(results))
@@ -1,24 +1,80 @@
 from __future__ import annotations
 
+import asyncio
 import json
 import logging
 import os
-from typing import Any, Dict, List
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Mapping, Optional, Tuple
 
-from src.tasktracker.client import TaskTrackerClient, flatten_test_cases
+from src.tasktracker.client import flatten_test_cases
+from src.tasktracker.folders import FolderIndexRegistry, FolderNode
+from src.tasktracker.pagination import (
+    DEFAULT_FETCH_CONCURRENCY,
+    DEFAULT_PAGE_SIZE,
+    FolderFetchResult,
+)
+from src.tasktracker.payloads import payload_json
+from src.tasktracker.pool import get_shared_async_client, get_shared_client
 
 log = logging.getLogger(__name__)
-from src.tasktracker.dry_run_client import DryRunTaskTrackerClient
+from src.tasktracker.dry_run_client import AsyncDryRunTaskTrackerClient, DryRunTaskTrackerClient
+
+
+# Folder indexes per space, refreshed from every root listing and on create_folder.
+_FOLDER_INDEXES = FolderIndexRegistry()
+
+
+def _dry_run_enabled() -> bool:
+    return os.getenv("TASKTRACKER_DRY_RUN", "").strip().lower() in ("1", "true", "yes")
 
 
 def _get_client() -> Any:
-    """Return client; when TASKTRACKER_DRY_RUN is set, mutating calls are stubbed (reads go to real API)."""
-    real = TaskTrackerClient.from_env()
-    if os.getenv("TASKTRACKER_DRY_RUN", "").strip().lower() in ("1", "true", "yes"):
+    """
+    Return the shared pooled client; when TASKTRACKER_DRY_RUN is set, mutating calls
+    are stubbed (reads go to real API through the same pool).
+    """
+    real = get_shared_client()
+    if _dry_run_enabled():
         return DryRunTaskTrackerClient(real)
     return real
 
 
+def _get_async_client() -> Any:
+    """Async counterpart of `_get_client` (must be called from a coroutine)."""
+    real = get_shared_async_client()
+    if _dry_run_enabled():
+        return AsyncDryRunTaskTrackerClient(real)
+    return real
+
+
+def _log_create_test_case(suit: str, test_case_json: Mapping[str, Any]) -> None:
+    attrs = test_case_json.get("attributes") or {}
+    test_step = attrs.get("test_step")
+    step_count = len(test_step) if isinstance(test_step, list) else 0
+    log.info(
+        "create_test_case: suit=%s summary=%s attributes.test_step len=%s",
+        suit,
+        test_case_json.get("summary"),
+        step_count,
+    )
+    if log.isEnabledFor(logging.DEBUG):
+        log.debug("create_test_case request body: %s", payload_json(test_case_json)[:3000])
+
+
+def _log_update_test_case(code: str, patch_json: Dict[str, Any]) -> None:
+    test_step = (patch_json.get("attributes") or {}).get("test_step") or {}
+    step_list = test_step.get("testStepList") if isinstance(test_step, dict) else []
+    step_count = len(step_list) if isinstance(step_list, list) else 0
+    log.info(
+        "update_test_case: code=%s attributes.test_step.testStepList len=%s",
+        code,
+        step_count,
+    )
+    if log.isEnabledFor(logging.DEBUG):
+        log.debug("update_test_case request body: %s", json.dumps(patch_json, ensure_ascii=False)[:3000])
+
+
 def get_root_folder_units(
     space_id_code: str = "PVM",
     page: int = 0,
@@ -28,11 +84,13 @@ def get_root_folder_units(
     Low-level API wrapper: get folder hierarchy from root and paginated units.
     """
     client = _get_client()
-    return client.get_root_folder_units(
+    result = client.get_root_folder_units(
         space_id_code=space_id_code,
         page=page,
         size=size,
     )
+    _index_folder_hierarchy(space_id_code, result)
+    return result
 
 
 def create_folder(
@@ -44,11 +102,73 @@ def create_folder(
     Low-level API wrapper: create a folder under the given parent.
     """
     client = _get_client()
-    return client.create_folder(
+    result = client.create_folder(
         name=name,
         parent_id_code=parent_id_code,
         space_id_code=space_id_code,
     )
+    _note_folder_created(client, space_id_code, parent_id_code, result)
+    return result
+
+
+def _note_folder_created(client: Any, space_id_code: str, parent_id_code: str, result: Dict[str, Any]) -> None:
+    # Dry-run folders do not exist; keep them out of the shared index.
+    if isinstance(client, (DryRunTaskTrackerClient, AsyncDryRunTaskTrackerClient)):
+        return
+    _FOLDER_INDEXES.note_folder_created(space_id_code, parent_id_code, result)
+
+
+def _index_folder_hierarchy(space_id_code: str, result: Dict[str, Any]) -> None:
+    hierarchy = (result or {}).get("folderHierarchy")
+    if isinstance(hierarchy, dict):
+        _FOLDER_INDEXES.set_from_hierarchy(space_id_code, hierarchy)
+
+
+def _resolve_folder_result(space_id_code: str, query: str, matches: List[Dict[str, Any]]) -> Dict[str, Any]:
+    log.info("resolve_folder: space=%s query=%r matches=%s", space_id_code, query, len(matches))
+    return {"query": query, "space_id_code": space_id_code, "matches": matches}
+
+
+def resolve_folder(path_or_name: str, space_id_code: str = "PVM") -> Dict[str, Any]:
+    """
+    Resolve a folder code from a folder name, a slash-separated path of titles
+    (e.g. `Datasources/postgres datasource`) or a code.
+
+    Uses the in-process folder index; it is built (or rebuilt once, if the
+    lookup misses) from the root folder hierarchy.
+    """
+    matches = _FOLDER_INDEXES.resolve(space_id_code, path_or_name)
+    if not matches:
+        get_root_folder_units(space_id_code=space_id_code, page=0, size=1)
+        matches = _FOLDER_INDEXES.resolve(space_id_code, path_or_name) or []
+    return _resolve_folder_result(space_id_code, path_or_name, matches)
+
+
+def _subtree_not_found(space_id_code: str, folder_code: str) -> ValueError:
+    return ValueError(f"Folder {folder_code!r} not found in the folder tree of space {space_id_code!r}")
+
+
+def folder_subtree(
+    folder_code: str,
+    space_id_code: str = "PVM",
+    max_depth: Optional[int] = None,
+    refresh: bool = False,
+) -> List[Tuple[FolderNode, str, int]]:
+    """
+    Folders of the subtree at `folder_code` in breadth-first order as
+    `(folder, path, depth)`, from the folder index. The index is rebuilt from
+    the root listing first when `refresh` is set, otherwise only when the
+    folder is unknown. Raises ValueError when the folder does not exist.
+    """
+    if refresh:
+        get_root_folder_units(space_id_code=space_id_code, page=0, size=1)
+    subtree = _FOLDER_INDEXES.subtree(space_id_code, folder_code, max_depth)
+    if subtree is None and not refresh:
+        get_root_folder_units(space_id_code=space_id_code, page=0, size=1)
+        subtree = _FOLDER_INDEXES.subtree(space_id_code, folder_code, max_depth)
+    if subtree is None:
+        raise _subtree_not_found(space_id_code, folder_code)
+    return subtree
 
 
 def get_test_cases(folder_code: str, page: int = 0, size: int = 50) -> List[Dict[str, Any]]:
@@ -60,20 +180,36 @@ def get_test_cases(folder_code: str, page: int = 0, size: int = 50) -> List[Dict
     return flatten_test_cases(raw)
 
 
-def create_test_case(suit: str, test_case_json: Dict[str, Any]) -> Dict[str, Any]:
+def iter_test_cases(folder_code: str, page_size: int = DEFAULT_PAGE_SIZE) -> Iterator[Dict[str, Any]]:
     """
-    Low-level API wrapper: create a new test case.
+    Low-level API wrapper: iterate every test case in a folder across all pages,
+    prefetching the next page while the current one is consumed.
     """
-    attrs = test_case_json.get("attributes") or {}
-    test_step = attrs.get("test_step")
-    step_count = len(test_step) if isinstance(test_step, list) else 0
-    log.info(
-        "create_test_case: suit=%s summary=%s attributes.test_step len=%s",
-        suit,
-        test_case_json.get("summary"),
-        step_count,
+    client = _get_client()
+    return client.iter_test_cases(folder_code, page_size=page_size)
+
+
+def fetch_all_test_cases(
+    folder_code: str,
+    max_concurrency: int = DEFAULT_FETCH_CONCURRENCY,
+    page_size: int = DEFAULT_PAGE_SIZE,
+) -> FolderFetchResult:
+    """
+    Low-level API wrapper: read every test case in a folder with parallel page requests.
+    """
+    client = _get_client()
+    return client.fetch_all_test_cases(
+        folder_code,
+        max_concurrency=max_concurrency,
+        page_size=page_size,
     )
-    log.debug("create_test_case request body: %s", json.dumps(test_case_json, ensure_ascii=False)[:3000])
+
+
+def create_test_case(suit: str, test_case_json: Mapping[str, Any]) -> Dict[str, Any]:
+    """
+    Low-level API wrapper: create a new test case.
+    """
+    _log_create_test_case(suit, test_case_json)
     client = _get_client()
     return client.create_test_case(suit=suit, payload=test_case_json)
 
@@ -82,15 +218,7 @@ def update_test_case(code: str, patch_json: Dict[str, Any]) -> Dict[str, Any]:
     """
     Low-level API wrapper: update an existing test case by code.
     """
-    test_step = (patch_json.get("attributes") or {}).get("test_step") or {}
-    step_list = test_step.get("testStepList") if isinstance(test_step, dict) else []
-    step_count = len(step_list) if isinstance(step_list, list) else 0
-    log.info(
-        "update_test_case: code=%s attributes.test_step.testStepList len=%s",
-        code,
-        step_count,
-    )
-    log.debug("update_test_case request body: %s", json.dumps(patch_json, ensure_ascii=False)[:3000])
+    _log_update_test_case(code, patch_json)
     client = _get_client()
     return client.update_test_case(code=code, patch_body=patch_json)
 
@@ -102,3 +230,157 @@ def get_test_case(code: str) -> Dict[str, Any]:
     client = _get_client()
     return client.get_test_case(code=code)
 
+
+def _unique_codes(codes: Iterable[str]) -> List[str]:
+    return list(dict.fromkeys(code.strip() for code in codes if code and code.strip()))
+
+
+def _code_result(code: str, fetch: Callable[[str], Dict[str, Any]]) -> Dict[str, Any]:
+    try:
+        return {"code": code, "status": "ok", "test_case": fetch(code)}
+    except Exception as exc:
+        return _code_failed(code, exc)
+
+
+def _code_failed(code: str, exc: Exception) -> Dict[str, Any]:
+    log.warning("get_test_cases_by_codes: %s failed: %s: %s", code, type(exc).__name__, exc)
+    return {"code": code, "status": "error", "error": f"{type(exc).__name__}: {exc}"}
+
+
+def get_test_cases_by_codes(
+    codes: Iterable[str],
+    max_concurrency: int = DEFAULT_FETCH_CONCURRENCY,
+) -> List[Dict[str, Any]]:
+    """
+    Low-level API wrapper: fetch several test cases by code in parallel.
+
+    One entry per distinct code, in input order: `{"code", "status": "ok",
+    "test_case"}` or `{"code", "status": "error", "error"}`; a failing code
+    does not fail the others.
+    """
+    unique = _unique_codes(codes)
+    if not unique:
+        return []
+    workers = max(1, min(max_concurrency, len(unique)))
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="tt-read") as executor:
+        return list(executor.map(lambda code: _code_result(code, get_test_case), unique))
+
+
+# --- Async wrappers (same semantics, backed by the shared AsyncTaskTrackerClient) ---
+
+
+async def aget_root_folder_units(
+    space_id_code: str = "PVM",
+    page: int = 0,
+    size: int = 50,
+) -> Dict[str, Any]:
+    """Async variant of `get_root_folder_units`."""
+    client = _get_async_client()
+    result = await client.get_root_folder_units(
+        space_id_code=space_id_code,
+        page=page,
+        size=size,
+    )
+    _index_folder_hierarchy(space_id_code, result)
+    return result
+
+
+async def acreate_folder(
+    name: str,
+    parent_id_code: str,
+    space_id_code: str = "PVM",
+) -> Dict[str, Any]:
+    """Async variant of `create_folder`."""
+    client = _get_async_client()
+    result = await client.create_folder(
+        name=name,
+        parent_id_code=parent_id_code,
+        space_id_code=space_id_code,
+    )
+    _note_folder_created(client, space_id_code, parent_id_code, result)
+    return result
+
+
+async def aresolve_folder(path_or_name: str, space_id_code: str = "PVM") -> Dict[str, Any]:
+    """Async variant of `resolve_folder`."""
+    matches = _FOLDER_INDEXES.resolve(space_id_code, path_or_name)
+    if not matches:
+        await aget_root_folder_units(space_id_code=space_id_code, page=0, size=1)
+        matches = _FOLDER_INDEXES.resolve(space_id_code, path_or_name) or []
+    return _resolve_folder_result(space_id_code, path_or_name, matches)
+
+
+async def afolder_subtree(
+    folder_code: str,
+    space_id_code: str = "PVM",
+    max_depth: Optional[int] = None,
+    refresh: bool = False,
+) -> List[Tuple[FolderNode, str, int]]:
+    """Async variant of `folder_subtree`."""
+    if refresh:
+        await aget_root_folder_units(space_id_code=space_id_code, page=0, size=1)
+    subtree = _FOLDER_INDEXES.subtree(space_id_code, folder_code, max_depth)
+    if subtree is None and not refresh:
+        await aget_root_folder_units(space_id_code=space_id_code, page=0, size=1)
+        subtree = _FOLDER_INDEXES.subtree(space_id_code, folder_code, max_depth)
+    if subtree is None:
+        raise _subtree_not_found(space_id_code, folder_code)
+    return subtree
+
+
+async def aget_test_cases(folder_code: str, page: int = 0, size: int = 50) -> List[Dict[str, Any]]:
+    """Async variant of `get_test_cases`."""
+    client = _get_async_client()
+    raw = await client.get_test_cases(folder_code=folder_code, page=page, size=size)
+    return flatten_test_cases(raw)
+
+
+async def afetch_all_test_cases(
+    folder_code: str,
+    max_concurrency: int = DEFAULT_FETCH_CONCURRENCY,
+    page_size: int = DEFAULT_PAGE_SIZE,
+) -> FolderFetchResult:
+    """Async variant of `fetch_all_test_cases`."""
+    client = _get_async_client()
+    return await client.fetch_all_test_cases(
+        folder_code,
+        max_concurrency=max_concurrency,
+        page_size=page_size,
+    )
+
+
+async def acreate_test_case(suit: str, test_case_json: Mapping[str, Any]) -> Dict[str, Any]:
+    """Async variant of `create_test_case`."""
+    _log_create_test_case(suit, test_case_json)
+    client = _get_async_client()
+    return await client.create_test_case(suit=suit, payload=test_case_json)
+
+
+async def aupdate_test_case(code: str, patch_json: Dict[str, Any]) -> Dict[str, Any]:
+    """Async variant of `update_test_case`."""
+    _log_update_test_case(code, patch_json)
+    client = _get_async_client()
+    return await client.update_test_case(code=code, patch_body=patch_json)
+
+
+async def aget_test_case(code: str) -> Dict[str, Any]:
+    """Async variant of `get_test_case`."""
+    client = _get_async_client()
+    return await client.get_test_case(code=code)
+
+
+async def aget_test_cases_by_codes(
+    codes: Iterable[str],
+    max_concurrency: int = DEFAULT_FETCH_CONCURRENCY,
+) -> List[Dict[str, Any]]:
+    """Async variant of `get_test_cases_by_codes` (concurrency bounded by a semaphore)."""
+    semaphore = asyncio.Semaphore(max(1, max_concurrency))
+
+    async def fetch(code: str) -> Dict[str, Any]:
+        async with semaphore:
+            try:
+                return {"code": code, "status": "ok", "test_case": await aget_test_case(code)}
+            except Exception as exc:
+                return _code_failed(code, exc)
+
+    return list(await asyncio.gather(*(fetch(code) for code in _unique_codes(codes))))
@@ -0,0 +1,39 @@
+import unittest
+
+from src.tasktracker.cache import UnitCache
+
+
+class UnitCacheGenerationTest(unittest.TestCase):
+    def test_store_after_invalidate_is_dropped(self):
+        cache = UnitCache(max_entries=8)
+        token = cache.generation()
+        cache.invalidate("A-1")
+        cache.store("A-1", b'{"v": 1}', {}, {}, token)
+        self.assertEqual(cache.lookup("A-1"), (None, None))
+
+    def test_trimmed_marker_still_drops_stale_store(self):
+        cache = UnitCache(max_entries=1)
+        token = cache.generation()  # GET of A-1 starts
+        cache.invalidate("A-1")  # PATCH of A-1
+        cache.invalidate("B-1")  # PATCH of B-1 trims the A-1 marker
+        cache.store("A-1", b'{"v": "old"}', {}, {}, token)
+        self.assertEqual(cache.lookup("A-1"), (None, None))
+
+    def test_read_started_after_writes_is_stored(self):
+        cache = UnitCache(max_entries=1)
+        cache.invalidate("A-1")
+        cache.invalidate("B-1")
+        token = cache.generation()
+        cache.store("A-1", b'{"v": "new"}', {}, {}, token)
+        self.assertEqual(cache.lookup("A-1"), (b'{"v": "new"}', None))
+
+    def test_store_after_clear_is_dropped(self):
+        cache = UnitCache(max_entries=8)
+        token = cache.generation()
+        cache.clear()
+        cache.store("A-1", b"{}", {}, {}, token)
+        self.assertEqual(cache.lookup("A-1"), (None, None))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,71 @@
+import asyncio
+import unittest
+
+import httpx
+
+from src.tasktracker.resilience import CircuitBreaker, CircuitOpenError, Resilience, RetryPolicy
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _half_open_resilience(clock: _Clock) -> Resilience:
+    resilience = Resilience(RetryPolicy(max_attempts=1), failure_threshold=1, reset_timeout=10.0)
+    resilience._breakers["get_test_case"] = CircuitBreaker(
+        "get_test_case", failure_threshold=1, reset_timeout=10.0, clock=clock
+    )
+    resilience.breaker("get_test_case").record_failure()
+    clock.now = 11.0
+    return resilience
+
+
+def _ok() -> httpx.Response:
+    return httpx.Response(200, request=httpx.Request("GET", "http://tt/unit"))
+
+
+class HalfOpenProbeTest(unittest.TestCase):
+    def test_cancelled_async_probe_releases_the_probe(self):
+        clock = _Clock()
+        resilience = _half_open_resilience(clock)
+
+        async def cancelled() -> httpx.Response:
+            raise asyncio.CancelledError
+
+        async def ok() -> httpx.Response:
+            return _ok()
+
+        async def scenario() -> httpx.Response:
+            with self.assertRaises(asyncio.CancelledError):
+                await resilience.acall("get_test_case", cancelled, idempotent=True)
+            return await resilience.acall("get_test_case", ok, idempotent=True)
+
+        self.assertEqual(asyncio.run(scenario()).status_code, 200)
+        self.assertEqual(resilience.breaker("get_test_case").state, CircuitBreaker.CLOSED)
+
+    def test_interrupted_sync_probe_releases_the_probe(self):
+        clock = _Clock()
+        resilience = _half_open_resilience(clock)
+
+        def interrupted() -> httpx.Response:
+            raise KeyboardInterrupt
+
+        with self.assertRaises(KeyboardInterrupt):
+            resilience.call("get_test_case", interrupted, idempotent=True)
+        self.assertEqual(resilience.call("get_test_case", _ok, idempotent=True).status_code, 200)
+
+    def test_second_call_during_probe_is_rejected(self):
+        clock = _Clock()
+        resilience = _half_open_resilience(clock)
+        breaker = resilience.breaker("get_test_case")
+        breaker.before_call()
+        with self.assertRaises(CircuitOpenError):
+            breaker.before_call()
+
+
+if __name__ == "__main__":
+    unittest.main()